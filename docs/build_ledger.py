@@ -6,32 +6,26 @@ import sqlite3
 import pathlib
 import hashlib
 import datetime
+import sys
 
 REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
-DB_PATH = REPO_ROOT / "data" / "HEGEMON-AUDIT-LEDGER.sqlite"
+sys.path.insert(0, str(REPO_ROOT))
 
+from openclaw_core.budget import TOKEN_LEDGER_SCHEMA  # noqa: E402
+from openclaw_core.council import ensure_trails_schema  # noqa: E402
+from openclaw_core.ledger import DEFAULT_LEDGER_PATH, ensure_schema  # noqa: E402
+
+DB_PATH = DEFAULT_LEDGER_PATH
+
+# audit_events (hash-chained) is owned by openclaw_core.ledger, token_ledger by
+# openclaw_core.budget, decision_trails by openclaw_core.council
 SCHEMA = """
-CREATE TABLE IF NOT EXISTS audit_events (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  timestamp TEXT,
-  actor TEXT,
-  action TEXT,
-  details TEXT,
-  hash TEXT
-);
 CREATE TABLE IF NOT EXISTS economic_metrics (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   metric_key TEXT,
   metric_value REAL,
   period TEXT
 );
-CREATE TABLE IF NOT EXISTS decision_trails (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  council_vote TEXT,
-  proposal TEXT,
-  outcome TEXT,
-  ledger_ref TEXT
-);
 """
 
 
@@ -46,6 +40,9 @@ def init_db():
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
     conn.executescript(SCHEMA)
+    ensure_schema(conn)
+    conn.executescript(TOKEN_LEDGER_SCHEMA)
+    ensure_trails_schema(conn)
     conn.commit()
     conn.close()
 
@@ -7,6 +7,21 @@ Usage:
     python main.py              # starts all agents
     python main.py --agent roxy # starts single agent (dev/debug)
     python main.py --check      # validates agent dirs and exits
+    python main.py --shared     # all agents in one process on one port,
+                                # routed by path (/roxy, /sorin, ...)
+    python main.py --bundle     # precompile agents into data/agents.bundle.json
+
+Each agent is served by openclaw_core.server.AgentServer: a bounded worker
+pool for engine.run(), 429 backpressure and request timeouts, tuned per agent
+via the `server:` section of agents/<name>/config.yaml. In --shared mode
+openclaw_core.host.HostServer serves every agent from one process: engines
+load on first request and share model connections, prompt files, the verdict
+cache and webhook senders.
+
+Boots read each agent from the bundle written by --bundle when it is present
+and its entry is fresh (no source file changed since), and from agents/<name>/
+otherwise. The openai / requests / yaml imports are deferred until first use,
+so a boot reaches /health without loading them.
 
 Environment variables required (from .env):
     OPENAI_API_KEY
@@ -20,18 +35,19 @@ import sys
 import argparse
 import logging
 import pathlib
-from http.server import HTTPServer, BaseHTTPRequestHandler
 from threading import Thread
-import json
 
+from openclaw_core.bundle import DEFAULT_BUNDLE_PATH, build_bundle, bundled_definition, write_bundle
 from openclaw_core.engine import OpenClawEngine
+from openclaw_core.host import AgentHost, HostServer
+from openclaw_core.server import AgentServer, ServerConfig
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler("logs/hegemon.log", mode="a"),
+        logging.FileHandler("logs/hegemon.log", mode="a", delay=True),   # logs/ is created in main()
     ]
 )
 logger = logging.getLogger("hegemon.main")
@@ -51,95 +67,34 @@ AGENT_REGISTRY = {
 WEBHOOK_SECRET = os.getenv("HEGEMON_WEBHOOK_SECRET", "")
 
 
-# ── Webhook handler ───────────────────────────────────────────────────────────
-
-class AgentHandler(BaseHTTPRequestHandler):
-    """
-    Minimal HTTP handler that receives POST requests and routes them
-    to the agent's engine.run() method.
-
-    Nginx sits in front and routes:
-        /roxy  → openclaw-roxy:8000
-        /sorin → openclaw-sorin:8001
-        /brom  → openclaw-brom:8002
-        /vera  → openclaw-vera:8003
-        /astra → openclaw-astra:8004
-    """
-    engine: OpenClawEngine = None   # set on class before instantiating server
-
-    def do_POST(self):
-        # Validate X-Hegemon-Token header
-        token = self.headers.get("X-Hegemon-Token", "")
-        if WEBHOOK_SECRET and token != WEBHOOK_SECRET:
-            self._respond(401, {"error": "Unauthorized"})
-            return
-
-        # Parse body
-        length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(length)
-        try:
-            payload = json.loads(body)
-        except json.JSONDecodeError:
-            self._respond(400, {"error": "Invalid JSON"})
-            return
-
-        task_id      = payload.get("task_id", "")
-        input_source = payload.get("origin", "webhook")
-        user_input   = payload.get("task_description", payload.get("message", ""))
-
-        if not user_input:
-            self._respond(400, {"error": "Missing task_description or message field"})
-            return
-
-        # Run through engine
-        output = self.engine.run(
-            user_input=user_input,
-            input_source=input_source,
-            task_id=task_id,
-        )
-
-        self._respond(200, {
-            "agent": self.engine.agent_id,
-            "task_id": task_id,
-            "response": output,
-        })
-
-    def do_GET(self):
-        """Health check endpoint."""
-        if self.path == "/health":
-            self._respond(200, {"status": "ok", "agent": self.engine.agent_id})
-        else:
-            self._respond(404, {"error": "Not found"})
-
-    def _respond(self, code: int, body: dict):
-        data = json.dumps(body).encode()
-        self.send_response(code)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", len(data))
-        self.end_headers()
-        self.wfile.write(data)
-
-    def log_message(self, format, *args):
-        # Redirect access logs to Python logger
-        logger.debug(f"[{self.engine.agent_id}] {format % args}")
-
-
 # ── Boot helpers ──────────────────────────────────────────────────────────────
 
-def boot_agent(name: str, port: int):
+def boot_agent(name: str, port: int, bundle_path=DEFAULT_BUNDLE_PATH):
     """Initialize engine and start HTTP listener for one agent."""
     logger.info(f"Booting agent: {name} on port {port}")
     try:
-        engine = OpenClawEngine(name)
+        definition = bundled_definition(name, bundle_path) if bundle_path else None
+        engine = OpenClawEngine(name, definition=definition)
     except FileNotFoundError as e:
         logger.error(f"Cannot boot {name}: {e}")
         sys.exit(1)
 
-    # Attach engine to a handler subclass (one class per agent)
-    handler = type(f"{name.capitalize()}Handler", (AgentHandler,), {"engine": engine})
+    # Concurrency / backpressure / timeouts from the agent's config.yaml `server:` section
+    config = ServerConfig.from_dict(engine.config.get("server", {}))
+    server = AgentServer(("0.0.0.0", port), engine, config, webhook_secret=WEBHOOK_SECRET)
+    logger.info(
+        f"[{engine.agent_id}] Listening on port {port} | concurrency={config.concurrency} "
+        f"queue_depth={config.queue_depth} request_timeout={config.request_timeout}"
+    )
+    server.serve_forever()
 
-    server = HTTPServer(("0.0.0.0", port), handler)
-    logger.info(f"[{engine.agent_id}] Listening on port {port}")
+
+def boot_host(port: int, bundle_path=DEFAULT_BUNDLE_PATH):
+    """Serve every agent from this process on one port, routed by path."""
+    host = AgentHost(AGENT_REGISTRY, bundle_path=bundle_path)
+    config = ServerConfig(max_connections=64 * len(AGENT_REGISTRY))
+    server = HostServer(("0.0.0.0", port), host, config, webhook_secret=WEBHOOK_SECRET)
+    logger.info(f"Hosting {', '.join(host.agents)} on port {port} | engines load on first request")
     server.serve_forever()
 
 
@@ -164,7 +119,15 @@ def main():
     parser = argparse.ArgumentParser(description="Hegemon agent runtime")
     parser.add_argument("--agent",  help="Boot a single agent by name (dev mode)")
     parser.add_argument("--check",  action="store_true", help="Validate agent dirs and exit")
-    parser.add_argument("--port",   type=int, help="Override port (single-agent mode only)")
+    parser.add_argument("--shared", action="store_true",
+                        help="Serve all agents from one process on one port, routed by path")
+    parser.add_argument("--port",   type=int, help="Override port (single-agent / shared mode)")
+    parser.add_argument("--bundle", action="store_true",
+                        help="Precompile every agent into the bundle file and exit")
+    parser.add_argument("--bundle-path", default=str(DEFAULT_BUNDLE_PATH),
+                        help="Bundle file to write / boot from")
+    parser.add_argument("--no-bundle", action="store_true",
+                        help="Ignore the bundle and read agents/<name>/ directly")
     args = parser.parse_args()
 
     # Ensure log dir exists
@@ -177,6 +140,17 @@ def main():
         print(f"\n{'All files present.' if ok else 'Missing files — fix before deploying.'}")
         sys.exit(0 if ok else 1)
 
+    if args.bundle:
+        try:
+            path = write_bundle(build_bundle(AGENT_REGISTRY), args.bundle_path)
+        except (FileNotFoundError, ValueError) as e:
+            logger.error(f"Bundle not written: {e}")
+            sys.exit(1)
+        print(f"Wrote {path} ({', '.join(AGENT_REGISTRY)})")
+        sys.exit(0)
+
+    bundle_path = None if args.no_bundle else args.bundle_path
+
     if args.agent:
         # Single-agent mode (dev / Docker container per agent)
         name = args.agent.lower()
@@ -184,7 +158,13 @@ def main():
             logger.error(f"Unknown agent: {name}. Valid: {list(AGENT_REGISTRY.keys())}")
             sys.exit(1)
         port = args.port or AGENT_REGISTRY[name]
-        boot_agent(name, port)   # blocks
+        boot_agent(name, port, bundle_path)   # blocks
+
+    elif args.shared:
+        try:
+            boot_host(args.port or AGENT_REGISTRY["roxy"], bundle_path)   # blocks
+        except KeyboardInterrupt:
+            logger.info("Shutting down.")
 
     else:
         # All-agents mode — one thread per agent (local dev only)
@@ -193,7 +173,7 @@ def main():
         logger.info("Starting all agents in multi-thread mode (dev only)")
         threads = []
         for name, port in AGENT_REGISTRY.items():
-            t = Thread(target=boot_agent, args=(name, port), daemon=True)
+            t = Thread(target=boot_agent, args=(name, port, bundle_path), daemon=True)
             t.start()
             threads.append(t)
         logger.info("All agents started. Press Ctrl+C to stop.")
@@ -1,12 +1,19 @@
-import yaml
 import os
 
 
 def load_agent_config(agent_path):
-    config_path = os.path.join(agent_path, "config", "astra_config.yaml")
+    """
+    Parsed YAML from agent_path — an agent's config.yaml, or a directory
+    holding config/astra_config.yaml (the older layout). An empty file gives {}.
+    """
+    config_path = agent_path
+    if os.path.isdir(agent_path):
+        config_path = os.path.join(agent_path, "config", "astra_config.yaml")
 
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Config not found at {config_path}")
 
+    import yaml     # deferred: keeps `import openclaw_core` light for fast boots
+
     with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+        return yaml.safe_load(f) or {}
@@ -0,0 +1,327 @@
+"""
+openclaw_core.analytics
+────────────────────────
+Vectorized economic rollups for Vera (07_LEDGER_RULES/profit_equilibrium_formula.md).
+
+Token usage and economic_metrics are loaded once into a columnar
+EconomicSnapshot — one NumPy array per column — and every rollup is a few
+array operations (bincount over a combined period × agent index) rather than
+a Python loop over rows:
+
+  agent_rollup()  token cost and tokens per agent per day / week / month
+  equilibrium()   revenue vs token + operating cost per period, with the
+                  weekly report's POSITIVE / NEUTRAL / NEGATIVE status
+  agent_roi()     per-agent cost, attributed venture revenue and ROI
+  venture_roi()   §2.1 gross / annualized ROI and roi_score per venture
+
+Sources (load_ledger): token_ledger rows, and from economic_metrics the
+`venture_revenue_{name}_{YYYY-MM}`, `operating_cost_{YYYY-MM}` and
+`venture_capital_{name}` keys of audit_ledger_spec.md. A snapshot can be
+saved as one .npy file per column and reopened memory-mapped, so a report
+over a year of per-minute usage starts without parsing anything.
+
+NumPy is an optional dependency: the engine never imports this module, and
+importing it without NumPy raises an ImportError saying what to install.
+
+Usage:
+    snap = load_ledger("data/HEGEMON-AUDIT-LEDGER.sqlite")
+    save_snapshot(snap, "data/economics")        # later: load_snapshot(..., mmap=True)
+    equilibrium(snap, period="month")
+    agent_roi(snap, owners={"affiliate_funnel": "SRN-CIO"})
+"""
+
+import json
+import pathlib
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError as e:    # optional dependency — only Vera's reports need it
+    raise ImportError("openclaw_core.analytics needs NumPy: pip install numpy") from e
+
+from .ledger import DEFAULT_LEDGER_PATH
+
+PERIODS = ("day", "week", "month")
+
+# ROI score thresholds on annualized ROI — §2.1
+ROI_SCORES = (("HIGH", 2.0), ("MEDIUM", 0.5), ("LOW", 0.0))
+
+_REVENUE_KEY = re.compile(r"^venture_revenue_(?P<name>.+)_(?P<month>\d{4}-\d{2})$")
+_OPCOST_KEY = re.compile(r"^operating_cost_(?P<month>\d{4}-\d{2})$")
+_CAPITAL_KEY = re.compile(r"^venture_capital_(?P<name>.+)$")
+
+_USAGE_COLUMNS = ("usage_ts", "usage_agent", "usage_cost", "usage_tokens_in", "usage_tokens_out")
+_OTHER_COLUMNS = ("revenue_ts", "revenue_venture", "revenue_amount", "opcost_ts", "opcost_amount")
+
+
+@dataclass
+class EconomicSnapshot:
+    """Columnar economics: parallel arrays per table, timestamps in epoch seconds (UTC)."""
+    agents: tuple                       # usage_agent codes index this
+    usage_ts: "np.ndarray"              # int64
+    usage_agent: "np.ndarray"           # int32
+    usage_cost: "np.ndarray"            # float64, USD
+    usage_tokens_in: "np.ndarray"       # int64
+    usage_tokens_out: "np.ndarray"      # int64
+    ventures: tuple = ()                # revenue_venture codes index this
+    revenue_ts: "np.ndarray" = None     # int64, start of the month the revenue was booked for
+    revenue_venture: "np.ndarray" = None
+    revenue_amount: "np.ndarray" = None
+    opcost_ts: "np.ndarray" = None      # int64, month start
+    opcost_amount: "np.ndarray" = None  # USD for that whole month
+    capital: dict = field(default_factory=dict)     # venture → startup capital USD
+
+    def __post_init__(self):
+        for name in _OTHER_COLUMNS:
+            if getattr(self, name) is None:
+                setattr(self, name, np.zeros(0, dtype=np.float64 if "amount" in name else np.int64))
+
+    @property
+    def rows(self) -> int:
+        return len(self.usage_ts)
+
+
+# ── Loading ──────────────────────────────────────────────────────────────────
+
+def _month_start(month: str) -> int:
+    return int(np.datetime64(month, "M").astype("datetime64[s]").astype(np.int64))
+
+
+def load_ledger(path=DEFAULT_LEDGER_PATH) -> EconomicSnapshot:
+    """Build a snapshot from token_ledger and economic_metrics in the local ledger."""
+    path = pathlib.Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Ledger not found: {path}")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        usage = conn.execute(
+            "SELECT agent_name, date, total_cost, total_tokens_input, total_tokens_output "
+            "FROM token_ledger").fetchall() if "token_ledger" in tables else []
+        metrics = conn.execute(
+            "SELECT metric_key, metric_value FROM economic_metrics WHERE id IN "
+            "(SELECT MAX(id) FROM economic_metrics GROUP BY metric_key)").fetchall() \
+            if "economic_metrics" in tables else []
+    finally:
+        conn.close()
+
+    agents = tuple(sorted({row[0] for row in usage}))
+    codes = {agent: i for i, agent in enumerate(agents)}
+    usage_ts = np.array([row[1] for row in usage], dtype="datetime64[D]").astype("datetime64[s]")
+
+    revenue, opcost, capital = [], [], {}
+    for key, value in metrics:
+        if value is None:
+            continue
+        if m := _REVENUE_KEY.match(key):
+            revenue.append((m["name"], _month_start(m["month"]), float(value)))
+        elif m := _OPCOST_KEY.match(key):
+            opcost.append((_month_start(m["month"]), float(value)))
+        elif m := _CAPITAL_KEY.match(key):
+            capital[m["name"]] = float(value)
+    ventures = tuple(sorted({name for name, _, _ in revenue} | set(capital)))
+    vcodes = {name: i for i, name in enumerate(ventures)}
+
+    return EconomicSnapshot(
+        agents=agents,
+        usage_ts=usage_ts.astype(np.int64),
+        usage_agent=np.array([codes[row[0]] for row in usage], dtype=np.int32),
+        usage_cost=np.array([row[2] or 0.0 for row in usage], dtype=np.float64),
+        usage_tokens_in=np.array([row[3] or 0 for row in usage], dtype=np.int64),
+        usage_tokens_out=np.array([row[4] or 0 for row in usage], dtype=np.int64),
+        ventures=ventures,
+        revenue_ts=np.array([ts for _, ts, _ in revenue], dtype=np.int64),
+        revenue_venture=np.array([vcodes[name] for name, _, _ in revenue], dtype=np.int32),
+        revenue_amount=np.array([amount for _, _, amount in revenue], dtype=np.float64),
+        opcost_ts=np.array([ts for ts, _ in opcost], dtype=np.int64),
+        opcost_amount=np.array([amount for _, amount in opcost], dtype=np.float64),
+        capital=capital,
+    )
+
+
+def save_snapshot(snapshot: EconomicSnapshot, directory) -> pathlib.Path:
+    """One .npy per column plus meta.json (names, capital) in `directory`."""
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in _USAGE_COLUMNS + _OTHER_COLUMNS:
+        np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(snapshot, name)))
+    meta = {"agents": list(snapshot.agents), "ventures": list(snapshot.ventures),
+            "capital": snapshot.capital}
+    (directory / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return directory
+
+
+def load_snapshot(directory, mmap: bool = True) -> EconomicSnapshot:
+    """Reopen a saved snapshot; with mmap=True columns are paged in on first touch."""
+    directory = pathlib.Path(directory)
+    meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+    mode = "r" if mmap else None
+    columns = {name: np.load(directory / f"{name}.npy", mmap_mode=mode)
+               for name in _USAGE_COLUMNS + _OTHER_COLUMNS}
+    return EconomicSnapshot(agents=tuple(meta["agents"]), ventures=tuple(meta["ventures"]),
+                            capital=meta["capital"], **columns)
+
+
+# ── Periods ──────────────────────────────────────────────────────────────────
+
+def period_keys(ts: "np.ndarray", period: str) -> "np.ndarray":
+    """Integer period number for each epoch-second timestamp (weeks start on Monday)."""
+    days = ts // 86400
+    if period == "day":
+        return days
+    if period == "week":
+        return (days + 3) // 7          # 1970-01-01 was a Thursday
+    if period == "month":
+        return ts.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+    raise ValueError(f"period must be one of {', '.join(PERIODS)}, got {period!r}")
+
+
+def period_label(key: int, period: str) -> str:
+    if period == "day":
+        return str(np.datetime64(int(key), "D"))
+    if period == "week":
+        return str(np.datetime64(int(key) * 7 - 3, "D"))
+    return str(np.datetime64(int(key), "M"))
+
+
+def _span(*key_arrays) -> tuple:
+    """(first key, number of periods) covering every non-empty key array."""
+    present = [k for k in key_arrays if len(k)]
+    if not present:
+        return 0, 0
+    lo = min(int(k.min()) for k in present)
+    hi = max(int(k.max()) for k in present)
+    return lo, hi - lo + 1
+
+
+def _prorate_monthly(ts: "np.ndarray", amount: "np.ndarray") -> tuple:
+    """Spread per-month amounts evenly over the days of their month: (day ts, USD per day)."""
+    if not len(ts):
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    month = ts.astype("datetime64[s]").astype("datetime64[M]")
+    first = month.astype("datetime64[D]")
+    ndays = ((month + 1).astype("datetime64[D]") - first).astype(np.int64)
+    day = np.repeat(first.astype(np.int64), ndays) + (
+        np.arange(ndays.sum()) - np.repeat(np.cumsum(ndays) - ndays, ndays))
+    return day * 86400, np.repeat(amount / ndays, ndays)
+
+
+# ── Rollups ──────────────────────────────────────────────────────────────────
+
+def agent_rollup(snapshot: EconomicSnapshot, period: str = "day") -> dict:
+    """
+    Token cost and tokens per period × agent, as 2-D arrays [period, agent].
+    rows counts the usage rows summed into each cell — token_ledger keeps one
+    per agent per day, so this is days with usage, not model calls.
+    """
+    keys = period_keys(snapshot.usage_ts, period)
+    lo, n = _span(keys)
+    n_agents = len(snapshot.agents)
+    cell = (keys - lo) * n_agents + snapshot.usage_agent
+    size = n * n_agents
+
+    def total(weights):
+        return np.bincount(cell, weights=weights, minlength=size).reshape(n, n_agents)
+
+    return {
+        "period": period,
+        "periods": [period_label(lo + i, period) for i in range(n)],
+        "agents": list(snapshot.agents),
+        "cost": total(snapshot.usage_cost),
+        "tokens_in": total(snapshot.usage_tokens_in),
+        "tokens_out": total(snapshot.usage_tokens_out),
+        "rows": np.bincount(cell, minlength=size).reshape(n, n_agents),
+    }
+
+
+def equilibrium(snapshot: EconomicSnapshot, period: str = "month", neutral_band: float = 0.05) -> dict:
+    """
+    Revenue against token + operating cost per period. NEUTRAL when the net is
+    within neutral_band × total cost of zero (costs covered, nothing over).
+    Monthly operating_cost and revenue are prorated by day for day / week periods.
+    """
+    usage_keys = period_keys(snapshot.usage_ts, period)
+    op_ts, op_amount = snapshot.opcost_ts, snapshot.opcost_amount
+    rev_ts, rev_amount = snapshot.revenue_ts, snapshot.revenue_amount
+    if period != "month":
+        op_ts, op_amount = _prorate_monthly(op_ts, op_amount)
+        rev_ts, rev_amount = _prorate_monthly(rev_ts, rev_amount)
+    op_keys = period_keys(op_ts, period)
+    rev_keys = period_keys(rev_ts, period)
+
+    lo, n = _span(usage_keys, op_keys, rev_keys)
+    token_cost = np.bincount(usage_keys - lo, weights=snapshot.usage_cost, minlength=n)[:n]
+    operating = np.bincount(op_keys - lo, weights=op_amount, minlength=n)[:n]
+    revenue = np.bincount(rev_keys - lo, weights=rev_amount, minlength=n)[:n]
+    cost = token_cost + operating
+    net = revenue - cost
+    status = np.where(np.abs(net) <= neutral_band * cost, "NEUTRAL",
+                      np.where(net > 0, "POSITIVE", "NEGATIVE"))
+    return {
+        "period": period,
+        "periods": [period_label(lo + i, period) for i in range(n)],
+        "token_cost": token_cost,
+        "operating_cost": operating,
+        "revenue": revenue,
+        "net": net,
+        "status": status.tolist(),
+    }
+
+
+def agent_roi(snapshot: EconomicSnapshot, owners: Optional[dict] = None) -> dict:
+    """
+    Per agent: token cost, revenue of the ventures it owns (owners maps venture
+    → sim_id; revenue is not attributed otherwise) and ROI = (revenue - cost) / cost.
+    """
+    owners = owners or {}
+    n_agents = len(snapshot.agents)
+    cost = np.bincount(snapshot.usage_agent, weights=snapshot.usage_cost, minlength=n_agents)[:n_agents]
+    agent_codes = {agent: i for i, agent in enumerate(snapshot.agents)}
+    # venture code → owning agent code (-1 = unattributed)
+    owner_of = np.array([agent_codes.get(owners.get(v), -1) for v in snapshot.ventures] or [-1],
+                        dtype=np.int64)
+    rev_owner = owner_of[snapshot.revenue_venture] if len(snapshot.revenue_venture) else np.zeros(0, np.int64)
+    attributed = rev_owner >= 0
+    revenue = np.bincount(rev_owner[attributed], weights=snapshot.revenue_amount[attributed],
+                          minlength=n_agents)[:n_agents]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(cost > 0, (revenue - cost) / cost, np.nan)
+    return {"agents": list(snapshot.agents), "cost": cost, "revenue": revenue, "roi": roi}
+
+
+def venture_roi(snapshot: EconomicSnapshot, monthly_costs: Optional[dict] = None) -> dict:
+    """
+    §2.1 per venture: gross_roi = (mean monthly revenue - monthly operating cost) / startup
+    capital, annualized_roi = gross_roi × 12, roi_score HIGH / MEDIUM / LOW / NEGATIVE.
+    monthly_costs maps venture → its monthly operating cost (0 when not given — the
+    ledger does not record it per venture). Ventures without capital get NaN ROI.
+    """
+    monthly_costs = monthly_costs or {}
+    n = len(snapshot.ventures)
+    revenue = np.bincount(snapshot.revenue_venture, weights=snapshot.revenue_amount, minlength=n)[:n]
+    months = np.zeros(n)
+    if len(snapshot.revenue_ts):
+        pairs = np.unique(np.stack([snapshot.revenue_venture.astype(np.int64),
+                                    period_keys(snapshot.revenue_ts, "month")]), axis=1)
+        months = np.bincount(pairs[0], minlength=n)[:n].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        monthly_revenue = np.where(months > 0, revenue / months, 0.0)
+    op = np.array([monthly_costs.get(v, 0.0) for v in snapshot.ventures], dtype=np.float64)
+    capital = np.array([snapshot.capital.get(v, np.nan) for v in snapshot.ventures], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gross = (monthly_revenue - op) / capital
+    annualized = gross * 12
+    score = np.select([annualized >= t for _, t in ROI_SCORES], [s for s, _ in ROI_SCORES], "NEGATIVE")
+    score = np.where(np.isnan(annualized), "UNSCORED", score)
+    return {
+        "ventures": list(snapshot.ventures),
+        "monthly_revenue": monthly_revenue,
+        "monthly_operating_cost": op,
+        "startup_capital": capital,
+        "gross_roi": gross,
+        "annualized_roi": annualized,
+        "roi_score": score.tolist(),
+    }
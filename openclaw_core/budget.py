@@ -0,0 +1,298 @@
+"""
+openclaw_core.budget
+─────────────────────
+Per-agent daily token accounting and budget enforcement
+(07_LEDGER_RULES/profit_equilibrium_formula.md §1.3 and §4).
+
+Every model call's tokens are priced and added to the agent's row for the
+current UTC day in the local ledger's token_ledger table, with one atomic
+UPSERT … RETURNING. Processes sharing the ledger file therefore add to the
+same counters, and each write brings this process's view up to date. Before
+a model call the engine asks check(), which answers from memory:
+
+    GREEN     < 70% of the daily limit
+    YELLOW    70–90%
+    RED       90–100%
+    EXCEEDED  ≥ 100%  — the call is refused before any network I/O
+
+Counters are keyed by (agent, UTC date), so at 00:00 UTC a new day simply
+starts from zero. The first check of a new day reports rolled_over=True,
+and the engine then logs the spec's BUDGET_RESET audit event.
+
+Daily limits come from, in order: the latest `daily_limit_{sim_id}` row in
+economic_metrics (the Architect's override, re-read every
+limits_refresh_seconds), the agent's `budget.daily_limit_usd`, then
+DEFAULT_DAILY_LIMITS. Rates come from the latest
+`token_rate_{tier}_{input|output}` rows in economic_metrics, or from
+TIER_RATES otherwise.
+
+Usage:
+    budget = TokenBudget.from_config(config.get("budget", {}))
+    check = budget.check("RXY-CEO")
+    if check.allowed: ...
+    budget.record("RXY-CEO", "gpt-4o-mini", tokens_in, tokens_out)
+"""
+
+import datetime
+import pathlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .ledger import DEFAULT_LEDGER_PATH
+
+# USD per 1K tokens (input, output) — profit_equilibrium_formula.md §1.3
+TIER_RATES = {
+    "PREMIUM":  (0.015, 0.075),
+    "STANDARD": (0.003, 0.015),
+    "ECONOMY":  (0.00025, 0.00125),
+    "FREE":     (0.0, 0.0),
+}
+
+# Model → pricing tier. Unlisted models are priced as DEFAULT_TIER.
+MODEL_TIERS = {
+    "gpt-4o":        "PREMIUM",
+    "gpt-4.1":       "PREMIUM",
+    "o3":            "PREMIUM",
+    "gpt-4o-mini":   "STANDARD",
+    "gpt-4.1-mini":  "STANDARD",
+    "o4-mini":       "STANDARD",
+    "gpt-4.1-nano":  "ECONOMY",
+}
+DEFAULT_TIER = "STANDARD"
+
+# USD per UTC day — profit_equilibrium_formula.md §4.1
+DEFAULT_DAILY_LIMITS = {
+    "RXY-CEO": 5.00,
+    "SRN-CIO": 5.00,
+    "BRM-CTO": 5.00,
+    "VRA-CFO": 3.00,
+}
+DEFAULT_DAILY_LIMIT = 5.00
+
+# Fraction of the daily limit at which each status starts
+STATUS_THRESHOLDS = (("EXCEEDED", 1.0), ("RED", 0.9), ("YELLOW", 0.7))
+
+TOKEN_LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_ledger (
+  agent_name          TEXT    NOT NULL,
+  date                TEXT    NOT NULL,
+  total_tokens_input  INTEGER DEFAULT 0,
+  total_tokens_output INTEGER DEFAULT 0,
+  total_cost          REAL    DEFAULT 0,
+  last_updated        TEXT,
+  budget_status       TEXT,
+  PRIMARY KEY (agent_name, date)
+);
+CREATE TABLE IF NOT EXISTS economic_metrics (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  metric_key TEXT,
+  metric_value REAL,
+  period TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_metric_key ON economic_metrics (metric_key);
+"""
+
+
+def utc_date(now: float = None) -> str:
+    """The UTC calendar day of `now` (epoch seconds, default: current time) as YYYY-MM-DD."""
+    return datetime.datetime.fromtimestamp(
+        time.time() if now is None else now, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+
+def model_tier(model: str) -> str:
+    return MODEL_TIERS.get(model, DEFAULT_TIER)
+
+
+def token_cost(tokens_in: int, tokens_out: int, rates: tuple) -> float:
+    """token_cost = tokens_input / 1000 × input_rate + tokens_output / 1000 × output_rate"""
+    return tokens_in / 1000 * rates[0] + tokens_out / 1000 * rates[1]
+
+
+def budget_status(spent: float, limit: float) -> str:
+    if limit <= 0:
+        return "EXCEEDED"
+    for status, fraction in STATUS_THRESHOLDS:
+        if spent >= limit * fraction:
+            return status
+    return "GREEN"
+
+
+@dataclass(frozen=True)
+class BudgetCheck:
+    agent: str
+    date: str
+    spent_usd: float
+    limit_usd: float
+    status: str
+    rolled_over: bool = False       # first check since the UTC day changed
+
+    @property
+    def allowed(self) -> bool:
+        return self.status != "EXCEEDED"
+
+    @property
+    def remaining_usd(self) -> float:
+        return max(0.0, self.limit_usd - self.spent_usd)
+
+
+@dataclass
+class _DayCounter:
+    date: str
+    tokens_in: int = 0
+    tokens_out: int = 0
+    cost: float = 0.0
+
+
+class TokenBudget:
+    def __init__(self, path=DEFAULT_LEDGER_PATH, daily_limits: dict = None,
+                 tier: Optional[str] = None, limits_refresh_seconds: float = 30.0):
+        """
+        path                   : SQLite ledger holding token_ledger and economic_metrics
+        daily_limits           : {sim_id: USD} overriding DEFAULT_DAILY_LIMITS
+        tier                   : price every model at this tier instead of MODEL_TIERS
+        limits_refresh_seconds : how often economic_metrics overrides are re-read
+        """
+        if tier is not None and tier not in TIER_RATES:
+            raise ValueError(f"Unknown pricing tier {tier!r}. Use one of {', '.join(TIER_RATES)}.")
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.daily_limits = {**DEFAULT_DAILY_LIMITS, **(daily_limits or {})}
+        self.tier = tier
+        self.limits_refresh_seconds = limits_refresh_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(TOKEN_LEDGER_SCHEMA)
+        self._counters = {}             # agent → _DayCounter for the latest day seen
+        self._metrics = {}              # economic_metrics overrides: metric_key → value
+        self._metrics_loaded_at = float("-inf")
+        self.refused = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict = None, agent_id: str = None) -> Optional["TokenBudget"]:
+        """
+        Build from the `budget:` section of an agent's config.yaml. Returns None
+        unless enabled. `daily_limit_usd` there applies to `agent_id`.
+        """
+        cfg = dict(cfg or {})
+        if not cfg.pop("enabled", False):
+            return None
+        limit = cfg.pop("daily_limit_usd", None)
+        limits = {agent_id: limit} if limit is not None and agent_id else None
+        return cls(cfg.pop("path", DEFAULT_LEDGER_PATH), daily_limits=limits, **cfg)
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def check(self, agent: str, now: float = None) -> BudgetCheck:
+        """Budget status for `agent` today, from memory (plus a periodic limits refresh)."""
+        date = utc_date(now)
+        limit = self.daily_limit(agent)
+        with self._lock:
+            counter, rolled_over = self._counter(agent, date)
+            spent = counter.cost
+            status = budget_status(spent, limit)
+            if status == "EXCEEDED":
+                self.refused += 1
+        return BudgetCheck(agent, date, spent, limit, status, rolled_over)
+
+    def record(self, agent: str, model: str, tokens_in: int, tokens_out: int,
+               now: float = None) -> BudgetCheck:
+        """Price a model call, add it to today's counters and persist it. Returns the new status."""
+        cost = self.cost(model, tokens_in, tokens_out)
+        date = utc_date(now)
+        limit = self.daily_limit(agent)
+        stamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        with self._lock:
+            counter, rolled_over = self._counter(agent, date)
+            status = budget_status(counter.cost + cost, limit)
+            # Atomic across processes: the row is updated in place and the new totals returned
+            totals = self._conn.execute(
+                "INSERT INTO token_ledger (agent_name, date, total_tokens_input, total_tokens_output, "
+                "total_cost, last_updated, budget_status) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (agent_name, date) DO UPDATE SET "
+                "total_tokens_input = total_tokens_input + excluded.total_tokens_input, "
+                "total_tokens_output = total_tokens_output + excluded.total_tokens_output, "
+                "total_cost = total_cost + excluded.total_cost, "
+                "last_updated = excluded.last_updated, budget_status = excluded.budget_status "
+                "RETURNING total_tokens_input, total_tokens_output, total_cost",
+                (agent, date, tokens_in, tokens_out, cost, stamp, status),
+            ).fetchone()
+            counter.tokens_in, counter.tokens_out, counter.cost = totals
+        return BudgetCheck(agent, date, counter.cost, limit, budget_status(counter.cost, limit), rolled_over)
+
+    def cost(self, model: str, tokens_in: int, tokens_out: int) -> float:
+        """USD for one call at current rates."""
+        return token_cost(tokens_in, tokens_out, self.rates(model))
+
+    def rates(self, model: str) -> tuple:
+        """(input, output) USD per 1K tokens for `model`."""
+        tier = self.tier or model_tier(model)
+        metrics = self._economic_metrics()
+        default_in, default_out = TIER_RATES[tier]
+        return (metrics.get(f"token_rate_{tier}_input", default_in),
+                metrics.get(f"token_rate_{tier}_output", default_out))
+
+    def daily_limit(self, agent: str) -> float:
+        override = self._economic_metrics().get(f"daily_limit_{agent}")
+        if override is not None:
+            return override
+        return self.daily_limits.get(agent, DEFAULT_DAILY_LIMIT)
+
+    def usage(self, agent: str, now: float = None) -> dict:
+        """Today's token_ledger row for `agent` (as persisted), or zeros."""
+        date = utc_date(now)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT total_tokens_input, total_tokens_output, total_cost, budget_status "
+                "FROM token_ledger WHERE agent_name = ? AND date = ?", (agent, date)).fetchone()
+        tokens_in, tokens_out, cost, status = row or (0, 0, 0.0, "GREEN")
+        return {"agent_name": agent, "date": date, "total_tokens_input": tokens_in,
+                "total_tokens_output": tokens_out, "total_cost": round(cost, 6),
+                "budget_status": status, "daily_limit": self.daily_limit(agent)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {agent: {"date": c.date, "tokens_in": c.tokens_in, "tokens_out": c.tokens_out,
+                                "cost_usd": round(c.cost, 6)} for agent, c in self._counters.items()}
+        return {"path": str(self.path), "agents": counters, "refused": self.refused}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ── Internal ──────────────────────────────────────────────────────────
+
+    def _counter(self, agent: str, date: str) -> tuple:
+        """(_DayCounter for agent on date, whether the day just rolled over). Caller holds _lock."""
+        counter = self._counters.get(agent)
+        if counter is not None and counter.date == date:
+            return counter, False
+        rolled_over = counter is not None and counter.date < date
+        if counter is not None and counter.date > date:
+            return _DayCounter(date), False     # a late call stamped with yesterday's date
+        # New day (or first sight of this agent): start from what the ledger already holds
+        row = self._conn.execute(
+            "SELECT total_tokens_input, total_tokens_output, total_cost FROM token_ledger "
+            "WHERE agent_name = ? AND date = ?", (agent, date)).fetchone()
+        counter = self._counters[agent] = _DayCounter(date, *(row or (0, 0, 0.0)))
+        return counter, rolled_over
+
+    def _economic_metrics(self) -> dict:
+        """Latest daily_limit_* / token_rate_* values, re-read every limits_refresh_seconds."""
+        if time.monotonic() - self._metrics_loaded_at < self.limits_refresh_seconds:
+            return self._metrics
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metric_key, metric_value FROM economic_metrics "
+                "WHERE id IN (SELECT MAX(id) FROM economic_metrics "
+                "             WHERE metric_key LIKE 'daily_limit_%' OR metric_key LIKE 'token_rate_%' "
+                "             GROUP BY metric_key)").fetchall()
+            self._metrics = {key: float(value) for key, value in rows if value is not None}
+            self._metrics_loaded_at = time.monotonic()
+        return self._metrics
@@ -0,0 +1,153 @@
+"""
+openclaw_core.bundle
+─────────────────────
+Precompiled agent bundle: one versioned JSON artifact holding every agent's
+resolved config and system prompt sections, so a boot reads one file instead
+of walking agents/<name>/.
+
+    python main.py --bundle                      # write data/agents.bundle.json
+    python main.py --agent roxy                  # boots from it when fresh
+
+Each entry records the (path, mtime_ns, size) of the files it was built from.
+At load time an entry is used only if all of those files still match, or if
+the agent folder is absent altogether (a container that ships only the
+bundle). The whole bundle is rejected if BUNDLE_VERSION, PATTERN_SET_VERSION
+or PROMPT_LAYOUT_VERSION changed, so an old artifact can never run under new
+detection rules. Rejected entries fall back to reading the agent folder —
+the bundle is an accelerator, never a source of truth.
+
+The security preamble is not taken from the bundle at all: load_bundle()
+renders it from the current SYSTEM_PROMPT_SECURITY_PREAMBLE, so a bundle
+built before the security rules changed can never boot an agent with the
+old ones.
+
+Compiled regexes cannot be serialised (pickling re.Pattern recompiles on
+load), so the bundle pins the pattern set by version; compilation stays a
+one-off default_scanner() call per process (a few ms).
+
+The parsed tool registry manifest is carried too and seeded into
+tool_policy, which uses it only while the manifest's mtime and size still
+match — otherwise the YAML is parsed as usual. Hot reload is unaffected.
+"""
+
+import datetime
+import json
+import logging
+import os
+import pathlib
+from typing import Iterable, Optional
+
+from .engine import REPO_ROOT, AgentDefinition, load_agent_definition, security_preamble
+from .injection_guard import PATTERN_SET_VERSION
+from .prompt_prefix import PROMPT_LAYOUT_VERSION, build_prompt_prefix
+from .tool_policy import DEFAULT_REGISTRY_PATH, read_manifest, seed_registry
+
+logger = logging.getLogger("hegemon.bundle")
+
+# Bump when the artifact layout changes
+BUNDLE_VERSION = 1
+
+DEFAULT_BUNDLE_PATH = REPO_ROOT / "data" / "agents.bundle.json"
+
+
+def build_bundle(names: Iterable[str], agents_dir=None) -> dict:
+    """Read every agent folder and return the bundle document."""
+    agents, registries = {}, {}
+    for name in names:
+        definition = load_agent_definition(name, agents_dir)
+        registry_path = definition.config.get("security", {}).get("tool_registry", {}).get("path")
+        if registry_path is None and DEFAULT_REGISTRY_PATH.exists():
+            registry_path = DEFAULT_REGISTRY_PATH
+        if registry_path is not None and str(registry_path) not in registries:
+            st = os.stat(registry_path)
+            registries[str(registry_path)] = {
+                "mtime_ns": st.st_mtime_ns, "size": st.st_size, "manifest": read_manifest(registry_path)}
+        agents[definition.name] = {
+            "agent_id": definition.agent_id,
+            "tier": definition.tier,
+            "model": definition.model,
+            "config": definition.config,
+            "sections": [list(section) for section in definition.sections],
+            "sources": [list(source) for source in definition.sources],
+            "prompt_fingerprint": build_prompt_prefix(definition.sections).fingerprint,
+        }
+    return {
+        "bundle_version": BUNDLE_VERSION,
+        "pattern_set_version": PATTERN_SET_VERSION,
+        "prompt_layout_version": PROMPT_LAYOUT_VERSION,
+        "built_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "agents": agents,
+        "tool_registries": registries,
+    }
+
+
+def write_bundle(bundle: dict, path=DEFAULT_BUNDLE_PATH) -> pathlib.Path:
+    """Write atomically: readers see the old bundle or the new one, never half of one."""
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(bundle, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def load_bundle(path=DEFAULT_BUNDLE_PATH) -> dict:
+    """
+    Parse and validate a bundle. Returns {name: AgentDefinition}, with the
+    security preamble rendered afresh, and seeds the bundled tool registry
+    manifests into tool_policy.
+    Raises ValueError if it was built by another bundle, pattern set or prompt layout version.
+    """
+    bundle = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+    for key, expected in (("bundle_version", BUNDLE_VERSION),
+                          ("pattern_set_version", PATTERN_SET_VERSION),
+                          ("prompt_layout_version", PROMPT_LAYOUT_VERSION)):
+        if bundle.get(key) != expected:
+            raise ValueError(f"Stale bundle {path}: {key} {bundle.get(key)!r} != {expected!r} "
+                             f"— rebuild with `python main.py --bundle`")
+    for path, registry in bundle.get("tool_registries", {}).items():
+        seed_registry(path, registry["manifest"], registry["mtime_ns"], registry["size"])
+    return {
+        name: AgentDefinition(
+            name=name,
+            agent_id=entry["agent_id"],
+            tier=entry["tier"],
+            model=entry["model"],
+            config=entry["config"],
+            sections=tuple(("preamble", security_preamble(entry["agent_id"])) if section[0] == "preamble"
+                           else tuple(section) for section in entry["sections"]),
+            sources=tuple(tuple(source) for source in entry["sources"]),
+        )
+        for name, entry in bundle["agents"].items()
+    }
+
+
+def is_fresh(definition: AgentDefinition) -> bool:
+    """True unless a file the definition was built from now differs on disk."""
+    for path, mtime_ns, size in definition.sources:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            if mtime_ns is not None and os.path.isdir(os.path.dirname(path)):
+                return False    # file deleted since the build
+            continue            # never existed, or source tree not shipped with the bundle
+        if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+            return False        # changed, or created since the build
+    return True
+
+
+def bundled_definition(name: str, path=DEFAULT_BUNDLE_PATH) -> Optional[AgentDefinition]:
+    """The fresh bundled definition for `name`, or None (no bundle, stale, or not in it)."""
+    path = pathlib.Path(path)
+    if not path.exists():
+        return None
+    try:
+        definitions = load_bundle(path)
+    except (ValueError, KeyError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring agent bundle: {e}")
+        return None
+    definition = definitions.get(name)
+    if definition is not None and not is_fresh(definition):
+        logger.warning(f"Agent bundle entry for {name} is stale — reading agents/{name}/ instead")
+        return None
+    return definition
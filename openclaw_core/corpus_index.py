@@ -0,0 +1,372 @@
+"""
+openclaw_core.corpus_index
+───────────────────────────
+BM25 retrieval over the Hegemon doctrine corpus — 00_GOVERNANCE … 10_MANIFESTS,
+docs/ and 99_NOTES_DUMP — for the corpus_read tool and for injecting the few
+sections relevant to a request into the prompt instead of whole documents.
+
+Documents are split into sections: markdown at its #/##/### headings, other
+files at blank lines, each capped at max_section_chars. Sections are the unit
+of retrieval and are scored with Okapi BM25 over an in-memory inverted index
+(term → [(section, term frequency)]).
+
+The index is saved to data/corpus_index.json (per file: mtime, size, SHA-256
+and its sections with their term counts, so a restart tokenizes nothing
+that is unchanged) and brought up to date by refresh(): files whose mtime and
+size are unchanged are kept as they are, files whose bytes hash the same are
+only re-stamped, and only the rest are re-read and re-split. search() runs
+refresh() at most every refresh_seconds, so edits to the corpus show up
+without a restart.
+
+Usage:
+    index = default_corpus_index()
+    for hit in index.search("hash chain verification", k=3):
+        print(hit.score, hit.section.path, hit.section.heading)
+    text = index.read("07_LEDGER_RULES/audit_ledger_spec.md")
+    block, hits = index.context("who approves a change to the charter?", k=4)
+"""
+
+import functools
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import pathlib
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger("hegemon.corpus_index")
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+DEFAULT_INDEX_PATH = REPO_ROOT / "data" / "corpus_index.json"
+
+CORPUS_DIRS = (
+    "00_GOVERNANCE", "01_COUNCIL", "02_SUBAGENTS", "03_WORKERS", "04_FRAMEWORK",
+    "05_SECURITY", "06_INTEGRATIONS", "07_LEDGER_RULES", "08_WORKFLOWS", "09_VISUALS",
+    "10_MANIFESTS", "docs", "99_NOTES_DUMP",
+)
+CORPUS_SUFFIXES = (".md", ".yaml", ".yml", ".txt", ".json")
+
+# Bump when splitting or tokenization changes — a saved index of another version is rebuilt
+INDEX_VERSION = 2
+
+_HEADING = re.compile(r"^(#{1,3})\s+(.+?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i if in into is it its
+me my no not of on or our so than that the their then there these they this to was we
+were what when where which who why will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric terms, stopwords removed."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class Section:
+    path: str           # repo-relative, forward slashes
+    heading: str        # "Title › Subsection", or "" before the first heading
+    line: int           # 1-based line the section starts on
+    text: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    section: Section
+    score: float
+
+
+# ── Splitting ────────────────────────────────────────────────────────────────
+
+def _chunks(lines: List[str], start: int, max_chars: int) -> Iterable[Tuple[int, str]]:
+    """(line, text) pieces of at most ~max_chars, cut at blank lines where possible."""
+    piece, size, piece_start = [], 0, start
+    for offset, line in enumerate(lines):
+        if piece and size + len(line) > max_chars and (not line.strip() or size > 2 * max_chars):
+            yield piece_start, "\n".join(piece).strip()
+            piece, size, piece_start = [], 0, start + offset
+        piece.append(line)
+        size += len(line) + 1
+    if piece:
+        yield piece_start, "\n".join(piece).strip()
+
+
+def split_document(path: str, text: str, max_chars: int = 2000) -> List[Section]:
+    """Sections of one document; markdown is split at #/##/### headings outside code fences."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if not path.endswith(".md"):
+        return [Section(path, "", line, body)
+                for line, body in _chunks(lines, 1, max_chars) if body]
+
+    sections, trail, block, block_start, fenced = [], [], [], 1, False
+
+    def close():
+        heading = " › ".join(title for _, title in trail)
+        sections.extend(Section(path, heading, line, body)
+                        for line, body in _chunks(block, block_start, max_chars) if body)
+
+    for number, line in enumerate(lines, 1):
+        if _FENCE.match(line):
+            fenced = not fenced
+        m = None if fenced else _HEADING.match(line)
+        if m:
+            close()
+            level = len(m.group(1))
+            trail = [(lvl, title) for lvl, title in trail if lvl < level] + [(level, m.group(2))]
+            block, block_start = [], number
+        block.append(line)
+    close()
+    return sections
+
+
+# ── Index ────────────────────────────────────────────────────────────────────
+
+class CorpusIndex:
+    def __init__(self, root=REPO_ROOT, dirs: Iterable[str] = CORPUS_DIRS,
+                 index_path=DEFAULT_INDEX_PATH, refresh_seconds: float = 30.0,
+                 max_section_chars: int = 2000, k1: float = 1.5, b: float = 0.75):
+        """
+        root              : directory the corpus dirs (and returned paths) are relative to
+        dirs              : corpus directories, searched recursively
+        index_path        : JSON file the index is saved to (None keeps it in memory only)
+        refresh_seconds   : min seconds between mtime checks made by search() (None: never)
+        max_section_chars : sections longer than this are cut at blank lines
+        k1, b             : BM25 parameters
+        """
+        self.root = pathlib.Path(root).resolve()
+        self.dirs = tuple(dirs)
+        self.index_path = pathlib.Path(index_path) if index_path is not None else None
+        self.refresh_seconds = refresh_seconds
+        self.max_section_chars = max_section_chars
+        self.k1, self.b = k1, b
+
+        self._lock = threading.Lock()
+        self._files = {}                # path → {"mtime_ns", "size", "sha256", "sections": [Section]}
+        self._terms = {}                # path → [Counter per section]
+        # Swapped as one tuple so search() never sees a half-built index
+        self._view = ((), {}, (), 0.0, "")  # sections, postings, lengths, avg length, fingerprint
+        self._checked = None            # monotonic time of the last refresh
+        self.refreshes = 0
+        self.files_reindexed = 0
+        self.searches = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict = None) -> "CorpusIndex":
+        """
+        From the `retrieval.index:` section of an agent's config.yaml: the
+        process-wide default index when empty, else a private one built with
+        these keyword arguments.
+        """
+        return cls(**cfg) if cfg else default_corpus_index()
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def search(self, query: str, k: int = 5, prefix: str = None) -> List[SearchHit]:
+        """
+        The k best sections for query by BM25, best first. prefix limits the
+        search to paths starting with it (e.g. "07_LEDGER_RULES/").
+        """
+        self._maybe_refresh()
+        sections, postings, lengths, avg, _ = self._view
+        self.searches += 1
+        if not sections:
+            return []
+        n = len(sections)
+        scores = {}
+        for term in set(tokenize(query)):
+            posting = postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc, tf in posting:
+                norm = self.k1 * (1 - self.b + self.b * lengths[doc] / avg)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        if prefix:
+            scores = {doc: s for doc, s in scores.items() if sections[doc].path.startswith(prefix)}
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [SearchHit(sections[doc], round(score, 4)) for doc, score in best]
+
+    def context(self, query: str, k: int = 4, max_chars: int = 6000) -> Tuple[str, List[SearchHit]]:
+        """
+        Prompt block with the top-k sections for query, each under a
+        "[path § heading]" line, stopping before max_chars. Returns (block, hits used).
+        """
+        parts, used, size = [], [], 0
+        for hit in self.search(query, k):
+            label = hit.section.path + (f" § {hit.section.heading}" if hit.section.heading else "")
+            part = f"[{label}]\n{hit.section.text}"
+            if size + len(part) > max_chars:
+                break
+            parts.append(part)
+            used.append(hit)
+            size += len(part) + 2
+        return "\n\n".join(parts), used
+
+    def read(self, path: str) -> str:
+        """
+        Full text of one corpus document (repo-relative path). ValueError if
+        the path is outside the corpus dirs or not a corpus file type.
+        """
+        target = (self.root / path).resolve()
+        try:
+            rel = target.relative_to(self.root)
+        except ValueError:
+            raise ValueError(f"Not a corpus document: {path}") from None
+        if not rel.parts or rel.parts[0] not in self.dirs or target.suffix.lower() not in CORPUS_SUFFIXES:
+            raise ValueError(f"Not a corpus document: {path}")
+        return target.read_text(encoding="utf-8", errors="replace")
+
+    def documents(self) -> List[str]:
+        """Repo-relative paths of every indexed document."""
+        self._maybe_refresh()
+        with self._lock:
+            return sorted(self._files)
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash over every indexed file's SHA-256 — changes whenever the corpus does."""
+        self._maybe_refresh()
+        return self._view[4]
+
+    def refresh(self) -> dict:
+        """Re-index files added or changed since the last refresh. Returns per-kind file counts."""
+        with self._lock:
+            if self._checked is None:
+                self._load()
+            counts = {"added": 0, "updated": 0, "restamped": 0, "removed": 0, "unchanged": 0}
+            seen = set()
+            for file in self._walk():
+                rel = file.relative_to(self.root).as_posix()
+                seen.add(rel)
+                try:
+                    st = file.stat()
+                    entry = self._files.get(rel)
+                    if entry and (entry["mtime_ns"], entry["size"]) == (st.st_mtime_ns, st.st_size):
+                        counts["unchanged"] += 1
+                        continue
+                    data = file.read_bytes()
+                except OSError as e:
+                    logger.warning(f"corpus file skipped: {rel}: {e}")
+                    continue
+                sha = hashlib.sha256(data).hexdigest()
+                if entry and entry["sha256"] == sha:
+                    entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+                    counts["restamped"] += 1
+                    continue
+                sections = split_document(rel, data.decode("utf-8", errors="replace"),
+                                          self.max_section_chars)
+                self._files[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                                    "sha256": sha, "sections": sections}
+                self._terms[rel] = [Counter(tokenize(s.heading + "\n" + s.text)) for s in sections]
+                counts["updated" if entry else "added"] += 1
+            for rel in set(self._files) - seen:
+                del self._files[rel]
+                del self._terms[rel]
+                counts["removed"] += 1
+
+            changed = counts["added"] + counts["updated"] + counts["removed"]
+            if changed or not self._view[0]:
+                self._rebuild()
+            if changed or counts["restamped"]:
+                self._save()
+            self._checked = time.monotonic()
+            self.refreshes += 1
+            self.files_reindexed += counts["added"] + counts["updated"]
+            return counts
+
+    def stats(self) -> dict:
+        sections, postings, _, avg, fingerprint = self._view
+        return {
+            "documents": len(self._files),
+            "sections": len(sections),
+            "terms": len(postings),
+            "avg_section_terms": round(avg, 1),
+            "fingerprint": fingerprint,
+            "refreshes": self.refreshes,
+            "files_reindexed": self.files_reindexed,
+            "searches": self.searches,
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────
+
+    def _maybe_refresh(self):
+        checked = self._checked
+        if checked is None or (self.refresh_seconds is not None
+                               and time.monotonic() - checked >= self.refresh_seconds):
+            self.refresh()
+
+    def _walk(self) -> Iterable[pathlib.Path]:
+        for name in self.dirs:
+            base = self.root / name
+            if not base.is_dir():
+                continue
+            for dirpath, dirnames, filenames in os.walk(base):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith((".", "__")))
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(CORPUS_SUFFIXES):
+                        yield pathlib.Path(dirpath) / filename
+
+    def _rebuild(self):
+        """Postings from the per-section term counts (no re-tokenizing)."""
+        sections, lengths, postings = [], [], {}
+        for rel in sorted(self._files):
+            for section, terms in zip(self._files[rel]["sections"], self._terms[rel]):
+                doc = len(sections)
+                sections.append(section)
+                lengths.append(sum(terms.values()))
+                for term, tf in terms.items():
+                    postings.setdefault(term, []).append((doc, tf))
+        digest = hashlib.sha256()
+        for rel in sorted(self._files):
+            digest.update(f"{rel}\0{self._files[rel]['sha256']}\n".encode("utf-8"))
+        avg = sum(lengths) / len(lengths) if lengths else 0.0
+        self._view = (tuple(sections), postings, tuple(lengths), avg or 1.0, digest.hexdigest()[:16])
+
+    def _load(self):
+        if self.index_path is None or not self.index_path.exists():
+            return
+        try:
+            saved = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"corpus index unreadable, rebuilding: {e}")
+            return
+        if (saved.get("version") != INDEX_VERSION or saved.get("root") != str(self.root)
+                or saved.get("max_section_chars") != self.max_section_chars):
+            return
+        for rel, entry in saved["files"].items():
+            saved_sections = entry["sections"]
+            self._files[rel] = {**entry, "sections": [Section(rel, heading, line, text)
+                                                      for heading, line, text, _ in saved_sections]}
+            self._terms[rel] = [Counter(terms) for *_, terms in saved_sections]
+
+    def _save(self):
+        """Write atomically, like ledger_verify.save_checkpoint."""
+        if self.index_path is None:
+            return
+        files = {rel: {**entry, "sections": [(s.heading, s.line, s.text, terms)
+                                             for s, terms in zip(entry["sections"], self._terms[rel])]}
+                 for rel, entry in self._files.items()}
+        payload = {"version": INDEX_VERSION, "root": str(self.root),
+                   "max_section_chars": self.max_section_chars, "files": files}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(self.index_path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            logger.warning(f"corpus index not saved: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def default_corpus_index() -> CorpusIndex:
+    """The repo's corpus index, built on first search and shared by every engine in the process."""
+    return CorpusIndex()
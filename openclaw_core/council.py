@@ -0,0 +1,412 @@
+"""
+openclaw_core.council
+──────────────────────
+Scatter-gather Council votes (01_COUNCIL/COUNCIL_CHARTER.md, Voting Rules).
+
+CouncilOrchestrator sends one ballot to every Council member at once and
+tallies the votes as they arrive, under one shared deadline:
+
+    APPROVED  approvals reach the threshold (≥ 2 of 4, ≥ 3 of 4 for Red Zone)
+    REJECTED  the threshold can no longer be reached by the votes outstanding
+    VETOED    any member answers VETO (HITL pause / ethical override)
+    TIMEOUT   the deadline passes before either
+
+The vote returns as soon as the outcome is decided; members still answering
+are cancelled and recorded as UNCAST. Wall-clock time is therefore that of
+the slowest member the decision needed, not the sum of every round-trip.
+
+Each decision is written as one decision_trails row (spec Table 3), and a
+VOTE_RECORDED audit event — its event_id is the row's ledger_ref — goes to
+the LedgerWriter when one is given.
+
+Members are async voters, callable(prompt, task_id, timeout) → reply text:
+engine_voter() wraps an in-process OpenClawEngine (e.g. from AgentHost),
+http_voter() an agent's HTTP endpoint (one container per agent). A reply's
+first line starts with the vote (APPROVE / REJECT / ABSTAIN / VETO); a reply
+without one counts as ABSTAIN, an engine refusal or failed call as ERROR.
+
+Usage:
+    council = CouncilOrchestrator.from_host(host, ledger=ledger)
+    decision = await council.convene(Proposal("SRN-TEL-0042", "Launch the newsletter venture"))
+    decision = council.decide(proposal)       # from sync code
+    decision.outcome, decision.votes, decision.trail_id
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from .ledger import DEFAULT_LEDGER_PATH
+
+logger = logging.getLogger("hegemon.council")
+
+# Council members by agent name → sim_id (Astra holds no vote)
+COUNCIL_MEMBERS = {
+    "roxy":  "RXY-CEO",
+    "sorin": "SRN-CIO",
+    "brom":  "BRM-CTO",
+    "vera":  "VRA-CFO",
+}
+CONVENER = "RXY-CEO"        # Roxy convenes and records every vote
+
+STANDARD_THRESHOLD = 2      # standard operational decisions
+RED_ZONE_THRESHOLD = 3      # agent creation, infrastructure changes, external spending
+
+DEFAULT_DEADLINE = 120.0
+
+# A vote word leading the first line, after optional markup ("**", "> ", "Vote:").
+# A vote word anywhere else ("I cannot approve", "No veto needed") is not a vote.
+_VOTE_LINE = re.compile(r"[\s*_#>`-]*(?:(?:my\s+)?vote\s*[:\-—]?\s*[*_`]*)?"
+                        r"(APPROVE|REJECT|ABSTAIN|VETO)(?:D|ED)?\b", re.IGNORECASE)
+_CANONICAL = {"APPROVE": "APPROVED", "REJECT": "REJECTED", "ABSTAIN": "ABSTAIN", "VETO": "VETO"}
+
+BALLOT = """COUNCIL VOTE — proposal {proposal_id}{red_zone}
+Task: {task_id}
+Approval threshold: {threshold} of {members}
+
+{description}
+{context}
+Vote on this proposal. The first line of your reply must be exactly one of
+APPROVE, REJECT, ABSTAIN or VETO; give your reasoning after it."""
+
+# decision_trails as in the spec (Table 3), in SQLite types. trail_id is made
+# unique by an index so tables from an older ledger_builder can be upgraded.
+DECISION_TRAILS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decision_trails (
+  id            INTEGER PRIMARY KEY AUTOINCREMENT,
+  trail_id      TEXT,
+  council_vote  TEXT NOT NULL,
+  proposal      TEXT NOT NULL,
+  outcome       TEXT NOT NULL,
+  ledger_ref    TEXT,
+  created_at    TEXT
+);
+"""
+_TRAIL_COLUMNS = ("trail_id", "council_vote", "proposal", "outcome", "ledger_ref", "created_at")
+
+
+def ensure_trails_schema(conn: sqlite3.Connection):
+    """Create decision_trails, or add trail_id / created_at to one built by an older ledger_builder."""
+    conn.executescript(DECISION_TRAILS_SCHEMA)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(decision_trails)")}
+    for column in _TRAIL_COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE decision_trails ADD COLUMN {column} TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_trail_id ON decision_trails (trail_id)")
+    conn.commit()
+
+
+def parse_vote(reply: str) -> str:
+    """
+    The vote a member's reply starts with (APPROVE / REJECT / ABSTAIN / VETO),
+    else ABSTAIN — a refusal or hedge never counts as an approval or a veto.
+    """
+    if not reply or reply.startswith("[HEGEMON"):     # engine refusals and errors
+        return "ERROR"
+    match = _VOTE_LINE.match(reply.strip().split("\n", 1)[0])
+    return _CANONICAL[match.group(1).upper()] if match else "ABSTAIN"
+
+
+@dataclass
+class Proposal:
+    proposal_id: str
+    description: str
+    task_id: str = ""
+    red_zone: bool = False
+    sorin_confidence: Optional[str] = None
+    vera_clearance: Optional[str] = None
+    context: str = ""                   # extra material for the ballot (not stored)
+
+    @property
+    def threshold(self) -> int:
+        return RED_ZONE_THRESHOLD if self.red_zone else STANDARD_THRESHOLD
+
+    def summary(self) -> dict:
+        """The spec's decision_trails.proposal JSON."""
+        return {"proposal_id": self.proposal_id, "task_id": self.task_id, "description": self.description,
+                "sorin_confidence": self.sorin_confidence, "vera_clearance": self.vera_clearance,
+                "red_zone": self.red_zone}
+
+
+@dataclass
+class CouncilDecision:
+    proposal_id: str
+    outcome: str                        # APPROVED | REJECTED | VETOED | TIMEOUT
+    votes: Dict[str, str]               # sim_id → APPROVED | REJECTED | ABSTAIN | VETO | ERROR | UNCAST | TIMEOUT
+    threshold: int
+    trail_id: str
+    ledger_ref: str
+    elapsed: float                      # seconds from ballot to decision
+    replies: Dict[str, str] = field(default_factory=dict)
+    latencies: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def approvals(self) -> int:
+        return sum(1 for vote in self.votes.values() if vote == "APPROVED")
+
+
+def tally(votes: Dict[str, str], threshold: int) -> Optional[str]:
+    """The outcome the votes so far already decide, or None while it is still open (PENDING votes)."""
+    if "VETO" in votes.values():
+        return "VETOED"
+    approvals = sum(1 for vote in votes.values() if vote == "APPROVED")
+    if approvals >= threshold:
+        return "APPROVED"
+    if approvals + sum(1 for vote in votes.values() if vote == "PENDING") < threshold:
+        return "REJECTED"
+    return None
+
+
+# ── Voters ────────────────────────────────────────────────────────────────
+
+def engine_voter(engine) -> Callable:
+    """Voter backed by an in-process engine's arun() (trusted council_internal source, no response cache)."""
+    async def vote(prompt: str, task_id: str, timeout: float) -> str:
+        return await engine.arun(prompt, input_source="council_internal", task_id=task_id,
+                                 timeout=timeout, use_cache=False)
+    return vote
+
+
+def http_voter(url: str, webhook_secret: str = None, max_in_flight: int = 8) -> Callable:
+    """
+    Voter backed by an agent's HTTP endpoint (AgentServer, or HostServer's
+    /<agent> path). Requests run on the voter's own threads, so stragglers
+    still finishing a cancelled vote never hold up another member's request.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="council-http")
+    headers = {"Content-Type": "application/json"}
+    if webhook_secret:
+        headers["X-Hegemon-Token"] = webhook_secret
+
+    def post(prompt: str, task_id: str, timeout: float) -> str:
+        body = json.dumps({"task_id": task_id, "origin": "council_internal", "message": prompt,
+                           "no_cache": True}).encode("utf-8")
+        request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            return json.loads(resp.read()).get("response", "")
+
+    async def vote(prompt: str, task_id: str, timeout: float) -> str:
+        # A cancelled vote stops being waited for; its thread finishes on its own
+        return await asyncio.get_running_loop().run_in_executor(pool, post, prompt, task_id, timeout)
+    return vote
+
+
+# ── decision_trails ───────────────────────────────────────────────────────
+
+class DecisionTrails:
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        """path: SQLite ledger holding decision_trails (by default the audit ledger file)."""
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        ensure_trails_schema(self._conn)
+
+    def record(self, trail_id: str, votes: dict, proposal: dict, outcome: str, ledger_ref: str):
+        stamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO decision_trails ({', '.join(_TRAIL_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                (trail_id, json.dumps(votes, sort_keys=True), json.dumps(proposal, sort_keys=True),
+                 outcome, ledger_ref, stamp))
+
+    def get(self, trail_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_TRAIL_COLUMNS)} FROM decision_trails WHERE trail_id = ?",
+                (trail_id,)).fetchone()
+        if row is None:
+            return None
+        trail = dict(zip(_TRAIL_COLUMNS, row))
+        trail["council_vote"], trail["proposal"] = json.loads(trail["council_vote"]), json.loads(trail["proposal"])
+        return trail
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ── Orchestrator ──────────────────────────────────────────────────────────
+
+class CouncilOrchestrator:
+    def __init__(self, members: Dict[str, Callable], trails: DecisionTrails = None, ledger=None,
+                 deadline: float = DEFAULT_DEADLINE, convener: str = CONVENER):
+        """
+        members  : {sim_id: voter} — see engine_voter() / http_voter()
+        trails   : where decisions are written (default: DecisionTrails() on the audit ledger file)
+        ledger   : optional LedgerWriter for the VOTE_RECORDED audit event
+        deadline : seconds the whole vote may take, stragglers included
+        convener : actor recorded on trails and audit events
+        """
+        if not members:
+            raise ValueError("a council needs at least one member")
+        self.members = dict(members)
+        self.trails = trails if trails is not None else DecisionTrails()
+        self.ledger = ledger
+        self.deadline = deadline
+        self.convener = convener
+        self._loop = None                   # decide()'s event loop, started on first use
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"decisions": 0, "uncast": 0, "trail_failures": 0, **{outcome: 0 for outcome in
+                                                      ("APPROVED", "REJECTED", "VETOED", "TIMEOUT")}}
+
+    @classmethod
+    def from_host(cls, host, members: Dict[str, str] = None, **kwargs) -> "CouncilOrchestrator":
+        """Council of engines from an AgentHost (built on first use); members: {agent name: sim_id}."""
+        members = COUNCIL_MEMBERS if members is None else members
+        return cls({sim_id: engine_voter(host.get(name).engine) for name, sim_id in members.items()},
+                   **kwargs)
+
+    @classmethod
+    def from_urls(cls, urls: Dict[str, str], webhook_secret: str = None, **kwargs) -> "CouncilOrchestrator":
+        """Council of agents behind HTTP endpoints; urls: {sim_id: URL}."""
+        return cls({sim_id: http_voter(url, webhook_secret) for sim_id, url in urls.items()}, **kwargs)
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    async def convene(self, proposal: Proposal, threshold: int = None,
+                      deadline: float = None) -> CouncilDecision:
+        """Put proposal to every member at once; return as soon as the outcome is decided."""
+        threshold = proposal.threshold if threshold is None else threshold
+        deadline = self.deadline if deadline is None else deadline
+        if not 1 <= threshold <= len(self.members):
+            raise ValueError(f"threshold must be 1..{len(self.members)}, got {threshold}")
+        prompt = self.ballot(proposal, threshold)
+        task_id = proposal.task_id or proposal.proposal_id
+        votes = {member: "PENDING" for member in self.members}
+        replies, latencies = {}, {}
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tasks = {asyncio.ensure_future(self._ask(member, voter, prompt, task_id, deadline)): member
+                 for member, voter in self.members.items()}
+        pending, outcome = set(tasks), None
+        try:
+            while pending and outcome is None:
+                remaining = started + deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    member = tasks[task]
+                    replies[member], latencies[member] = task.result()
+                    votes[member] = parse_vote(replies[member]) if replies[member] is not None else "ERROR"
+                outcome = tally(votes, threshold)
+        finally:
+            for task in pending:
+                task.cancel()
+        elapsed = loop.time() - started
+
+        if outcome is None:
+            outcome = "TIMEOUT"
+        left = "TIMEOUT" if outcome == "TIMEOUT" else "UNCAST"
+        votes = {member: (left if vote == "PENDING" else vote) for member, vote in votes.items()}
+        decision = await asyncio.to_thread(self._record, proposal, votes, threshold, outcome, elapsed)
+        decision.replies, decision.latencies = replies, latencies
+        return decision
+
+    def decide(self, proposal: Proposal, threshold: int = None, deadline: float = None) -> CouncilDecision:
+        """
+        convene() for sync callers (not from inside a running event loop).
+        Every call runs on one long-lived loop thread, so the engines' async
+        clients — one per event loop — and their connections are reused
+        across votes instead of built for each.
+        """
+        future = asyncio.run_coroutine_threadsafe(self.convene(proposal, threshold, deadline),
+                                                  self._vote_loop())
+        return future.result()
+
+    def ballot(self, proposal: Proposal, threshold: int = None) -> str:
+        """The prompt every member receives."""
+        return BALLOT.format(
+            proposal_id=proposal.proposal_id, red_zone=" (RED ZONE)" if proposal.red_zone else "",
+            task_id=proposal.task_id or "-",
+            threshold=proposal.threshold if threshold is None else threshold, members=len(self.members),
+            description=proposal.description.strip(),
+            context=f"\n{proposal.context.strip()}\n" if proposal.context.strip() else "",
+        )
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self):
+        with self._loop_lock:
+            loop, thread, self._loop = self._loop, self._loop_thread, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+        self.trails.close()
+
+    # ── Internal helpers ──────────────────────────────────────────────────
+
+    def _vote_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever,
+                                                     name="council-votes", daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    async def _ask(self, member: str, voter: Callable, prompt: str, task_id: str, deadline: float):
+        """(reply, seconds) from one member; reply None if the voter raised."""
+        t0 = time.monotonic()
+        try:
+            reply = await voter(prompt, task_id, deadline)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[{self.convener}] Council member {member} failed to vote | task={task_id} | {e}")
+            reply = None
+        return reply, time.monotonic() - t0
+
+    def _record(self, proposal: Proposal, votes: dict, threshold: int, outcome: str,
+                elapsed: float) -> CouncilDecision:
+        # Time first so ids sort by when the vote closed; the random suffix keeps
+        # votes closing in the same millisecond (here or in another process) apart
+        suffix = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        trail_id = f"TRAIL-{proposal.proposal_id}-{suffix}"
+        ledger_ref = f"VOTE-{self.convener}-{suffix}"
+        try:
+            self.trails.record(trail_id, votes, proposal.summary(), outcome, ledger_ref)
+        except sqlite3.Error as e:      # the votes are in; don't lose the decision over its trail
+            logger.error(f"[{self.convener}] Decision trail write failed | proposal={proposal.proposal_id} | "
+                         f"{outcome} | {e}")
+            with self._stats_lock:
+                self._stats["trail_failures"] += 1
+        if self.ledger is not None:
+            self.ledger.emit({
+                "event_id": ledger_ref, "actor": self.convener, "action": "VOTE_RECORDED",
+                "outcome": outcome, "task_id": proposal.task_id,
+                "details": {"proposal_id": proposal.proposal_id, "votes": votes, "result": outcome,
+                            "threshold_required": threshold, "threshold_met": outcome == "APPROVED",
+                            "trail_id": trail_id, "elapsed_ms": round(elapsed * 1000, 1)},
+            })
+        uncast = sum(1 for vote in votes.values() if vote == "UNCAST")
+        with self._stats_lock:
+            self._stats["decisions"] += 1
+            self._stats[outcome] += 1
+            self._stats["uncast"] += uncast
+        logger.info(f"[{self.convener}] VOTE {outcome} | proposal={proposal.proposal_id} | "
+                    f"{sum(1 for v in votes.values() if v == 'APPROVED')}/{threshold} approvals | "
+                    f"{elapsed * 1000:.0f} ms | {uncast} uncast | trail={trail_id}")
+        return CouncilDecision(proposal.proposal_id, outcome, votes, threshold, trail_id, ledger_ref, elapsed)
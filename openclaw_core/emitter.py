@@ -0,0 +1,303 @@
+"""
+openclaw_core.emitter
+──────────────────────
+Background, batched delivery of audit / token events to the n8n webhooks.
+
+emit() never blocks the caller on the network: events go onto a bounded queue
+and a single daemon thread drains it in micro-batches (batch_size events or
+flush_interval seconds, whichever comes first) over one keep-alive session.
+
+Delivery:
+  - batch_format "single" (default) POSTs each event as its own JSON object —
+    the Workflow 05 contract; "array" POSTs the whole batch as one JSON array
+  - connection errors, 5xx, 408 and 429 are retried with exponential backoff
+    + jitter; other 4xx are permanent rejections (counted, logged, dropped)
+  - a batch that still fails is appended to a JSONL spill file, and the
+    webhook is marked down: later batches try once, then spill
+  - the first successful send after an outage replays the spill file;
+    undecodable lines (a write torn by a crash) are skipped and counted
+  - when the queue is full, events are spilled from the caller's thread (or
+    dropped and counted if no spill file is configured)
+
+Usage:
+    emitter = WebhookEmitter(url, name="audit", spill_path="data/spill/roxy_audit.jsonl")
+    emitter.emit(event)
+    emitter.stats()     # queue depth, sent / retried / spilled / dropped counts
+    emitter.close()     # drain, then spill whatever could not be sent
+"""
+
+import atexit
+import json
+import logging
+import os
+import pathlib
+import queue
+import random
+import threading
+import time
+from typing import Optional
+
+
+logger = logging.getLogger("hegemon.emitter")
+
+_RETRYABLE_STATUS = {408, 429}
+
+
+class WebhookEmitter:
+    def __init__(self, url: str, name: str = "audit", max_queue: int = 10_000,
+                 batch_size: int = 50, flush_interval: float = 0.2,
+                 max_retries: int = 3, backoff: float = 0.5, backoff_max: float = 10.0,
+                 timeout: float = 5.0, spill_path: Optional[str] = None,
+                 batch_format: str = "single", session: "requests.Session" = None):
+        """
+        url            : webhook URL
+        name           : label used in logs and stats ("audit", "token")
+        max_queue      : events held in memory before emit() spills / drops
+        batch_size     : max events per batch
+        flush_interval : max seconds an event waits for its batch to fill
+        max_retries    : retries per batch while the webhook is considered up
+        backoff        : first retry delay in seconds (doubles, capped at backoff_max)
+        timeout        : per-request timeout in seconds
+        spill_path     : JSONL file for undeliverable events (None = drop them)
+        batch_format   : "single" (one POST per event) | "array" (one POST per batch)
+        """
+        if batch_format not in ("single", "array"):
+            raise ValueError(f"batch_format must be 'single' or 'array', got {batch_format!r}")
+        self.url = url
+        self.name = name
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.batch_format = batch_format
+        self.spill_path = pathlib.Path(spill_path) if spill_path else None
+
+        if session is None:
+            import requests     # deferred: only processes with a webhook configured pay for it
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._session = session
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._spill_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._down = False
+        self._counters = {"sent": 0, "batches": 0, "retries": 0, "rejected": 0,
+                          "spilled": 0, "replayed": 0, "dropped": 0, "corrupt": 0}
+        self.last_error: Optional[str] = None
+
+        self._thread = threading.Thread(target=self._loop, name=f"emitter-{name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, url: str, name: str, cfg: dict = None,
+                    spill_path: Optional[str] = None) -> Optional["WebhookEmitter"]:
+        """Build from the `emitter:` section of an agent's config.yaml. Returns None if url is empty."""
+        if not url:
+            return None
+        cfg = dict(cfg or {})
+        cfg.pop("spill_dir", None)
+        return cls(url, name=name, spill_path=spill_path, **cfg)
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def emit(self, event: dict) -> bool:
+        """Queue an event for delivery. Returns False if it had to be spilled or dropped."""
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            if self._spill([event]):
+                logger.warning(f"[{self.name}] emitter queue full — event spilled to disk")
+            else:
+                self._count("dropped")
+                logger.error(f"[{self.name}] emitter queue full — event dropped")
+            return False
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued event has been sent or spilled. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Drain the queue (up to timeout), stop the worker and spill anything left."""
+        if self._stop.is_set():
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+                self._queue.task_done()
+            except queue.Empty:
+                break
+        if leftover and not self._spill(leftover):
+            self._count("dropped", len(leftover))
+        self._session.close()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            counters = dict(self._counters)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self._queue.maxsize,
+            "webhook_down": self._down,
+            "spill_pending": self._spill_pending(),
+            "last_error": self.last_error,
+            **counters,
+        }
+
+    # ── Worker ────────────────────────────────────────────────────────────
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._deliver(batch)
+            except Exception as e:      # never let the worker die
+                logger.exception(f"[{self.name}] emitter worker error: {e}")
+                self._spill(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _deliver(self, batch: list):
+        sent = self._send_with_retry(batch, retries=0 if self._down else self.max_retries)
+        if sent < len(batch):
+            if not self._down:
+                logger.error(f"[{self.name}] webhook down — spilling events: {self.last_error}")
+            self._down = True
+            if not self._spill(batch[sent:]):
+                self._count("dropped", len(batch) - sent)
+            return
+        self._count("batches")
+        if self._down:
+            logger.info(f"[{self.name}] webhook recovered")
+            self._down = False
+        try:
+            self._replay_spill()
+        except Exception as e:      # the batch above is delivered; never spill it again
+            logger.exception(f"[{self.name}] spill replay failed: {e}")
+
+    def _send_with_retry(self, batch: list, retries: int) -> int:
+        """Send batch; returns how many events (from the front) were delivered or rejected."""
+        done = 0
+        for attempt in range(retries + 1):
+            try:
+                done += self._send(batch[done:])
+                return done
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                done += getattr(e, "delivered", 0)
+                if attempt == retries or self._stop.is_set():
+                    return done
+                self._count("retries")
+                delay = min(self.backoff_max, self.backoff * 2 ** attempt)
+                self._stop.wait(delay * random.uniform(0.5, 1.0))
+        return done
+
+    def _send(self, events: list) -> int:
+        if self.batch_format == "array":
+            self._post(events, len(events))
+            return len(events)
+        for i, event in enumerate(events):
+            try:
+                self._post(event, 1)
+            except Exception as e:
+                e.delivered = i
+                raise
+        return len(events)
+
+    def _post(self, payload, n: int):
+        resp = self._session.post(self.url, json=payload, timeout=self.timeout)
+        if resp.status_code < 400:
+            self._count("sent", n)
+            return
+        if resp.status_code >= 500 or resp.status_code in _RETRYABLE_STATUS:
+            resp.raise_for_status()
+        # Schema / auth rejection — resending the same payload cannot succeed
+        self._count("rejected", n)
+        self.last_error = f"HTTP {resp.status_code}: {resp.text[:200]}"
+        logger.error(f"[{self.name}] webhook rejected {n} event(s) — {self.last_error}")
+
+    # ── Spill file ────────────────────────────────────────────────────────
+
+    def _spill(self, events: list) -> bool:
+        if self.spill_path is None:
+            return False
+        try:
+            with self._spill_lock:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    for event in events:
+                        f.write(json.dumps(event, default=str) + "\n")
+        except OSError as e:
+            logger.error(f"[{self.name}] spill write failed: {e}")
+            return False
+        self._count("spilled", len(events))
+        return True
+
+    def _replay_path(self) -> pathlib.Path:
+        return self.spill_path.with_suffix(self.spill_path.suffix + ".replay")
+
+    def _spill_pending(self) -> bool:
+        return self.spill_path is not None and (self.spill_path.exists() or self._replay_path().exists())
+
+    def _replay_spill(self):
+        if not self._spill_pending():
+            return
+        replay_path = self._replay_path()
+        with self._spill_lock:
+            if not replay_path.exists():
+                os.replace(self.spill_path, replay_path)
+        events = []
+        with open(replay_path, encoding="utf-8") as f:
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except ValueError:      # torn write from a crash mid-spill
+                    logger.warning(f"[{self.name}] skipping undecodable spill line {n}: {line[:80]!r}")
+                    self._count("corrupt")
+        logger.info(f"[{self.name}] replaying {len(events)} spilled event(s)")
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start:start + self.batch_size]
+            sent = self._send_with_retry(batch, retries=0)
+            self._count("replayed", sent)
+            if sent < len(batch):
+                self._down = True
+                if not self._spill(events[start + sent:]):
+                    self._count("dropped", len(events) - start - sent)
+                break
+        replay_path.unlink()
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self._counters[name] += n
@@ -18,23 +18,36 @@ Instantiate with the agent's lowercase name:
 
 import os
 import pathlib
-import requests
+import threading
+import time
+from dataclasses import dataclass
+from typing import Tuple
 from .agent_loader import load_agent_config
-from .memory import load_memory
-from .logger import get_logger
+from .memory import MemoryStore, load_memory
+from .logger import logger_from_config
+from .budget import BudgetCheck, TokenBudget
+from .cache import TTLCache
+from .corpus_index import CorpusIndex
+from .emitter import WebhookEmitter
+from .ledger import LedgerWriter
+from .model_client import AsyncModelClient
+from .prompt_prefix import build_prompt_prefix
+from .response_cache import response_cache_from_config, response_cache_key
+from .shared import SharedResources
+from .tokens import (MESSAGE_OVERHEAD, REPLY_PRIMER, ContextBudget, PromptTooLarge,
+                     default_counter, fit_sections)
 from .injection_guard import InjectionGuard, SYSTEM_PROMPT_SECURITY_PREAMBLE
-from .tool_policy import ToolPolicy
-from openai import OpenAI
+from .tool_policy import DEFAULT_POLL_SECONDS, ToolPolicy, default_registry
 
 # Repo root = two levels up from openclaw_core/engine.py
 REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
 AGENTS_DIR = REPO_ROOT / "agents"
 
 
-def _load_md(path: pathlib.Path, required: bool = True) -> str:
+def _load_md(path: pathlib.Path, required: bool = True, shared: SharedResources = None) -> str:
     """Read a markdown file. Raises FileNotFoundError if required and missing."""
     if path.exists():
-        return path.read_text(encoding="utf-8")
+        return shared.read_text(path) if shared is not None else path.read_text(encoding="utf-8")
     if required:
         raise FileNotFoundError(
             f"Required agent file missing: {path}\n"
@@ -61,72 +74,259 @@ TIER_DEFAULTS = {
 }
 
 
+AGENT_FILES = ("SOUL.md", "IDENTITY.md", "HEARTBEAT.md", "MEMORY.md", "AGENT.md")
+
+
+@dataclass(frozen=True)
+class AgentDefinition:
+    """Everything an engine reads from agents/<name>/ — built from disk or loaded from a bundle."""
+    name: str
+    agent_id: str
+    tier: str
+    model: str
+    config: dict
+    sections: Tuple[Tuple[str, str], ...]       # (name, text) in canonical load order
+    sources: Tuple[tuple, ...]                  # (path, mtime_ns, size); None, None if absent
+
+
+def security_preamble(agent_id: str) -> str:
+    """The security preamble section for agent_id, rendered from the current template."""
+    return SYSTEM_PROMPT_SECURITY_PREAMBLE.format(agent_id=agent_id)
+
+
+def load_agent_definition(agent_name: str, agents_dir=None,
+                          shared: SharedResources = None) -> AgentDefinition:
+    """Read and assemble one agent's config and prompt sections from its folder."""
+    agent_name = agent_name.lower()
+    agent_dir = pathlib.Path(agents_dir or AGENTS_DIR) / agent_name
+
+    if not agent_dir.exists():
+        raise FileNotFoundError(
+            f"Agent directory not found: {agent_dir}\n"
+            f"Create agents/{agent_name}/ with SOUL.md, IDENTITY.md, "
+            f"HEARTBEAT.md, MEMORY.md, AGENT.md"
+        )
+
+    # Optional config.yaml in agent folder; fall back to defaults
+    config_path = agent_dir / "config.yaml"
+    config = load_agent_config(str(config_path)) if config_path.exists() else {}
+
+    agent_id = config.get("sim_id", SIM_ID_DEFAULTS.get(agent_name, agent_name.upper()))
+    tier = config.get("tier", TIER_DEFAULTS.get(agent_name, "TIER_1_COUNCIL"))
+
+    # ── Load the 5 agent files ────────────────────────────────────────────
+    soul, identity, heartbeat, memory, agent_doc = (
+        _load_md(agent_dir / fname, shared=shared) for fname in AGENT_FILES)
+
+    sources = []
+    for path in [config_path, *(agent_dir / fname for fname in AGENT_FILES)]:
+        st = path.stat() if path.exists() else None
+        sources.append((str(path), st.st_mtime_ns if st else None, st.st_size if st else None))
+
+    # ── System prompt sections in canonical load order ────────────────────
+    # Security preamble → SOUL → IDENTITY → HEARTBEAT → MEMORY → AGENT rules
+    return AgentDefinition(
+        name=agent_name,
+        agent_id=agent_id,
+        tier=tier,
+        model=config.get("model", "gpt-4o-mini"),
+        config=config,
+        sections=(
+            ("preamble",  security_preamble(agent_id)),
+            ("soul",      soul),
+            ("identity",  identity),
+            ("heartbeat", "# Heartbeat Protocol\nRun this checklist before processing any input:\n\n" + heartbeat),
+            ("memory",    "# Memory Protocol\n" + memory),
+            ("agent",     "# Operational Rules\n" + agent_doc),
+        ),
+        sources=tuple(sources),
+    )
+
+
 class OpenClawEngine:
-    def __init__(self, agent_name: str):
+    def __init__(self, agent_name: str, shared: SharedResources = None, agents_dir=None,
+                 definition: AgentDefinition = None):
         """
         Args:
             agent_name: lowercase name matching a folder inside agents/
                         e.g. "roxy", "sorin", "brom", "vera", "astra"
+            shared:     optional SharedResources when several engines live in
+                        one process (openclaw_core.host) — prompt files, OpenAI
+                        clients, the verdict cache and webhook emitters then
+                        come from it instead of being built per engine
+            agents_dir: directory holding the agent folders (default: agents/)
+            definition: prebuilt AgentDefinition (e.g. from openclaw_core.bundle);
+                        the agent folder is then not read at all
         """
         self.agent_name = agent_name.lower()
-        self.agent_dir = AGENTS_DIR / self.agent_name
+        self.agent_dir = pathlib.Path(agents_dir or AGENTS_DIR) / self.agent_name
+        self.shared = shared
+        if definition is None:
+            definition = load_agent_definition(self.agent_name, agents_dir, shared)
+        self.definition = definition
 
-        if not self.agent_dir.exists():
-            raise FileNotFoundError(
-                f"Agent directory not found: {self.agent_dir}\n"
-                f"Create agents/{self.agent_name}/ with SOUL.md, IDENTITY.md, "
-                f"HEARTBEAT.md, MEMORY.md, AGENT.md"
-            )
+        self.config = definition.config
+        self.agent_id = definition.agent_id
+        tier = definition.tier
+        self.model = definition.model
+
+        # ── Context budget ────────────────────────────────────────────────
+        # Tokens are counted locally (tiktoken if available, else an estimate);
+        # system sections over context.max_system_tokens are trimmed here, once.
+        context_cfg = self.config.get("context", {})
+        self.context = ContextBudget.from_config(context_cfg)
+        self._token_encoding = context_cfg.get("encoding")
+        self._tokens = None             # counter built on first use (see `tokens`)
+        self._prefix_tokens = None
+        sections, self.trimmed_sections = (
+            fit_sections(definition.sections, self.tokens, self.context.max_system_tokens)
+            if self.context.max_system_tokens is not None else (definition.sections, {}))
 
-        # Optional config.yaml in agent folder; fall back to defaults
-        config_path = self.agent_dir / "config.yaml"
-        self.config = load_agent_config(str(config_path)) if config_path.exists() else {}
-
-        self.agent_id = self.config.get("sim_id", SIM_ID_DEFAULTS.get(self.agent_name, self.agent_name.upper()))
-        tier = self.config.get("tier", TIER_DEFAULTS.get(self.agent_name, "TIER_1_COUNCIL"))
-        self.model = self.config.get("model", "gpt-4o-mini")
-
-        # ── Load the 5 agent files ────────────────────────────────────────
-        soul      = _load_md(self.agent_dir / "SOUL.md")
-        identity  = _load_md(self.agent_dir / "IDENTITY.md")
-        heartbeat = _load_md(self.agent_dir / "HEARTBEAT.md")
-        memory    = _load_md(self.agent_dir / "MEMORY.md")
-        agent_doc = _load_md(self.agent_dir / "AGENT.md")
-
-        # ── Build system prompt in canonical load order ───────────────────
-        # Security preamble → SOUL → IDENTITY → HEARTBEAT → MEMORY → AGENT rules
-        self.system_prompt = "\n\n---\n\n".join([
-            SYSTEM_PROMPT_SECURITY_PREAMBLE.format(agent_id=self.agent_id),
-            soul,
-            identity,
-            "# Heartbeat Protocol\nRun this checklist before processing any input:\n\n" + heartbeat,
-            "# Memory Protocol\n" + memory,
-            "# Operational Rules\n" + agent_doc,
-        ])
+        # Built once, byte-stable, and sent verbatim as the first message of
+        # every call so the provider's prompt-prefix cache can reuse it.
+        self.prompt_prefix = build_prompt_prefix(sections)
+        self.system_prompt = self.prompt_prefix.text
+        self.prompt_fingerprint = self.prompt_prefix.fingerprint
+        # Extra chat.completions params (temperature, top_p, seed, ...) — part of the cache key
+        self.sampling = dict(self.config.get("sampling", {}))
+        # prompt_cache_key routes calls sharing this prefix to the same provider cache
+        if self.config.get("prompt_cache", {}).get("send_key", True):
+            self.sampling.setdefault("prompt_cache_key", f"{self.agent_id}:{self.prompt_fingerprint}")
 
         # ── Security ──────────────────────────────────────────────────────
-        strict = self.config.get("security", {}).get("strict_injection_mode", True)
-        self.guard = InjectionGuard(agent_id=self.agent_id, strict_mode=strict)
-        self.tool_policy = ToolPolicy(agent_id=self.agent_id, tier=tier)
+        security = self.config.get("security", {})
+        cache_cfg = security.get("verdict_cache", {})
+        if shared is not None:
+            verdict_cache = shared.verdict_cache(cache_cfg)
+        else:
+            verdict_cache = TTLCache(
+                max_entries=cache_cfg.get("max_entries", 4096),
+                ttl_seconds=cache_cfg.get("ttl_seconds", 300),
+            ) if cache_cfg.get("enabled", False) else None
+        self.guard = InjectionGuard(
+            agent_id=self.agent_id,
+            strict_mode=security.get("strict_injection_mode", True),
+            decide_fast=security.get("decide_fast", False),
+            max_scan_bytes=security.get("max_scan_bytes"),
+            max_scan_seconds=security.get("max_scan_seconds"),
+            verdict_cache=verdict_cache,
+        )
+        registry_cfg = security.get("tool_registry", {})
+        self.tool_policy = ToolPolicy(
+            agent_id=self.agent_id,
+            tier=tier,
+            registry=default_registry(
+                registry_cfg.get("path"),
+                registry_cfg.get("poll_seconds", DEFAULT_POLL_SECONDS),
+            ),
+        )
 
         # ── Persistent memory ─────────────────────────────────────────────
-        memory_path = self.config.get("memory", {}).get(
+        memory_cfg = self.config.get("memory", {})
+        memory_path = memory_cfg.get(
             "path", str(REPO_ROOT / "data" / f"{self.agent_name}_memory.json"))
         self.persistent_memory = load_memory(memory_path)
+        # Queryable store (opt-in): recall_tokens of relevant entries go in the prompt
+        self.memory = MemoryStore.from_config(memory_cfg.get("store", {}), self.agent_name)
+        self.memory_recall_tokens = memory_cfg.get("recall_tokens", 300)
+        self.memory_record_exchanges = memory_cfg.get("record_exchanges", False)
 
         # ── Logging & webhooks ────────────────────────────────────────────
-        log_file = self.config.get("logging", {}).get(
-            "log_file", str(REPO_ROOT / "logs" / f"{self.agent_name}.log"))
-        self.logger = get_logger(log_file)
+        # One queue-backed, rotating logger per agent file (see openclaw_core.logger)
+        self.logger = logger_from_config(self.config.get("logging", {}),
+                                         REPO_ROOT / "logs" / f"{self.agent_name}.log",
+                                         name=self.agent_name)
         self.audit_webhook = os.getenv("HEGEMON_AUDIT_WEBHOOK", "")
         self.token_webhook = os.getenv("HEGEMON_TOKEN_WEBHOOK", "")
+        # Delivery runs on background threads — run() never waits on a webhook
+        emitter_cfg = self.config.get("emitter", {})
+        spill_dir = pathlib.Path(emitter_cfg.get("spill_dir", REPO_ROOT / "data" / "spill"))
+        if shared is not None:
+            # One sender per webhook for the whole process; events carry agent_name
+            self.audit_emitter = shared.emitter(
+                self.audit_webhook, "audit", emitter_cfg, spill_dir / "host_audit.jsonl")
+            self.token_emitter = shared.emitter(
+                self.token_webhook, "token", emitter_cfg, spill_dir / "host_token.jsonl")
+        else:
+            self.audit_emitter = WebhookEmitter.from_config(
+                self.audit_webhook, "audit", emitter_cfg, spill_dir / f"{self.agent_name}_audit.jsonl")
+            self.token_emitter = WebhookEmitter.from_config(
+                self.token_webhook, "token", emitter_cfg, spill_dir / f"{self.agent_name}_token.jsonl")
+        # Local hash-chained audit ledger (opt-in) — written alongside the audit webhook
+        ledger_cfg = self.config.get("ledger", {})
+        self.ledger = (shared.ledger(ledger_cfg) if shared is not None
+                       else LedgerWriter.from_config(ledger_cfg))
+        # Daily token budget (opt-in) — checked before every model call
+        budget_cfg = self.config.get("budget", {})
+        self.budget = (shared.token_budget(budget_cfg, self.agent_id) if shared is not None
+                       else TokenBudget.from_config(budget_cfg, self.agent_id))
+        self._budget_status = None
+
+        inference = self.config.get("inference", {})
+        api_key = os.getenv("OPENAI_API_KEY")
+        # Sync client is built on first use (see `client`) so boot never imports openai
+        self._client = None
+        self._client_args = (api_key, inference.get("base_url"))
+        self._client_lock = threading.Lock()
+        # arun(): pooled async client, per-agent concurrency cap, deadlines, retry
+        self.async_client = AsyncModelClient.from_config(self.model, inference, api_key=api_key,
+                                                         clients=shared)
+
+        # ── Corpus retrieval ──────────────────────────────────────────────
+        # Backs corpus_read(); with retrieval.enabled the top_k BM25 sections
+        # for each request go in a second system message after the prefix.
+        retrieval = self.config.get("retrieval", {})
+        self.corpus = CorpusIndex.from_config(retrieval.get("index", {}))
+        self.retrieval_enabled = retrieval.get("enabled", False)
+        self.retrieval_top_k = retrieval.get("top_k", 4)
+        self.retrieval_max_chars = retrieval.get("max_chars", 6000)
 
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.logger.info(f"[{self.agent_id}] Engine initialized | model={self.model} | dir={self.agent_dir}")
+        # ── Response cache (opt-in) ───────────────────────────────────────
+        cache_cfg = self.config.get("response_cache", {})
+        self.response_cache = response_cache_from_config(
+            cache_cfg, str(REPO_ROOT / "data" / f"{self.agent_name}_response_cache.sqlite"))
+        self.cache_bypass_sources = frozenset(cache_cfg.get("bypass_sources", []))
+        self.cache_bypass_task_prefixes = tuple(cache_cfg.get("bypass_task_prefixes", []))
+        self.logger.info(
+            f"[{self.agent_id}] Engine initialized | model={self.model} | dir={self.agent_dir} | "
+            f"prompt={self.prompt_fingerprint} ({self.prompt_prefix.size_bytes} B)"
+        )
+        if self.trimmed_sections:
+            self.logger.warning(f"[{self.agent_id}] System prompt trimmed to {self.context.max_system_tokens} "
+                                f"tokens | dropped {self.trimmed_sections}")
 
     # ── Public API ────────────────────────────────────────────────────────
 
-    def run(self, user_input: str, input_source: str = "unknown", task_id: str = "") -> str:
+    @property
+    def client(self):
+        """Sync OpenAI client for run(), created on the first model call."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    if self.shared is not None:
+                        self._client = self.shared.openai_client(*self._client_args)
+                    else:
+                        from openai import OpenAI
+                        api_key, base_url = self._client_args
+                        self._client = OpenAI(api_key=api_key, base_url=base_url)
+        return self._client
+
+    @property
+    def tokens(self):
+        """TokenCounter for this model, created on first use so boot never loads a tokenizer."""
+        if self._tokens is None:
+            self._tokens = default_counter(self.model, self._token_encoding)
+        return self._tokens
+
+    @property
+    def prefix_tokens(self) -> int:
+        """Tokens in the system-prompt prefix, framing included — counted on first use."""
+        if self._prefix_tokens is None:
+            self._prefix_tokens = self.tokens.count(self.system_prompt) + MESSAGE_OVERHEAD
+        return self._prefix_tokens
+
+    def run(self, user_input: str, input_source: str = "unknown", task_id: str = "",
+            use_cache: bool = True) -> str:
         """
         Process input through security pipeline and return agent response.
 
@@ -135,71 +335,330 @@ class OpenClawEngine:
             input_source: telegram | discord | webhook | web_scrape |
                           council_internal | roxy_dispatch | etc.
             task_id:      originating task ID for audit trail linkage
+            use_cache:    False forces a fresh model call even if the response
+                          cache is enabled
         """
         # Layer 1: injection guard
-        inspection = self.guard.inspect(user_input, input_source=input_source, task_id=task_id)
-        self._emit_audit(inspection.audit_event)
-
+        inspection = self._screen(user_input, input_source, task_id)
         if inspection.blocked:
-            self.logger.warning(
-                f"[{self.agent_id}] BLOCKED | severity={inspection.severity} | "
-                f"source={input_source} | task_id={task_id}"
-            )
             return inspection.block_message
 
-        for w in inspection.warnings:
-            self.logger.warning(f"[{self.agent_id}] {w}")
+        cache_key = self._cache_key(inspection, input_source, task_id, use_cache)
+        cached = self._cache_lookup(cache_key, task_id)
+        if cached is not None:
+            return cached
+
+        refusal = self._check_budget(task_id)
+        if refusal is not None:
+            return refusal
+
+        # Fit the prompt to the context budget — oversize input never leaves the host
+        try:
+            messages = self._messages(inspection, task_id)
+        except PromptTooLarge as e:
+            return self._prompt_rejected(e, task_id)
 
         # Layer 2: model call
         try:
             resp = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user",   "content": inspection.sanitized_input},
-                ]
-            )
-            output = resp.choices[0].message.content
-            self.logger.info(
-                f"[{self.agent_id}] OK | task={task_id} | "
-                f"in={resp.usage.prompt_tokens} out={resp.usage.completion_tokens}"
+                messages=messages,
+                **self.sampling,
             )
-            self._emit_token_usage(task_id, resp.usage.prompt_tokens, resp.usage.completion_tokens)
-            return output
+            return self._model_ok(resp, task_id, cache_key, inspection.sanitized_input)
+        except Exception as e:
+            return self._model_failed(e, task_id)
+
+    async def arun(self, user_input: str, input_source: str = "unknown", task_id: str = "",
+                   timeout: float = None, use_cache: bool = True) -> str:
+        """
+        Async run(): same pipeline, but the model call goes through the pooled
+        AsyncModelClient — capped at inference.max_concurrency in-flight calls,
+        bounded by a deadline (timeout, default inference.timeout) and retried
+        with jittered backoff on 429 / 5xx.
+        """
+        # Layer 1: injection guard
+        inspection = self._screen(user_input, input_source, task_id)
+        if inspection.blocked:
+            return inspection.block_message
+
+        cache_key = self._cache_key(inspection, input_source, task_id, use_cache)
+        cached = self._cache_lookup(cache_key, task_id)
+        if cached is not None:
+            return cached
+
+        refusal = self._check_budget(task_id)
+        if refusal is not None:
+            return refusal
+
+        try:
+            messages = self._messages(inspection, task_id)
+        except PromptTooLarge as e:
+            return self._prompt_rejected(e, task_id)
 
+        # Layer 2: model call
+        try:
+            resp = await self.async_client.complete(messages, timeout=timeout, **self.sampling)
+            return self._model_ok(resp, task_id, cache_key, inspection.sanitized_input)
         except Exception as e:
-            self.logger.error(f"[{self.agent_id}] Model call failed: {e}")
-            self._emit_audit({
-                "event_id": f"ERR-{self.agent_id}-{task_id}",
-                "actor": self.agent_id, "action": "MODEL_CALL_FAILED",
-                "outcome": "FAILURE", "details": {"error": str(e)}, "task_id": task_id,
-            })
-            return f"[HEGEMON ERROR] Agent {self.agent_id} failed to process this request. Event logged."
+            return self._model_failed(e, task_id)
 
     def check_tool(self, tool_name: str, context: dict = None):
         """Authorize a tool call. Returns AuthorizationResult — check .allowed before proceeding."""
         result = self.tool_policy.authorize(tool_name, context or {})
-        self._emit_audit(result.audit_event)
+        if self.audit_emitter is not None or self.ledger is not None:   # skip building unread events
+            self._emit_audit(result.audit_event)
         return result
 
+    def corpus_read(self, path: str = None, query: str = None, k: int = 5, context: dict = None):
+        """
+        corpus_read tool: the full text of one corpus document (repo-relative
+        path), or the top-k sections for query as SearchHits. Authorized and
+        audited through check_tool(); raises PermissionError when denied and
+        ValueError for a path outside the corpus.
+        """
+        if (path is None) == (query is None):
+            raise ValueError("corpus_read needs exactly one of path or query")
+        auth = self.check_tool("corpus_read", context)
+        if not auth.allowed:
+            raise PermissionError(auth.denial_reason)
+        return self.corpus.read(path) if path is not None else self.corpus.search(query, k)
+
+    def remember(self, value: str, namespace: str = "notes", key: str = None,
+                 ttl_seconds: float = None):
+        """Write to the agent's memory store; a no-op when the store is off."""
+        if self.memory is not None:
+            self.memory.put(namespace, key, value, ttl_seconds)
+
+    def memory_stats(self):
+        """Write / cache / recall counters for the memory store, or None when it is off."""
+        return self.memory.stats() if self.memory is not None else None
+
+    def emitter_stats(self) -> dict:
+        """Queue depth / sent / spilled / dropped counters for each configured webhook."""
+        return {name: emitter.stats() for name, emitter in
+                (("audit", self.audit_emitter), ("token", self.token_emitter)) if emitter is not None}
+
+    def cache_stats(self):
+        """Hit / miss / eviction counters for the response cache, or None when it is off."""
+        return self.response_cache.stats() if self.response_cache is not None else None
+
+    def budget_stats(self):
+        """Today's token_ledger row for this agent, or None when budgets are off."""
+        return self.budget.usage(self.agent_id) if self.budget is not None else None
+
     # ── Internal helpers ──────────────────────────────────────────────────
 
+    def _screen(self, user_input: str, input_source: str, task_id: str):
+        inspection = self.guard.inspect(user_input, input_source=input_source, task_id=task_id)
+        self._emit_audit(inspection.audit_event)
+
+        if inspection.blocked:
+            self.logger.warning(
+                f"[{self.agent_id}] BLOCKED | severity={inspection.severity} | "
+                f"source={input_source} | task_id={task_id}"
+            )
+            return inspection
+
+        for w in inspection.warnings:
+            self.logger.warning(f"[{self.agent_id}] {w}")
+        return inspection
+
+    def _messages(self, inspection, task_id: str = "") -> list:
+        """
+        Chat messages for one call, within the context budget: the user input
+        is fitted first, then corpus sections and recalled memories share what
+        is left. Recalled memories lead the user message, boundary-wrapped like
+        untrusted input. Raises PromptTooLarge when the input cannot fit.
+        """
+        # Static prefix first, per-call content last — see prompt_prefix.py
+        messages = [self.prompt_prefix.message]
+        room = self.context.prompt_tokens - self.prefix_tokens - MESSAGE_OVERHEAD - REPLY_PRIMER
+        user_input = self._fit_input(inspection.sanitized_input, room, task_id)
+        room -= self.tokens.count(user_input)
+
+        if self.retrieval_enabled and room > MESSAGE_OVERHEAD:
+            block, _ = self.corpus.context(inspection.sanitized_input, self.retrieval_top_k,
+                                           self.retrieval_max_chars)
+            content = self._fit_block("Corpus sections relevant to this request:\n\n", block, room)
+            if content:
+                messages.append({"role": "system", "content": content})
+                room -= self.tokens.count(content) + MESSAGE_OVERHEAD
+        if self.memory is not None and self.memory_recall_tokens > 0:
+            # Recorded exchanges are past user input, so recalled memories go in
+            # the user turn as untrusted data — never in a system message
+            room -= self.tokens.count(self.guard.wrap_untrusted("\n\n", "memory"))
+            if room > MESSAGE_OVERHEAD:
+                recalled = self.memory.recall(inspection.sanitized_input,
+                                              min(self.memory_recall_tokens, room - MESSAGE_OVERHEAD))
+                lines = "\n".join(f"- [{entry.namespace}{'/' + entry.key if entry.key else ''}] "
+                                  f"{entry.value}" for entry in recalled)
+                content = self._fit_block("From your memory:\n", self.guard.strip_boundaries(lines), room)
+                if content:
+                    user_input = self.guard.wrap_untrusted(content, "memory") + "\n\n" + user_input
+        messages.append({"role": "user", "content": user_input})
+        return messages
+
+    def _fit_input(self, text: str, room: int, task_id: str) -> str:
+        """text within the input budget — truncated, or PromptTooLarge with overflow: reject."""
+        limit = room if self.context.max_input_tokens is None else min(room, self.context.max_input_tokens)
+        tokens = self.tokens.count(text, limit=limit)
+        if tokens <= limit:
+            return text
+        # Too little room left to keep a useful part of it: truncating would only mislead
+        if self.context.overflow == "reject" or limit < self.context.min_input_tokens:
+            raise PromptTooLarge(tokens, max(limit, 0), chars=len(text))
+        self.logger.warning(f"[{self.agent_id}] INPUT TRUNCATED | task={task_id} | "
+                            f"{len(text)} chars over {limit} tokens ({self.tokens.name}) — cut to fit")
+        return self.tokens.truncate(text, limit)
+
+    def _fit_block(self, heading: str, body: str, room: int) -> str:
+        """heading + body, body cut from the end to fit room with its framing; None if nothing fits."""
+        available = room - MESSAGE_OVERHEAD - self.tokens.count(heading)
+        if not body or available <= 0:
+            return None
+        return heading + self.tokens.truncate(body, available, tail_share=0.0)
+
+    def _model_ok(self, resp, task_id: str, cache_key: str = None, prompt: str = None) -> str:
+        output = resp.choices[0].message.content
+        details = getattr(resp.usage, "prompt_tokens_details", None)
+        cached_in = (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+        self.logger.info(
+            f"[{self.agent_id}] OK | task={task_id} | "
+            f"in={resp.usage.prompt_tokens} cached={cached_in} out={resp.usage.completion_tokens} | "
+            f"model={self.model} prompt={self.prompt_fingerprint}"
+        )
+        spend = None
+        if self.budget is not None:
+            spend = self.budget.record(self.agent_id, self.model,
+                                       resp.usage.prompt_tokens, resp.usage.completion_tokens)
+            if spend.status != self._budget_status:
+                if self._budget_status is not None or spend.status != "GREEN":
+                    self.logger.warning(
+                        f"[{self.agent_id}] BUDGET {spend.status} | "
+                        f"${spend.spent_usd:.4f} of ${spend.limit_usd:.2f} spent on {spend.date}")
+                self._budget_status = spend.status
+        self._emit_token_usage(task_id, resp.usage.prompt_tokens, resp.usage.completion_tokens,
+                               cached_in=cached_in, spend=spend)
+        if cache_key is not None and output is not None:
+            self.response_cache.put(cache_key, {
+                "output": output,
+                "model": self.model,
+                "prompt_tokens": resp.usage.prompt_tokens,
+                "completion_tokens": resp.usage.completion_tokens,
+                "task_id": task_id,
+                "cached_at": time.time(),
+            })
+        if self.memory_record_exchanges and self.memory is not None and prompt and output:
+            self.remember(f"Q: {prompt[:500]}\nA: {output[:1000]}", namespace="exchanges")
+        return output
+
+    def _cache_key(self, inspection, input_source: str, task_id: str, use_cache: bool):
+        """Response-cache key for this call, or None when the cache is off or bypassed."""
+        if (self.response_cache is None or not use_cache
+                or input_source in self.cache_bypass_sources
+                or (task_id and task_id.startswith(self.cache_bypass_task_prefixes))):
+            return None
+        # Injected sections change with the corpus, so its fingerprint is part of the prompt's
+        fingerprint = (f"{self.prompt_fingerprint}+{self.corpus.fingerprint}" if self.retrieval_enabled
+                       else self.prompt_fingerprint)
+        if self.memory is not None and self.memory_recall_tokens > 0:
+            fingerprint += f"+m{self.memory.last_id}"     # recalled memories too
+        return response_cache_key(self.model, fingerprint, inspection.sanitized_input, self.sampling)
+
+    def _cache_lookup(self, cache_key: str, task_id: str):
+        if cache_key is None:
+            return None
+        hit = self.response_cache.get(cache_key)
+        if hit is None:
+            return None
+        self.logger.info(
+            f"[{self.agent_id}] CACHE HIT | task={task_id} | "
+            f"saved in={hit['prompt_tokens']} out={hit['completion_tokens']}"
+        )
+        # Zero-cost usage event so Vera's spend totals stay exact
+        self._emit_token_usage(task_id, 0, 0, cache_hit=hit)
+        return hit["output"]
+
+    def _check_budget(self, task_id: str):
+        """None if the agent may spend today; otherwise the refusal message (and an audit event)."""
+        if self.budget is None:
+            return None
+        check = self.budget.check(self.agent_id)
+        if check.rolled_over:
+            self._emit_audit({
+                "event_id": f"BUDGET-{self.agent_id}-{check.date}",
+                "actor": self.agent_id, "action": "BUDGET_RESET", "outcome": "SUCCESS",
+                "details": {"date": check.date, "daily_limit": check.limit_usd}, "task_id": task_id,
+            })
+            self._budget_status = None
+        if check.allowed:
+            return None
+        self.logger.warning(
+            f"[{self.agent_id}] BUDGET EXCEEDED | task={task_id} | "
+            f"${check.spent_usd:.4f} of ${check.limit_usd:.2f} spent on {check.date}"
+        )
+        self._emit_audit({
+            "event_id": f"BUDGET-{self.agent_id}-{task_id}",
+            "actor": self.agent_id, "action": "RED_FLAG_TRIGGERED", "outcome": "BLOCKED",
+            "details": {"budget_status": check.status, "current_daily_spend": round(check.spent_usd, 4),
+                        "daily_limit": check.limit_usd, "date": check.date},
+            "task_id": task_id,
+        })
+        return (f"[HEGEMON BUDGET] Agent {self.agent_id} has reached its daily token budget "
+                f"(${check.limit_usd:.2f}); it resets at 00:00 UTC. Event logged.")
+
+    def _prompt_rejected(self, error: PromptTooLarge, task_id: str) -> str:
+        self.logger.warning(f"[{self.agent_id}] PROMPT REJECTED | task={task_id} | {error}")
+        self._emit_audit({
+            "event_id": f"CTX-{self.agent_id}-{task_id}",
+            "actor": self.agent_id, "action": "PROMPT_REJECTED", "outcome": "BUDGET_EXCEEDED",
+            "details": {"tokens_counted": error.tokens, "limit": error.limit, "chars": error.chars,
+                        "context_tokens": self.context.context_tokens, "counter": self.tokens.name},
+            "task_id": task_id,
+        })
+        return (f"[HEGEMON CONTEXT] Input to agent {self.agent_id} is too large for its context "
+                f"budget (limit {error.limit} tokens). Event logged.")
+
+    def _model_failed(self, error: Exception, task_id: str) -> str:
+        self.logger.error(f"[{self.agent_id}] Model call failed: {error}")
+        self._emit_audit({
+            "event_id": f"ERR-{self.agent_id}-{task_id}",
+            "actor": self.agent_id, "action": "MODEL_CALL_FAILED",
+            "outcome": "FAILURE", "details": {"error": str(error)}, "task_id": task_id,
+        })
+        return f"[HEGEMON ERROR] Agent {self.agent_id} failed to process this request. Event logged."
+
     def _emit_audit(self, event: dict):
-        if not self.audit_webhook or not event:
+        if not event:
             return
-        try:
-            requests.post(self.audit_webhook, json=event, timeout=5)
-        except Exception as e:
-            self.logger.warning(f"Audit webhook unreachable: {e}")
+        if self.ledger is not None:
+            self.ledger.emit(event)
+        if self.audit_emitter is not None:
+            self.audit_emitter.emit(event)
 
-    def _emit_token_usage(self, task_id: str, tokens_in: int, tokens_out: int):
-        if not self.token_webhook:
+    def _emit_token_usage(self, task_id: str, tokens_in: int, tokens_out: int,
+                          cached_in: int = 0, cache_hit: dict = None, spend: BudgetCheck = None):
+        if self.token_emitter is None:
             return
-        try:
-            requests.post(self.token_webhook, json={
-                "agent_name": self.agent_id, "model_used": self.model,
-                "tokens_input": tokens_in, "tokens_output": tokens_out,
-                "task_id": task_id, "operation_type": "agent_inference",
-            }, timeout=5)
-        except Exception as e:
-            self.logger.warning(f"Token webhook unreachable: {e}")
+        event = {
+            "agent_name": self.agent_id, "model_used": self.model,
+            "tokens_input": tokens_in, "tokens_output": tokens_out,
+            "tokens_input_cached": cached_in, "tokens_input_uncached": tokens_in - cached_in,
+            "prompt_fingerprint": self.prompt_fingerprint,
+            "task_id": task_id, "operation_type": "agent_inference",
+        }
+        if cache_hit is not None:
+            event.update({
+                "operation_type": "agent_inference_cached",
+                "cache_hit": True,
+                "tokens_saved_input": cache_hit["prompt_tokens"],
+                "tokens_saved_output": cache_hit["completion_tokens"],
+            })
+        if spend is not None:
+            event.update({
+                "cost_usd": round(self.budget.cost(self.model, tokens_in, tokens_out), 6),
+                "total_cost": round(spend.spent_usd, 6),
+                "budget_status": spend.status,
+            })
+        self.token_emitter.emit(event)
@@ -0,0 +1,147 @@
+"""
+openclaw_core.host
+───────────────────
+Single-process host for several agents behind one port, routed by path.
+
+    POST /roxy            → roxy's engine.run()
+    GET  /roxy/health     → roxy's health (as AgentServer's /health)
+    GET  /health          → host health: which agents are loaded, shared stats
+
+Engines are built lazily, on the first request for their path, and all draw
+from one SharedResources: one OpenAI connection pool, one prompt-file cache,
+one verdict cache and one sender per webhook. The compiled injection scanner
+and tool registry are process-wide already. Each agent keeps its own
+WorkerPool sized by the `server:` section of its config.yaml, so a slow agent
+queues and 429s on its own without starving the others; connection-level
+limits (max_connections, read_timeout) apply to the host as a whole.
+
+Usage:
+    host = AgentHost(["roxy", "sorin", "brom", "vera", "astra"])
+    server = HostServer(("0.0.0.0", 8000), host, webhook_secret=secret)
+    server.serve_forever()
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+from urllib.parse import urlsplit
+
+from .bundle import bundled_definition
+from .engine import OpenClawEngine
+from .server import AgentHandler, BoundedHTTPServer, ServerConfig, WorkerPool
+from .shared import SharedResources
+
+logger = logging.getLogger("hegemon.host")
+
+
+@dataclass
+class HostedAgent:
+    engine: OpenClawEngine
+    workers: WorkerPool
+
+
+class AgentHost:
+    def __init__(self, agents: Iterable[str], shared: SharedResources = None,
+                 agents_dir=None, engine_factory=OpenClawEngine, bundle_path=None):
+        """
+        agents         : agent names served, each also its URL path segment
+        shared         : resources shared by every engine (a fresh one by default)
+        agents_dir     : directory holding the agent folders (default: agents/)
+        engine_factory : callable(name, shared=..., agents_dir=..., [definition=...]) → engine
+        bundle_path    : agent bundle to boot from when fresh (see openclaw_core.bundle)
+        """
+        self.agents = tuple(name.lower() for name in agents)
+        self.shared = shared or SharedResources()
+        self.agents_dir = agents_dir
+        self.engine_factory = engine_factory
+        self.bundle_path = bundle_path
+        self._hosted = {}
+        self._locks = {name: threading.Lock() for name in self.agents}
+
+    def get(self, name: str) -> HostedAgent:
+        """The hosted agent, constructing its engine on first use. KeyError if not served here."""
+        hosted = self._hosted.get(name)
+        if hosted is not None:
+            return hosted
+        with self._locks[name]:
+            hosted = self._hosted.get(name)
+            if hosted is None:
+                kwargs = {"shared": self.shared, "agents_dir": self.agents_dir}
+                definition = bundled_definition(name, self.bundle_path) if self.bundle_path else None
+                if definition is not None:
+                    kwargs["definition"] = definition
+                engine = self.engine_factory(name, **kwargs)
+                config = ServerConfig.from_dict(getattr(engine, "config", {}).get("server", {}))
+                hosted = self._hosted[name] = HostedAgent(engine, WorkerPool(engine.agent_id, config))
+                logger.info(f"[{engine.agent_id}] Loaded on first request | concurrency={config.concurrency} "
+                            f"queue_depth={config.queue_depth}")
+        return hosted
+
+    def preload(self):
+        """Build every engine now rather than on first request."""
+        for name in self.agents:
+            self.get(name)
+
+    def loaded(self) -> list:
+        return [name for name in self.agents if name in self._hosted]
+
+    def stats(self) -> dict:
+        return {
+            "agents": {name: (self._hosted[name].workers.stats() if name in self._hosted else "not_loaded")
+                       for name in self.agents},
+            "shared": self.shared.stats(),
+        }
+
+    def shutdown(self):
+        for hosted in list(self._hosted.values()):
+            hosted.workers.shutdown()
+
+
+class HostHandler(AgentHandler):
+    """AgentHandler that picks the engine from the first path segment."""
+    server: "HostServer"
+    _hosted: HostedAgent = None
+
+    @property
+    def engine(self):
+        return self._hosted.engine
+
+    @property
+    def workers(self) -> WorkerPool:
+        return self._hosted.workers
+
+    def route(self) -> bool:
+        parts = urlsplit(self.path).path.strip("/").split("/", 1)
+        if parts == ["health"] and self.command == "GET":
+            self._respond(200, {"status": "ok", **self.server.host.stats(), "shed": self.server.shed})
+            return False
+        name = parts[0].lower()
+        if name not in self.server.host.agents:
+            self._respond(404, {"error": "Unknown agent", "agents": list(self.server.host.agents)})
+            return False
+        try:
+            self._hosted = self.server.host.get(name)
+        except Exception as e:
+            logger.error(f"Cannot load agent {name}: {e}")
+            self._respond(503, {"error": f"Agent {name} unavailable"})
+            return False
+        # The rest of the path is what a per-agent AgentServer would have seen
+        self.path = "/" + (parts[1] if len(parts) > 1 else "")
+        return True
+
+    def log_message(self, format, *args):
+        agent = self._hosted.engine.agent_id if self._hosted is not None else "host"
+        logger.debug(f"[{agent}] {format % args}")
+
+
+class HostServer(BoundedHTTPServer):
+    def __init__(self, server_address, host: AgentHost, config: ServerConfig = None,
+                 webhook_secret: str = "", handler_class=HostHandler):
+        self.host = host
+        self.webhook_secret = webhook_secret
+        super().__init__(server_address, handler_class, config or ServerConfig())
+
+    def server_close(self):
+        super().server_close()
+        self.host.shutdown()
@@ -0,0 +1,301 @@
+"""
+openclaw_core.ledger
+─────────────────────
+In-process, hash-chained writer for the local SQLite audit ledger
+(data/HEGEMON-AUDIT-LEDGER.sqlite, the audit_events table).
+
+Every record's integrity_hash covers its own fields and the integrity_hash of
+the record before it, so editing, deleting or reordering any row breaks the
+chain from that row onwards:
+
+    integrity_hash = sha256(prev_hash ␟ event_id ␟ actor ␟ action ␟ outcome
+                            ␟ timestamp ␟ task_id ␟ details_json)
+
+This is the spec's compute_integrity_hash() payload (event_id, actor, action,
+outcome, timestamp) extended with the previous hash, task_id and the stored
+details JSON, joined by the ASCII unit separator so field boundaries are
+unambiguous. The first record chains from GENESIS_HASH. details are stored
+exactly as hashed (canonical JSON: sorted keys, no whitespace), so a verifier
+recomputes the chain from the table alone.
+
+Writes use group commit: emit() only queues the event, and one daemon thread
+drains the queue in batches — one BEGIN IMMEDIATE … COMMIT per batch of up to
+batch_size events — on a WAL-mode connection with synchronous=NORMAL. The
+chain tail is re-read inside each transaction, so several processes appending
+to the same file still produce one linear chain.
+
+Usage:
+    ledger = LedgerWriter("data/HEGEMON-AUDIT-LEDGER.sqlite")
+    ledger.emit(inspection.audit_event)
+    ledger.flush()      # wait until everything queued is committed
+    ledger.stats()      # queue depth, written / batches / dropped counts
+    ledger.close()
+"""
+
+import atexit
+import datetime
+import hashlib
+import json
+import logging
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger("hegemon.ledger")
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+DEFAULT_LEDGER_PATH = REPO_ROOT / "data" / "HEGEMON-AUDIT-LEDGER.sqlite"
+
+GENESIS_HASH = "0" * 64
+_SEP = "\x1f"
+
+# event_id is not UNIQUE here (unlike the Postgres spec): SEC- ids repeat for
+# identical inputs and TOOL- ids within the same second. `id` is the chain order.
+# severity / input_source are virtual columns over details (SQLite >= 3.31),
+# so the hot InjectionGuard fields can be indexed and filtered without
+# parsing JSON per row.
+AUDIT_EVENTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+  id             INTEGER PRIMARY KEY AUTOINCREMENT,
+  event_id       TEXT,
+  timestamp      TEXT,
+  actor          TEXT,
+  action         TEXT,
+  outcome        TEXT,
+  details        TEXT,
+  task_id        TEXT,
+  prev_hash      TEXT,
+  integrity_hash TEXT,
+  created_at     TEXT,
+  severity       TEXT GENERATED ALWAYS AS (json_extract(details, '$.severity')) VIRTUAL,
+  input_source   TEXT GENERATED ALWAYS AS (json_extract(details, '$.input_source')) VIRTUAL
+);
+"""
+
+# Generated columns, as added to tables created before they existed
+_GENERATED = {
+    "severity": "TEXT GENERATED ALWAYS AS (json_extract(details, '$.severity')) VIRTUAL",
+    "input_source": "TEXT GENERATED ALWAYS AS (json_extract(details, '$.input_source')) VIRTUAL",
+}
+
+# The spec's idx_actor / idx_outcome / idx_timestamp / idx_task_id, each
+# ending in timestamp where it leads a time-bounded query, plus the composite
+# for "<outcome> events for <actor> in a window" and severity / input_source
+# indexes over the generated columns. SQLite
+# appends the rowid to every index entry, so (…, timestamp) indexes also
+# serve ledger_query's (timestamp, id) keyset order.
+AUDIT_EVENTS_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_actor         ON audit_events (actor, timestamp);
+CREATE INDEX IF NOT EXISTS idx_outcome       ON audit_events (outcome, timestamp);
+CREATE INDEX IF NOT EXISTS idx_timestamp     ON audit_events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_task_id       ON audit_events (task_id);
+CREATE INDEX IF NOT EXISTS idx_actor_outcome ON audit_events (actor, outcome, timestamp);
+CREATE INDEX IF NOT EXISTS idx_severity      ON audit_events (severity, timestamp);
+CREATE INDEX IF NOT EXISTS idx_input_source  ON audit_events (input_source, timestamp);
+"""
+
+_COLUMNS = ("event_id", "timestamp", "actor", "action", "outcome", "details",
+            "task_id", "prev_hash", "integrity_hash", "created_at")
+
+_INSERT = (f"INSERT INTO audit_events ({', '.join(_COLUMNS)}) "
+           f"VALUES ({', '.join('?' for _ in _COLUMNS)})")
+
+
+def canonical_details(details) -> str:
+    """The details JSON exactly as stored and hashed."""
+    return json.dumps(details if details is not None else {}, sort_keys=True,
+                      separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def chain_hash(prev_hash: str, event_id: str, actor: str, action: str, outcome: str,
+               timestamp: str, task_id: str, details_json: str) -> str:
+    payload = _SEP.join((prev_hash, event_id, actor, action, outcome, timestamp, task_id, details_json))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def ensure_schema(conn: sqlite3.Connection, indexes: bool = True):
+    """
+    Create audit_events, or add the chain and generated columns to one built
+    by an older ledger_builder; then create the indexes (skip them with
+    indexes=False for a bulk load, and call again afterwards).
+    """
+    conn.executescript(AUDIT_EVENTS_SCHEMA)
+    existing = {row[1] for row in conn.execute("PRAGMA table_xinfo(audit_events)")}
+    for column in _COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE audit_events ADD COLUMN {column} TEXT")
+    for column, definition in _GENERATED.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE audit_events ADD COLUMN {column} {definition}")
+    if indexes:
+        conn.executescript(AUDIT_EVENTS_INDEXES)
+    conn.commit()
+
+
+def _now() -> str:
+    return datetime.datetime.utcnow().isoformat() + "Z"
+
+
+class LedgerWriter:
+    def __init__(self, path=DEFAULT_LEDGER_PATH, max_queue: int = 100_000,
+                 batch_size: int = 1000, flush_interval: float = 0.05,
+                 put_timeout: float = 1.0, synchronous: str = "NORMAL"):
+        """
+        path           : SQLite ledger file (created with its parent directory if missing)
+        max_queue      : events held in memory before emit() waits for the writer
+        batch_size     : max events per transaction
+        flush_interval : max seconds an event waits for its batch to fill
+        put_timeout    : seconds emit() waits on a full queue before dropping the event
+        synchronous    : SQLite synchronous pragma — NORMAL (WAL default) or FULL
+        """
+        if synchronous.upper() not in ("NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"synchronous must be NORMAL, FULL or EXTRA, got {synchronous!r}")
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+
+        # isolation_level=None: transactions are opened explicitly per batch
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        ensure_schema(self._conn)
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._counters = {"written": 0, "batches": 0, "failed_batches": 0, "dropped": 0}
+        self.last_hash: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+        self._thread = threading.Thread(target=self._loop, name="ledger-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, cfg: dict = None) -> Optional["LedgerWriter"]:
+        """Build from the `ledger:` section of an agent's config.yaml. Returns None unless enabled."""
+        cfg = dict(cfg or {})
+        if not cfg.pop("enabled", False):
+            return None
+        return cls(cfg.pop("path", DEFAULT_LEDGER_PATH), **cfg)
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def emit(self, event: dict) -> bool:
+        """Queue an audit event for the ledger. Returns False if it had to be dropped."""
+        try:
+            self._queue.put(event, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            self._count("dropped")
+            logger.error(f"ledger queue full for {self.put_timeout}s — audit event dropped")
+            return False
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued event has been committed. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Commit what is queued (up to timeout), then stop the writer and close the database."""
+        if self._stop.is_set():
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        left = self._queue.qsize()
+        if left:
+            self._count("dropped", left)
+            logger.error(f"ledger closed with {left} audit events unwritten")
+        self._conn.close()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            counters = dict(self._counters)
+        return {
+            "path": str(self.path),
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self._queue.maxsize,
+            "last_hash": self.last_hash,
+            "last_error": self.last_error,
+            **counters,
+        }
+
+    # ── Worker ────────────────────────────────────────────────────────────
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+            try:
+                self._write(batch)
+            except Exception as e:      # never let the worker die
+                self.last_error = str(e)
+                self._count("failed_batches")
+                self._count("dropped", len(batch))
+                logger.exception(f"ledger write failed — {len(batch)} audit events lost: {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch: list):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read the tail inside the write lock: another process may have appended
+            row = conn.execute(
+                "SELECT integrity_hash FROM audit_events ORDER BY id DESC LIMIT 1").fetchone()
+            prev = row[0] if row and row[0] else GENESIS_HASH
+            created_at = _now()
+            rows = []
+            for event in batch:
+                event_id = str(event.get("event_id", ""))
+                actor = str(event.get("actor", ""))
+                action = str(event.get("action", ""))
+                outcome = str(event.get("outcome", ""))
+                timestamp = str(event.get("timestamp") or created_at)
+                task_id = str(event.get("task_id") or "")
+                details = canonical_details(event.get("details"))
+                prev_hash, prev = prev, chain_hash(prev, event_id, actor, action, outcome,
+                                                   timestamp, task_id, details)
+                rows.append((event_id, timestamp, actor, action, outcome, details,
+                             task_id, prev_hash, prev, created_at))
+            conn.executemany(_INSERT, rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.last_hash = prev
+        self._count("batches")
+        self._count("written", len(batch))
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._counters[key] += n
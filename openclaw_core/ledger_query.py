@@ -0,0 +1,165 @@
+"""
+openclaw_core.ledger_query
+───────────────────────────
+Read API over the local audit ledger (openclaw_core.ledger) with keyset
+pagination.
+
+    ledger = LedgerQuery()
+    page = ledger.events(actor="RXY-CEO", outcome="BLOCKED", since=hours_ago(24))
+    for event in page.events: ...
+    page = ledger.events(actor="RXY-CEO", outcome="BLOCKED", since=hours_ago(24),
+                         cursor=page.next_cursor)
+
+Results are ordered by (timestamp, id), newest first by default. A page ends
+with a cursor holding the (timestamp, id) of its last row, and the next page
+starts strictly after it — no OFFSET, so page 1,000 costs what page 1 does,
+and rows appended meanwhile never shift or repeat a page.
+
+Filters on actor / outcome / severity / input_source / task_id are served
+by one of the ledger's indexes (AUDIT_EVENTS_INDEXES): equality on the
+column, then a range on timestamp, with the rowid as tie-breaker. action
+and event_id are not indexed: combined with one of those filters they only
+narrow its index range, on their own they walk idx_timestamp. severity and
+input_source are generated columns over details, so filtering on them never
+parses JSON for rows outside the result.
+"""
+
+import base64
+import datetime
+import json
+import pathlib
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from .ledger import DEFAULT_LEDGER_PATH
+
+_FIELDS = ("id", "event_id", "timestamp", "actor", "action", "outcome", "details",
+           "task_id", "severity", "input_source", "prev_hash", "integrity_hash")
+
+# Equality filters accepted by events(); each is a column of audit_events
+_FILTERS = ("actor", "outcome", "action", "task_id", "severity", "input_source", "event_id")
+
+MAX_PAGE_SIZE = 1000
+
+
+def hours_ago(hours: float) -> str:
+    """ISO-8601 UTC timestamp `hours` before now, in the ledger's timestamp format."""
+    when = datetime.datetime.utcnow() - datetime.timedelta(hours=hours)
+    return when.isoformat() + "Z"
+
+
+def encode_cursor(timestamp: str, row_id: int) -> str:
+    raw = json.dumps([timestamp, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(timestamp, id) from a cursor. ValueError if it was not produced by encode_cursor."""
+    try:
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid ledger cursor: {cursor!r}") from e
+    if not isinstance(timestamp, str) or not isinstance(row_id, int):
+        raise ValueError(f"Invalid ledger cursor: {cursor!r}")
+    return timestamp, row_id
+
+
+@dataclass
+class Page:
+    events: list
+    next_cursor: Optional[str]      # None on the last page
+
+
+class LedgerQuery:
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        """
+        Opens the ledger read-only. One instance per thread — the connection
+        is not shared across threads.
+        """
+        path = pathlib.Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Ledger not found: {path}")
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def events(self, actor: str = None, outcome: str = None, action: str = None,
+               task_id: str = None, severity: str = None, input_source: str = None,
+               event_id: str = None, since: str = None, until: str = None,
+               limit: int = 100, cursor: str = None, newest_first: bool = True) -> Page:
+        """
+        One page of audit events matching every given filter.
+
+        since / until : ISO-8601 UTC bounds on timestamp (inclusive / exclusive)
+        limit         : rows per page (1 … MAX_PAGE_SIZE)
+        cursor        : next_cursor of the previous page
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}, got {limit}")
+        sql, params = self._select(
+            {"actor": actor, "outcome": outcome, "action": action, "task_id": task_id,
+             "severity": severity, "input_source": input_source, "event_id": event_id},
+            since, until, cursor, newest_first)
+        rows = self._conn.execute(sql, (*params, limit + 1)).fetchall()
+
+        more = len(rows) > limit
+        events = [self._event(row) for row in rows[:limit]]
+        next_cursor = encode_cursor(events[-1]["timestamp"], events[-1]["id"]) if more else None
+        return Page(events, next_cursor)
+
+    def iter_events(self, page_size: int = 500, **filters) -> Iterator[dict]:
+        """Every matching event, fetched page by page."""
+        cursor = None
+        while True:
+            page = self.events(limit=page_size, cursor=cursor, **filters)
+            yield from page.events
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def explain(self, since: str = None, until: str = None, cursor: str = None,
+                newest_first: bool = True, **filters) -> list:
+        """SQLite's query plan for events() with these arguments — which index serves it."""
+        sql, params = self._select({column: filters.get(column) for column in _FILTERS},
+                                   since, until, cursor, newest_first)
+        return [row[-1] for row in self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", (*params, 1))]
+
+    @staticmethod
+    def _select(values: dict, since: Optional[str], until: Optional[str],
+                cursor: Optional[str], newest_first: bool) -> tuple:
+        """(sql, params) for one page; the LIMIT is left as the last placeholder."""
+        clauses, params = [], []
+        for column in _FILTERS:
+            if values[column] is not None:
+                clauses.append(f"{column} = ?")
+                params.append(values[column])
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if cursor is not None:
+            clauses.append("(timestamp, id) < (?, ?)" if newest_first else "(timestamp, id) > (?, ?)")
+            params.extend(decode_cursor(cursor))
+        direction = "DESC" if newest_first else "ASC"
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (f"SELECT {', '.join(_FIELDS)} FROM audit_events {where} "
+               f"ORDER BY timestamp {direction}, id {direction} LIMIT ?")
+        return sql, params
+
+    @staticmethod
+    def _event(row: tuple) -> dict:
+        event = dict(zip(_FIELDS, row))
+        event["details"] = json.loads(event["details"]) if event["details"] else {}
+        return event
+
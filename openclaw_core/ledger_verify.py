@@ -0,0 +1,284 @@
+"""
+openclaw_core.ledger_verify
+────────────────────────────
+Integrity verification for the hash-chained audit ledger written by
+openclaw_core.ledger — the check AST-AUD-01 runs over the local SQLite file.
+
+A row is valid when its prev_hash equals the integrity_hash of the row before
+it (GENESIS_HASH for the first row) and its integrity_hash recomputes from
+its stored fields (see ledger.chain_hash). Verification stops at the first
+row that fails either test and reports it as the divergence.
+
+Two modes:
+
+  verify_incremental()  picks up from a checkpoint (last verified id and the
+                        chain hash at that id), checks that the checkpointed
+                        row is still there and unchanged, verifies only the
+                        rows appended since, and advances the checkpoint.
+  verify_range()        verifies any id range (or time range, via
+                        id_range_for_time) from scratch, split into chunks
+                        checked in parallel processes. Chunks are checked
+                        independently and their boundaries stitched in order
+                        afterwards, so the result is the same as one pass.
+
+A range that does not start at the first row is anchored on the stored
+integrity_hash of the row just before it; an incremental run is anchored on
+the checkpoint, which is kept in a separate JSON file so that rewriting the
+ledger alone cannot move it.
+
+Usage:
+    report = verify_incremental("data/HEGEMON-AUDIT-LEDGER.sqlite")
+    report = verify_range(path, first_id=1, last_id=5_000_000, workers=8)
+    report.ok, report.divergence, report.rows_per_sec
+"""
+
+import datetime
+import json
+import os
+import pathlib
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+from .ledger import DEFAULT_LEDGER_PATH, GENESIS_HASH, chain_hash
+
+_SELECT = ("SELECT id, event_id, prev_hash, actor, action, outcome, timestamp, task_id, details, "
+           "integrity_hash FROM audit_events WHERE id BETWEEN ? AND ? ORDER BY id")
+
+
+@dataclass
+class Divergence:
+    id: int
+    event_id: str
+    reason: str
+
+
+@dataclass
+class VerifyReport:
+    ledger: str
+    first_id: Optional[int]         # None when there was nothing to verify
+    last_id: Optional[int]
+    rows: int
+    seconds: float
+    workers: int
+    chain_hash: Optional[str]       # integrity_hash of the last verified row
+    divergence: Optional[Divergence] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.divergence is None
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "ok": self.ok, "rows_per_sec": round(self.rows_per_sec)}
+
+
+# ── Chunk worker ─────────────────────────────────────────────────────────────
+
+def _verify_chunk(path: str, lo: int, hi: int) -> tuple:
+    """
+    Check rows lo..hi against each other. Returns
+    (first prev_hash, first id, last integrity_hash, rows checked, divergence dict or None).
+    The link from the row before lo is checked by the caller.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    first_prev = first_id = prev = None
+    rows = 0
+    try:
+        for row_id, event_id, prev_hash, actor, action, outcome, timestamp, task_id, details, stored \
+                in conn.execute(_SELECT, (lo, hi)):
+            if first_id is None:
+                first_prev, first_id = prev_hash, row_id
+            elif prev_hash != prev:
+                return first_prev, first_id, prev, rows, {
+                    "id": row_id, "event_id": event_id,
+                    "reason": "prev_hash does not match the preceding row (row removed, inserted or reordered)"}
+            if stored != chain_hash(prev_hash or "", event_id or "", actor or "", action or "",
+                                    outcome or "", timestamp or "", task_id or "", details or ""):
+                return first_prev, first_id, prev, rows, {
+                    "id": row_id, "event_id": event_id,
+                    "reason": "integrity_hash does not match the row's contents"}
+            prev = stored
+            rows += 1
+    finally:
+        conn.close()
+    return first_prev, first_id, prev, rows, None
+
+
+# ── Ranges ───────────────────────────────────────────────────────────────────
+
+def _connect(path) -> sqlite3.Connection:
+    path = pathlib.Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Ledger not found: {path}")
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def id_range_for_time(path, since: str = None, until: str = None) -> Tuple[Optional[int], Optional[int]]:
+    """(first id, last id) of the rows with since <= timestamp < until (ISO-8601 UTC strings)."""
+    clauses, params = [], []
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = _connect(path)
+    try:
+        return conn.execute(f"SELECT MIN(id), MAX(id) FROM audit_events {where}", params).fetchone()
+    finally:
+        conn.close()
+
+
+def verify_range(path=DEFAULT_LEDGER_PATH, first_id: int = None, last_id: int = None,
+                 workers: int = 1, chunk_rows: int = 200_000, anchor: str = None) -> VerifyReport:
+    """
+    Verify rows first_id..last_id (default: the whole table).
+
+    workers    : processes to spread the chunks over (1 verifies in-process, 0 = cpu count)
+    chunk_rows : max ids per chunk
+    anchor     : hash the first row must chain from (default: the stored
+                 integrity_hash of the row before first_id, or GENESIS_HASH)
+    """
+    path = str(pathlib.Path(path))
+    t0 = time.perf_counter()
+    conn = _connect(path)
+    try:
+        # Two subqueries: SQLite answers MIN(id) and MAX(id) from the rowid b-tree
+        # only when each stands alone — together they scan the table
+        lo, hi = conn.execute("SELECT (SELECT MIN(id) FROM audit_events), "
+                              "(SELECT MAX(id) FROM audit_events)").fetchone()
+        if lo is not None:
+            lo = max(lo, first_id) if first_id is not None else lo
+            hi = min(hi, last_id) if last_id is not None else hi
+        if anchor is None and lo is not None:
+            row = conn.execute("SELECT integrity_hash FROM audit_events WHERE id < ? "
+                               "ORDER BY id DESC LIMIT 1", (lo,)).fetchone()
+            anchor = row[0] if row else GENESIS_HASH
+    finally:
+        conn.close()
+    if lo is None or lo > hi:
+        return VerifyReport(path, None, None, 0, time.perf_counter() - t0, 1, anchor)
+
+    # At least a few chunks per worker, so one slow chunk does not leave the others idle
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers > 1:
+        chunk_rows = min(chunk_rows, -(-(hi - lo + 1) // (workers * 4)))
+    chunk_rows = max(1, chunk_rows)
+    chunks = [(k, min(k + chunk_rows - 1, hi)) for k in range(lo, hi + 1, chunk_rows)]
+    workers = min(workers, len(chunks))
+    if workers == 1:
+        results = [_verify_chunk(path, a, b) for a, b in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_verify_chunk, [path] * len(chunks),
+                                    [a for a, _ in chunks], [b for _, b in chunks]))
+
+    # Stitch the chunks in id order; the first failure is the divergence
+    expected, rows, last_verified, divergence = anchor, 0, None, None
+    for first_prev, first_row, last_hash, n, failure in results:
+        if first_row is None:
+            continue                    # id gap spanning the whole chunk
+        if first_prev != expected:
+            event_id = _event_id(path, first_row)
+            divergence = Divergence(first_row, event_id,
+                                    "prev_hash does not match the preceding row "
+                                    "(row removed, inserted or reordered)")
+            break
+        rows += n
+        if failure is not None:
+            divergence = Divergence(**failure)
+            if n:
+                last_verified = last_hash
+            break
+        expected = last_verified = last_hash
+
+    return VerifyReport(path, lo, hi, rows, time.perf_counter() - t0, workers,
+                        last_verified, divergence)
+
+
+def _event_id(path: str, row_id: int) -> str:
+    conn = _connect(path)
+    try:
+        row = conn.execute("SELECT event_id FROM audit_events WHERE id = ?", (row_id,)).fetchone()
+        return row[0] if row else ""
+    finally:
+        conn.close()
+
+
+# ── Checkpoints ──────────────────────────────────────────────────────────────
+
+def default_checkpoint_path(ledger_path) -> pathlib.Path:
+    ledger_path = pathlib.Path(ledger_path)
+    return ledger_path.with_name(ledger_path.stem + ".checkpoint.json")
+
+
+def load_checkpoint(path) -> Optional[dict]:
+    path = pathlib.Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_checkpoint(path, checkpoint: dict):
+    """Write atomically, like bundle.write_bundle."""
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def verify_incremental(path=DEFAULT_LEDGER_PATH, checkpoint_path=None, workers: int = 1,
+                       chunk_rows: int = 200_000) -> VerifyReport:
+    """
+    Verify the rows appended since the last checkpoint and advance it.
+    The checkpoint is only moved forward when every new row verified.
+    Raises ValueError if the checkpoint was written for another ledger.
+    """
+    path = pathlib.Path(path)
+    checkpoint_path = pathlib.Path(checkpoint_path or default_checkpoint_path(path))
+    checkpoint = load_checkpoint(checkpoint_path)
+    first_id, anchor, verified_before = None, None, 0
+    if checkpoint is not None:
+        if checkpoint["ledger"] != str(path.resolve()):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to {checkpoint['ledger']}, not {path}")
+        t0 = time.perf_counter()
+        conn = _connect(path)
+        try:
+            row = conn.execute(_SELECT, (checkpoint["last_id"], checkpoint["last_id"])).fetchone()
+        finally:
+            conn.close()
+        reason = None
+        if row is None:
+            reason = "checkpointed row was removed"
+        elif row[9] != checkpoint["chain_hash"]:
+            reason = "checkpointed row's integrity_hash changed since it was verified"
+        elif row[9] != chain_hash(row[2] or "", row[1] or "", *(field or "" for field in row[3:9])):
+            reason = "checkpointed row's contents changed since it was verified"
+        if reason is not None:
+            return VerifyReport(str(path), checkpoint["last_id"], checkpoint["last_id"], 0,
+                                time.perf_counter() - t0, 1, None,
+                                Divergence(checkpoint["last_id"], row[1] if row else "", reason))
+        first_id, anchor = checkpoint["last_id"] + 1, checkpoint["chain_hash"]
+        verified_before = checkpoint.get("rows_verified", 0)
+
+    report = verify_range(path, first_id=first_id, workers=workers, chunk_rows=chunk_rows,
+                          anchor=anchor)
+    if report.ok and report.rows:
+        save_checkpoint(checkpoint_path, {
+            "ledger": str(path.resolve()),
+            "last_id": report.last_id,
+            "chain_hash": report.chain_hash,
+            "rows_verified": verified_before + report.rows,
+            "verified_at": datetime.datetime.utcnow().isoformat() + "Z",
+        })
+    elif report.ok and checkpoint is not None:
+        report.chain_hash = checkpoint["chain_hash"]
+    return report
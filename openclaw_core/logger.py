@@ -1,20 +1,170 @@
+"""
+openclaw_core.logger
+─────────────────────
+Per-agent log files written off the request thread.
+
+    logger = get_logger("logs/roxy.log", name="roxy")
+    logger.info("[RXY-CEO] OK | task=T1 | in=4153 cached=3968 out=12")
+
+Each log file gets its own logger (ASTRA_LOG.<name>) and its own pipeline:
+
+    logger ─ QueueHandler ─▶ bounded queue ─▶ QueueListener thread ─▶ file handler
+                                                                  └─▶ root handlers
+
+The request thread only formats the message and puts the record on the
+queue; opening, writing and rotating the file happen on the listener
+thread. When the queue is full the record is dropped and counted rather than
+blocking the caller — see stats().
+
+The file handler rotates by size (rotation="size": max_bytes, backup_count)
+or by time (rotation="time": when, backup_count), or never (rotation=None).
+json_lines=True writes one JSON object per record instead of the text line
+the reports parse. With propagate=True (the default) every record is also
+passed to the root logger's handlers — main.py's console and hegemon.log —
+from the listener thread.
+
+Loggers are cached per file: calling get_logger() again for the same path
+returns the same logger and ignores the new options.
+"""
+
+import atexit
+import datetime
+import json
 import logging
-import os
+import logging.handlers
+import pathlib
+import queue
+import threading
+
+TEXT_FORMAT = "%(asctime)s [ASTRA_LOG] %(levelname)s %(message)s"
+ROTATIONS = (None, "size", "time")
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: ts (UTC), level, logger, message [, exc]."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = {
+            "ts": datetime.datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            line["exc"] = self.formatException(record.exc_info)
+        return json.dumps(line, ensure_ascii=False)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking on a full queue."""
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _RootForwarder(logging.Handler):
+    """Hands records to the root logger's handlers, on the listener thread."""
+
+    def emit(self, record: logging.LogRecord):
+        logging.getLogger().handle(record)
+
+
+class _Pipeline:
+    def __init__(self, path: pathlib.Path, logger: logging.Logger, rotation, max_bytes: int,
+                 backup_count: int, when: str, json_lines: bool, queue_size: int, propagate: bool):
+        if rotation not in ROTATIONS:
+            raise ValueError(f"rotation must be one of {ROTATIONS}, got {rotation!r}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if rotation == "size":
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        elif rotation == "time":
+            handler = logging.handlers.TimedRotatingFileHandler(
+                path, when=when, backupCount=backup_count, encoding="utf-8", delay=True, utc=True)
+        else:
+            handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+        handler.setFormatter(JsonLineFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+
+        self.path = path
+        self.logger = logger
+        self.rotation = rotation
+        self.json_lines = json_lines
+        self.file_handler = handler
+        self.queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        handlers = (handler, _RootForwarder()) if propagate else (handler,)
+        self.listener = logging.handlers.QueueListener(self.queue_handler.queue, *handlers)
+        self.listener.start()
+        logger.addHandler(self.queue_handler)
+
+    def stop(self):
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()            # drains what is queued first
+        self.file_handler.close()
+
+    def stats(self) -> dict:
+        q = self.queue_handler.queue
+        return {"path": str(self.path), "rotation": self.rotation, "json_lines": self.json_lines,
+                "queue_depth": q.qsize(), "queue_max": q.maxsize, "dropped": self.queue_handler.dropped}
+
+
+_pipelines = {}         # resolved log path → _Pipeline
+_lock = threading.Lock()
+
+
+def get_logger(log_file, name: str = None, level=logging.INFO, rotation: str = "size",
+               max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5, when: str = "midnight",
+               json_lines: bool = False, queue_size: int = 10_000, propagate: bool = True) -> logging.Logger:
+    """
+    The logger writing to log_file, created on first use.
+
+    name         : logger suffix (ASTRA_LOG.<name>), default the file's stem
+    rotation     : "size", "time" or None
+    max_bytes    : file size that triggers a size rotation
+    backup_count : rotated files kept
+    when         : TimedRotatingFileHandler interval for time rotation (UTC)
+    json_lines   : write JSON lines instead of the text format
+    queue_size   : records buffered before new ones are dropped
+    propagate    : also pass records to the root logger's handlers
+    """
+    path = pathlib.Path(log_file).resolve()
+    with _lock:
+        pipeline = _pipelines.get(path)
+        if pipeline is not None:
+            return pipeline.logger
+        logger = logging.getLogger(f"ASTRA_LOG.{name or path.stem}")
+        logger.setLevel(level.upper() if isinstance(level, str) else level)
+        logger.propagate = False    # root handlers are fed from the listener instead
+        _pipelines[path] = _Pipeline(path, logger, rotation, max_bytes, backup_count, when,
+                                     json_lines, queue_size, propagate)
+        return logger
+
+
+def logger_from_config(cfg: dict, default_file, name: str = None) -> logging.Logger:
+    """get_logger() from the `logging:` section of an agent's config.yaml."""
+    cfg = dict(cfg or {})
+    return get_logger(cfg.pop("log_file", default_file), name=name, **cfg)
 
 
-def get_logger(log_file):
+def stats() -> list:
+    """Queue depth and dropped-record count of every log pipeline in this process."""
+    with _lock:
+        return [pipeline.stats() for pipeline in _pipelines.values()]
 
-    logger = logging.getLogger("ASTRA_LOG")
-    logger.setLevel(logging.INFO)
 
-    if not logger.handlers:
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+def shutdown():
+    """Write out everything queued and close the files. Registered atexit."""
+    with _lock:
+        pipelines = list(_pipelines.values())
+        _pipelines.clear()
+    for pipeline in pipelines:
+        pipeline.stop()
 
-        handler = logging.FileHandler(log_file)
-        formatter = logging.Formatter(
-            '%(asctime)s [ASTRA_LOG] %(levelname)s %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
 
-    return logger
+atexit.register(shutdown)
@@ -1,5 +1,88 @@
+"""
+openclaw_core.memory
+─────────────────────
+Agent memory: the static namespace manifest (load_memory) and MemoryStore, a
+persistent per-agent store the engine writes to and recalls from.
+
+MemoryStore is an append-only log in SQLite (WAL mode), one file per agent:
+
+    memory_entries (id, namespace, key, value, tokens, created_at, expires_at, current)
+    memory_terms   (term, entry_id)             — inverted index for recall()
+
+put() appends a row and clears `current` on the previous row for the same
+(namespace, key); delete() only clears `current`; entries without a key are
+never superseded. compact() removes rows that are no longer current or have
+expired, along with their terms, in short transactions.
+
+Writes use group commit like openclaw_core.ledger: put() and delete() queue
+the change, and one daemon thread commits batches of up to batch_size. get()
+first checks the changes still waiting for their batch (held until it
+commits, never evicted), then an in-process LRU cache, then the database,
+so an agent always reads its own writes; recall() reads the database and
+sees changes once their batch is committed (flush() waits). The cache
+assumes one MemoryStore per file — the agent's own process.
+
+recall(query, max_tokens) ranks entries sharing terms with the query — idf
+of the matching terms, decayed by age with half_life_hours — and packs the
+best into max_tokens. Each query term reads only its most recent
+`candidates` postings, so recall cost does not grow with the size of the
+store, and nothing is loaded at open.
+
+Usage:
+    memory = MemoryStore("data/roxy_memory.sqlite")
+    memory.put("preferences", "report_format", "Weekly report as a table, USD")
+    memory.put("notes", None, "Sorin flagged the newsletter venture as LOW ROI")
+    memory.get("preferences", "report_format")
+    for entry in memory.recall("how should the weekly report look?", max_tokens=300): ...
+    memory.compact()
+"""
+
+import atexit
+import heapq
 import json
+import logging
+import math
 import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from .corpus_index import tokenize
+
+logger = logging.getLogger("hegemon.memory")
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+MEMORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory_entries (
+  id         INTEGER PRIMARY KEY AUTOINCREMENT,
+  namespace  TEXT NOT NULL,
+  key        TEXT,
+  value      TEXT NOT NULL,
+  tokens     INTEGER NOT NULL,
+  created_at REAL NOT NULL,
+  expires_at REAL,
+  current    INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_memory_key ON memory_entries (namespace, key) WHERE current = 1;
+CREATE INDEX IF NOT EXISTS idx_memory_stale ON memory_entries (id) WHERE current = 0;
+CREATE INDEX IF NOT EXISTS idx_memory_expiry ON memory_entries (expires_at)
+  WHERE current = 1 AND expires_at IS NOT NULL;
+CREATE TABLE IF NOT EXISTS memory_terms (
+  term     TEXT NOT NULL,
+  entry_id INTEGER NOT NULL,
+  PRIMARY KEY (term, entry_id)
+) WITHOUT ROWID;
+"""
+
+# Distinct terms indexed per entry; long entries are recalled by their first ones
+MAX_TERMS_PER_ENTRY = 48
+_MISSING = object()
 
 
 def load_memory(path):
@@ -10,3 +93,375 @@ def load_memory(path):
             return json.load(f)
 
     return {}
+
+
+def approx_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token) used to fit recall() into a budget."""
+    return max(1, len(text) // 4)
+
+
+def _index_terms(key: Optional[str], value: str) -> List[str]:
+    """Terms an entry is recalled by: its key's, then its value's, first MAX_TERMS_PER_ENTRY distinct."""
+    return list(dict.fromkeys(tokenize(f"{key or ''}\n{value}")))[:MAX_TERMS_PER_ENTRY]
+
+
+@dataclass(frozen=True)
+class MemoryEntry:
+    id: int
+    namespace: str
+    key: Optional[str]
+    value: str
+    tokens: int
+    created_at: float
+    score: float = 0.0
+
+
+class MemoryStore:
+    def __init__(self, path, cache_size: int = 4096, batch_size: int = 500,
+                 flush_interval: float = 0.05, max_queue: int = 100_000,
+                 half_life_hours: float = 168.0, candidates: int = 200):
+        """
+        path            : SQLite file (created with its parent directory if missing)
+        cache_size      : (namespace, key) lookups held by the get() LRU
+        batch_size      : max changes per transaction
+        flush_interval  : max seconds a change waits for its batch to fill
+        max_queue       : changes held in memory before put() waits for the writer
+        half_life_hours : age at which a recalled entry's score halves
+        candidates      : most recent postings read per query term in recall()
+        """
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.half_life = half_life_hours * 3600
+        self.candidates = candidates
+
+        self._conn = self._connect()
+        # Postings land all over the term index; keep more of it in memory for the writer
+        self._conn.execute("PRAGMA cache_size=-65536")
+        self._conn.executescript(MEMORY_SCHEMA)
+        self._read_lock = threading.Lock()
+        self._read_conn = self._connect()
+
+        self._cache = OrderedDict()         # (namespace, key) → (value or _MISSING, expires_at)
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._pending = {}                  # (namespace, key) → (seq, item) queued but not yet committed
+        self._seq = 0                       # bumped by every keyed put() / delete()
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats_lock = threading.Lock()
+        self._counters = {"written": 0, "batches": 0, "failed_batches": 0, "cache_hits": 0,
+                          "cache_misses": 0, "recalls": 0, "compacted": 0}
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"memory-{self.path.stem}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, cfg: dict = None, agent_name: str = "agent") -> Optional["MemoryStore"]:
+        """Build from the `memory.store:` section of an agent's config.yaml. Returns None unless enabled."""
+        cfg = dict(cfg or {})
+        if not cfg.pop("enabled", False):
+            return None
+        path = cfg.pop("path", REPO_ROOT / "data" / f"{agent_name}_memory.sqlite")
+        return cls(path, **cfg)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # ── Writes ────────────────────────────────────────────────────────────
+
+    def put(self, namespace: str, key: Optional[str], value: str, ttl_seconds: float = None):
+        """
+        Append an entry. With a key it replaces the current value for
+        (namespace, key); without one it is simply added.
+        """
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+        seq = self._stage((namespace, key), (value, expires_at)) if key is not None else None
+        self._queue.put(("put", seq, namespace, key, value, now, expires_at))
+
+    def delete(self, namespace: str, key: str):
+        seq = self._stage((namespace, key), (_MISSING, None))
+        self._queue.put(("delete", seq, namespace, key))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued change has been committed. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Commit what is queued (up to timeout), then stop the writer and close the database."""
+        if self._stop.is_set():
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        left = self._queue.qsize()
+        if left:
+            logger.error(f"memory store {self.path} closed with {left} changes unwritten")
+        self._conn.close()
+        self._read_conn.close()
+
+    # ── Reads ─────────────────────────────────────────────────────────────
+
+    def get(self, namespace: str, key: str, default=None):
+        """Current value for (namespace, key), or default."""
+        now = time.time()
+        cache_key = (namespace, key)
+        with self._cache_lock:
+            pending = self._pending.get(cache_key)
+            hit = pending[1] if pending is not None else self._cache.get(cache_key)
+            if hit is not None and cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+            seq = self._seq
+        if hit is not None:
+            self._count("cache_hits")
+            value, expires_at = hit
+        else:
+            self._count("cache_misses")
+            with self._read_lock:
+                row = self._read_conn.execute(
+                    "SELECT value, expires_at FROM memory_entries "
+                    "WHERE namespace = ? AND key = ? AND current = 1", (namespace, key)).fetchone()
+            value, expires_at = row if row else (_MISSING, None)
+            with self._cache_lock:
+                # A put() or delete() since the read may be newer than the row; don't cache over it
+                if self._seq == seq:
+                    self._cache_put(cache_key, (value, expires_at))
+        if value is _MISSING or (expires_at is not None and expires_at <= now):
+            return default
+        return value
+
+    def recent(self, limit: int = 20, namespaces: Iterable[str] = None) -> List[MemoryEntry]:
+        """The newest current entries, newest first."""
+        where, params = self._filters(namespaces)
+        with self._read_lock:
+            rows = self._read_conn.execute(
+                f"SELECT id, namespace, key, value, tokens, created_at FROM memory_entries "
+                f"WHERE {where} ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+        return [MemoryEntry(*row) for row in rows]
+
+    def recall(self, query: str, max_tokens: int = 400, namespaces: Iterable[str] = None,
+               limit: int = 20) -> List[MemoryEntry]:
+        """
+        Up to `limit` entries relevant to query whose values fit in
+        max_tokens together, best first. Score: sum of idf over the query
+        terms an entry contains, halved every half_life_hours of age.
+        """
+        self._count("recalls")
+        terms = list(dict.fromkeys(tokenize(query)))[:16]
+        if not terms or max_tokens <= 0:
+            return []
+        now = time.time()
+        with self._read_lock:
+            conn = self._read_conn
+            total = conn.execute("SELECT MAX(id) FROM memory_entries").fetchone()[0] or 0
+            relevance = {}
+            for term in terms:
+                ids = [row[0] for row in conn.execute(
+                    "SELECT entry_id FROM memory_terms WHERE term = ? ORDER BY entry_id DESC LIMIT ?",
+                    (term, self.candidates))]
+                if not ids:
+                    continue
+                df = len(ids)
+                if df == self.candidates:
+                    # Common term: estimate its document frequency from how far back
+                    # its newest postings reach instead of counting them all
+                    df = df * total / max(1, total - ids[-1] + 1)
+                idf = math.log(1 + total / df)
+                for entry_id in ids:
+                    relevance[entry_id] = relevance.get(entry_id, 0.0) + idf
+            if not relevance:
+                return []
+            # Only the most relevant candidates (newest first among equals) are read back
+            best = heapq.nlargest(self.candidates, relevance.items(), key=lambda item: (item[1], item[0]))
+            where, params = self._filters(namespaces)
+            rows = conn.execute(
+                f"SELECT id, namespace, key, value, tokens, created_at FROM memory_entries "
+                f"WHERE id IN ({', '.join('?' * len(best))}) AND {where}",
+                (*(entry_id for entry_id, _ in best), *params)).fetchall()
+        scored = sorted(
+            (MemoryEntry(*row, score=round(relevance[row[0]] * 0.5 ** ((now - row[5]) / self.half_life), 4))
+             for row in rows),
+            key=lambda entry: (-entry.score, -entry.id))
+
+        picked, used = [], 0
+        for entry in scored:
+            if used + entry.tokens > max_tokens:
+                continue
+            picked.append(entry)
+            used += entry.tokens
+            if len(picked) >= limit:
+                break
+        return picked
+
+    @property
+    def last_id(self) -> int:
+        """Id of the newest committed entry (0 when empty) — changes on every committed put."""
+        with self._read_lock:
+            return self._read_conn.execute("SELECT MAX(id) FROM memory_entries").fetchone()[0] or 0
+
+    # ── Maintenance ───────────────────────────────────────────────────────
+
+    def compact(self, batch: int = 10_000, vacuum: bool = False) -> int:
+        """
+        Delete superseded, deleted and expired entries and their terms, `batch`
+        rows per transaction so writers are never held up for long. Returns
+        the number of entries removed.
+        """
+        conn = self._connect()
+        removed = 0
+        try:
+            conn.execute("UPDATE memory_entries SET current = 0 "
+                         "WHERE current = 1 AND expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = conn.execute("SELECT id, key, value FROM memory_entries WHERE current = 0 "
+                                        "ORDER BY id LIMIT ?", (batch,)).fetchall()
+                    conn.executemany("DELETE FROM memory_terms WHERE term = ? AND entry_id = ?",
+                                     [(term, entry_id) for entry_id, key, value in rows
+                                      for term in _index_terms(key, value)])
+                    conn.executemany("DELETE FROM memory_entries WHERE id = ?", [(r[0],) for r in rows])
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                removed += len(rows)
+                if len(rows) < batch:
+                    break
+            if vacuum:
+                conn.execute("VACUUM")
+        finally:
+            conn.close()
+        self._count("compacted", removed)
+        return removed
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            counters = dict(self._counters)
+        with self._cache_lock:
+            cached = len(self._cache)
+        return {
+            "path": str(self.path),
+            "queue_depth": self._queue.qsize(),
+            "cached_keys": cached,
+            "last_error": self.last_error,
+            **counters,
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _filters(namespaces: Optional[Iterable[str]]) -> tuple:
+        clauses, params = ["current = 1", "(expires_at IS NULL OR expires_at > ?)"], [time.time()]
+        if namespaces is not None:
+            namespaces = list(namespaces)
+            clauses.append(f"namespace IN ({', '.join('?' * len(namespaces))})")
+            params.extend(namespaces)
+        return " AND ".join(clauses), params
+
+    def _stage(self, cache_key: tuple, item: tuple) -> int:
+        """Record a queued keyed change for get(); returns its sequence number."""
+        with self._cache_lock:
+            self._seq += 1
+            self._pending[cache_key] = (self._seq, item)
+            self._cache_put(cache_key, item)
+            return self._seq
+
+    def _settle(self, batch: list, committed: bool):
+        """After a batch: drop its changes from the pending map (and, if lost, from the cache)."""
+        with self._cache_lock:
+            for op in batch:
+                seq, cache_key = op[1], (op[2], op[3])
+                if seq is None:
+                    continue
+                pending = self._pending.get(cache_key)
+                if pending is not None and pending[0] == seq:
+                    del self._pending[cache_key]
+                    if not committed:
+                        self._cache.pop(cache_key, None)
+
+    def _cache_put(self, cache_key: tuple, item: tuple):
+        """Caller holds _cache_lock."""
+        self._cache[cache_key] = item
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+            try:
+                self._write(batch)
+                self._settle(batch, committed=True)
+            except Exception as e:      # never let the worker die
+                self._settle(batch, committed=False)
+                self.last_error = str(e)
+                self._count("failed_batches")
+                logger.exception(f"memory write failed — {len(batch)} changes lost: {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch: list):
+        conn = self._conn
+        terms = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for op in batch:
+                if op[0] == "delete":
+                    conn.execute("UPDATE memory_entries SET current = 0 "
+                                 "WHERE namespace = ? AND key = ? AND current = 1", op[2:])
+                    continue
+                _, _, namespace, key, value, created_at, expires_at = op
+                if key is not None:
+                    conn.execute("UPDATE memory_entries SET current = 0 "
+                                 "WHERE namespace = ? AND key = ? AND current = 1", (namespace, key))
+                entry_id = conn.execute(
+                    "INSERT INTO memory_entries (namespace, key, value, tokens, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (namespace, key, value, approx_tokens(value), created_at, expires_at)).lastrowid
+                terms.extend((term, entry_id) for term in _index_terms(key, value))
+            # In index order, so the batch's postings land in as few b-tree pages as possible
+            terms.sort()
+            conn.executemany("INSERT OR IGNORE INTO memory_terms (term, entry_id) VALUES (?, ?)", terms)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._count("batches")
+        self._count("written", len(batch))
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._counters[key] += n
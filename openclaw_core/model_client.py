@@ -0,0 +1,172 @@
+"""
+openclaw_core.model_client
+───────────────────────────
+Async chat-completion calls with connection reuse, a concurrency cap,
+per-call deadlines and jittered retry.
+
+One AsyncOpenAI client (and its pooled keep-alive HTTP transport) is kept per
+event loop and shared by every call on that loop. Each call:
+
+  - waits for a slot on the per-agent semaphore (max_concurrency)
+  - must finish — including queueing and retries — within `timeout` seconds,
+    else ModelDeadlineExceeded
+  - retries 429 / 5xx / timeouts / connection errors with full-jitter
+    exponential backoff, honouring Retry-After when the server sends one;
+    other 4xx errors are raised immediately
+
+The SDK's own retry loop is disabled (max_retries=0) so the deadline covers
+every attempt.
+
+Usage:
+    client = AsyncModelClient(model="gpt-4o-mini", max_concurrency=4, timeout=60)
+    resp = await client.complete(messages)
+
+Point base_url (or OPENAI_BASE_URL) at scripts/fake_openai_server.py to test
+without a real key.
+"""
+
+import asyncio
+import logging
+import random
+import weakref
+from typing import Optional
+
+logger = logging.getLogger("hegemon.model_client")
+
+
+def _retryable() -> tuple:
+    # openai is imported on the first model call, not at boot
+    import openai
+    return (openai.RateLimitError, openai.InternalServerError,
+            openai.APITimeoutError, openai.APIConnectionError)
+
+
+class ModelDeadlineExceeded(TimeoutError):
+    """The model call (queueing + all attempts) did not finish within its deadline."""
+
+
+class AsyncModelClient:
+    def __init__(self, model: str, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: int = 4, timeout: float = 60.0, max_retries: int = 3,
+                 backoff: float = 0.5, backoff_max: float = 8.0, clients=None):
+        """
+        model           : model name sent with every request
+        api_key         : OpenAI key (None → OPENAI_API_KEY)
+        base_url        : API base URL (None → OPENAI_BASE_URL or api.openai.com)
+        max_concurrency : model calls in flight per agent; the rest wait their turn
+        timeout         : per-call deadline in seconds, covering queueing and retries
+        max_retries     : retries after the first attempt on 429 / 5xx / transport errors
+        backoff         : base retry delay in seconds (doubles each attempt, capped)
+        backoff_max     : cap on a single retry delay
+        clients         : optional SharedResources — AsyncOpenAI clients (and their
+                          connection pools) then come from it and are shared with
+                          other agents in the process; the concurrency cap stays
+                          per agent
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.clients = clients
+        # AsyncOpenAI connections and asyncio.Semaphore are bound to one loop
+        self._per_loop = weakref.WeakKeyDictionary()    # loop → (AsyncOpenAI, Semaphore)
+        self.calls = 0
+        self.retries = 0
+        self.deadline_exceeded = 0
+        self.in_flight = 0
+
+    @classmethod
+    def from_config(cls, model: str, cfg: dict = None, api_key: Optional[str] = None,
+                    clients=None) -> "AsyncModelClient":
+        """Build from the `inference:` section of an agent's config.yaml."""
+        return cls(model, api_key=api_key, clients=clients, **(cfg or {}))
+
+    async def complete(self, messages: list, timeout: Optional[float] = None, **kwargs):
+        """
+        Create a chat completion. Returns the SDK response object.
+        Raises ModelDeadlineExceeded, or the last API error once retries are spent.
+        """
+        loop = asyncio.get_running_loop()
+        client, semaphore = self._for_loop(loop)
+        budget = self.timeout if timeout is None else timeout
+        deadline = loop.time() + budget
+        self.calls += 1
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), budget)
+        except asyncio.TimeoutError:
+            self.deadline_exceeded += 1
+            raise ModelDeadlineExceeded(f"no model slot free within {budget:.1f}s") from None
+
+        self.in_flight += 1
+        retryable = _retryable()
+        try:
+            attempt = 0
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.deadline_exceeded += 1
+                    raise ModelDeadlineExceeded(f"model call exceeded {budget:.1f}s deadline")
+                try:
+                    return await asyncio.wait_for(
+                        client.chat.completions.create(model=self.model, messages=messages, **kwargs),
+                        remaining,
+                    )
+                except asyncio.TimeoutError:
+                    self.deadline_exceeded += 1
+                    raise ModelDeadlineExceeded(f"model call exceeded {budget:.1f}s deadline") from None
+                except retryable as e:
+                    delay = self._retry_delay(attempt, e)
+                    if attempt >= self.max_retries or loop.time() + delay >= deadline:
+                        raise
+                    attempt += 1
+                    self.retries += 1
+                    logger.warning(f"Model call retry {attempt}/{self.max_retries} in {delay:.2f}s: "
+                                   f"{type(e).__name__}")
+                    await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "retries": self.retries,
+            "deadline_exceeded": self.deadline_exceeded,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    async def aclose(self):
+        """Close the pooled transport for the running loop (shared clients are left open)."""
+        entry = self._per_loop.pop(asyncio.get_running_loop(), None)
+        if entry is not None and self.clients is None:
+            await entry[0].close()
+
+    def _for_loop(self, loop):
+        entry = self._per_loop.get(loop)
+        if entry is None:
+            if self.clients is not None:
+                client = self.clients.async_openai_client(self.api_key, self.base_url, self.timeout)
+            else:
+                from openai import AsyncOpenAI
+                client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                     max_retries=0, timeout=self.timeout)
+            entry = self._per_loop[loop] = (client, asyncio.Semaphore(self.max_concurrency))
+        return entry
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        # Full jitter: uniform(0, min(cap, base * 2^attempt)); never below Retry-After
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:      # HTTP-date form — fall back to our own backoff
+            return delay
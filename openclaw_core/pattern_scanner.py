@@ -0,0 +1,320 @@
+"""
+openclaw_core.pattern_scanner
+──────────────────────────────
+Scanning engine behind InjectionGuard.inspect().
+
+The original guard ran every compiled pattern against the full input, one
+after another, so a large document was walked ~42 times per request. This
+module replaces that loop with a two-stage scan:
+
+  Stage 1 — Literal prefilter: the input is case-folded once and every
+             literal a pattern cannot match without (e.g. "ignore", "[inst]")
+             is located with str's substring search — C speed, no regex
+             engine, no backtracking.
+  Stage 2 — Confirmation: only patterns whose required literals were ALL seen
+             are confirmed against the input, and patterns with a leading
+             anchor literal are only tried where that anchor occurs. On clean
+             text most patterns are ruled out in stage 1 and never run.
+
+Results are identical to the sequential loop: same matched patterns, same
+order (severity, then declaration order), same highest severity.
+
+Bounded work: scan() can stop at the first match of a caller-chosen set of
+severities (decide-fast) and raises ScanBudgetExceeded once a monotonic
+deadline passes. The deadline is checked between rules and periodically inside
+anchored confirmation, so one adversarial input cannot pin a request thread.
+A single regex call cannot be interrupted, so a scan may overrun the deadline
+by the cost of one confirmation — every confirmation is linear in the input.
+
+Streaming: stream() returns a StreamScan that is fed chunks and scans each
+one together with the last `overlap` characters of the previous window, so
+matches spanning a chunk boundary are still found. Whitespace runs (\\s+,
+\\s*) have no length bound either, so before the tail is carried every run
+longer than STREAM_SPACE_RUN is cut down to STREAM_SPACE_RUN characters —
+a 5000-space gap between "ignore" and "previous instructions" still lands in
+one window. Rules whose matches are otherwise unbounded (the DOTALL chains)
+carry a stream confirmer that keeps its own state across windows.
+
+SequentialScanner keeps the original per-pattern loop as the reference
+implementation for benchmarks and differential checks.
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Flags every guard pattern is compiled with.
+PATTERN_FLAGS = re.IGNORECASE | re.DOTALL
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+# (dotted capital I, dotless i, long s, Kelvin sign). str.lower() alone does not
+# map them, so they are translated first — otherwise the prefilter could rule
+# out a pattern the regex would match. "\u0130" is also the only character whose
+# lowercase form is two code points; translating it keeps folded text the same
+# length as the input, so positions found in one are valid in the other.
+_RE_ASCII_FOLDS = {"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"}
+_RE_ASCII_FOLD_TABLE = str.maketrans(_RE_ASCII_FOLDS)
+
+SEVERITY_ORDER = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+
+# Anchored confirmation checks the deadline every this many anchor hits.
+_DEADLINE_CHECK_EVERY = 256
+
+# Characters of the previous window carried into the next one by StreamScan.
+# A bounded-length match is found as long as it is no longer than this.
+STREAM_OVERLAP = 4096
+
+# Longest whitespace run StreamScan carries over; longer runs keep their first
+# and last STREAM_SPACE_RUN // 2 characters. \s+ and \s* match the shortened
+# run exactly when they match the original, and so does a bounded wildcard
+# such as .{0,50} as long as its bound is below this: a run it could span is
+# never shortened, and a shortened run is still too long for it.
+STREAM_SPACE_RUN = 128
+_LONG_SPACE_RUN = re.compile(r"\s{%d,}" % (STREAM_SPACE_RUN + 1))
+
+
+class ScanBudgetExceeded(Exception):
+    """Raised when a scan passes its deadline. .matched holds the hits so far."""
+
+    def __init__(self, matched: list = None):
+        super().__init__("injection scan deadline exceeded")
+        self.matched = matched or []
+
+
+# ─────────────────────────────────────────────
+# RULES
+# ─────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class PatternRule:
+    severity: str
+    pattern: str                        # original source — reported verbatim
+    compiled: re.Pattern                # pattern (or its equivalent) used to confirm
+    literals: tuple = ()                # lowercase literals that must ALL appear
+    anchor: str = ""                    # lowercase literal every match starts with
+    confirm: Optional[Callable[[str, str], bool]] = None
+    stream_confirm: Optional[Callable[[], object]] = None   # factory, see StreamScan
+
+    def matches(self, text: str, folded: str, deadline: float = None) -> bool:
+        """
+        Confirm the pattern against text. folded is PatternScanner.fold(text),
+        computed once per scan and shared by every rule.
+        """
+        if self.confirm is not None:
+            return self.confirm(text, folded)
+        if self.anchor:
+            # IGNORECASE disables re's literal-prefix search, so a plain
+            # search() tries the pattern at every position. Anchored rules are
+            # only tried where their leading literal actually occurs.
+            find, match, pos, tries = folded.find, self.compiled.match, 0, 0
+            while True:
+                pos = find(self.anchor, pos)
+                if pos < 0:
+                    return False
+                if match(text, pos):
+                    return True
+                pos += 1
+                tries += 1
+                if (deadline is not None and tries % _DEADLINE_CHECK_EVERY == 0
+                        and time.monotonic() > deadline):
+                    raise ScanBudgetExceeded()
+        return self.compiled.search(text) is not None
+
+
+def build_rules(patterns_by_severity: dict, literals: dict = None,
+                anchors: dict = None, confirmers: dict = None,
+                equivalents: dict = None, stream_confirmers: dict = None) -> list:
+    """
+    Compile {severity: [pattern, ...]} into an ordered list of PatternRule.
+
+    literals    : {pattern: (literal, ...)} — literals the pattern requires.
+                  Patterns without an entry are always confirmed.
+    anchors     : {pattern: literal} — literal every match of the pattern
+                  starts with; confirmation only runs at its occurrences.
+    confirmers  : {pattern: callable(text, folded) -> bool} — semantically
+                  equivalent replacements for patterns whose regex backtracks badly.
+    equivalents : {pattern: regex} — an equivalent regex (same set of inputs
+                  matched by search()) that is cheaper to confirm with.
+    stream_confirmers : {pattern: factory} — for patterns with unbounded match
+                  length; factory() returns an object with
+                  feed(window, folded, new_from) -> bool (see StreamScan).
+    """
+    literals = literals or {}
+    anchors = anchors or {}
+    confirmers = confirmers or {}
+    equivalents = equivalents or {}
+    stream_confirmers = stream_confirmers or {}
+    rules = []
+    for severity in SEVERITY_ORDER:
+        for p in patterns_by_severity.get(severity, []):
+            rules.append(PatternRule(
+                severity=severity,
+                pattern=p,
+                compiled=re.compile(equivalents.get(p, p), PATTERN_FLAGS),
+                literals=tuple(l.lower() for l in literals.get(p, ())),
+                anchor=anchors.get(p, "").lower(),
+                confirm=confirmers.get(p),
+                stream_confirm=stream_confirmers.get(p),
+            ))
+    return rules
+
+
+# ─────────────────────────────────────────────
+# SCANNERS
+# ─────────────────────────────────────────────
+
+class SequentialScanner:
+    """Reference implementation: every pattern, full input, one at a time."""
+
+    def __init__(self, rules: list):
+        self.rules = rules
+
+    def scan(self, text: str) -> list:
+        return [
+            {"severity": r.severity, "pattern": r.pattern}
+            for r in self.rules if r.compiled.search(text)
+        ]
+
+
+class PatternScanner:
+    """
+    Single-pass literal prefilter plus confirmation stage.
+    Build once and share — the scanner holds no per-input state.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self._literals = sorted({l for r in rules for l in r.literals})
+
+    @staticmethod
+    def fold(text: str) -> str:
+        """Case-fold text the way re.IGNORECASE sees ASCII letters."""
+        # str.translate is slow on large non-ASCII text; only pay for it when
+        # one of the special characters is actually present.
+        if not text.isascii() and any(c in text for c in _RE_ASCII_FOLDS):
+            text = text.translate(_RE_ASCII_FOLD_TABLE)
+        return text.lower()
+
+    def candidates(self, folded: str) -> list:
+        """Rules whose required literals are all present in the folded text."""
+        seen = {l for l in self._literals if l in folded}
+        return [r for r in self.rules if all(l in seen for l in r.literals)]
+
+    def scan(self, text: str, stop_at: frozenset = frozenset(),
+             deadline: float = None) -> list:
+        """
+        Return [{"severity", "pattern"}, ...] in rule order.
+
+        stop_at  : severities that end the scan at their first match. Rules are
+                   ordered CRITICAL → LOW, so the first match is always the
+                   highest severity; only the tail of the list is skipped.
+        deadline : time.monotonic() value after which ScanBudgetExceeded is
+                   raised, carrying the matches found so far.
+        """
+        folded = self.fold(text)
+        matched = []
+        for r in self.candidates(folded):
+            if deadline is not None and time.monotonic() > deadline:
+                raise ScanBudgetExceeded(matched)
+            try:
+                hit = r.matches(text, folded, deadline)
+            except ScanBudgetExceeded:
+                raise ScanBudgetExceeded(matched) from None
+            if hit:
+                matched.append({"severity": r.severity, "pattern": r.pattern})
+                if r.severity in stop_at:
+                    break
+        return matched
+
+    def stream(self, overlap: int = STREAM_OVERLAP, stop_at: frozenset = frozenset(),
+               deadline: float = None) -> "StreamScan":
+        """Start an incremental scan — see StreamScan."""
+        return StreamScan(self, overlap, stop_at, deadline)
+
+
+def _cap_space_runs(text: str) -> str:
+    """text with every whitespace run over STREAM_SPACE_RUN cut to that length."""
+    half = STREAM_SPACE_RUN // 2
+    return _LONG_SPACE_RUN.sub(lambda m: m.group()[:half] + m.group()[-half:], text)
+
+
+class StreamScan:
+    """
+    Incremental scan over a sequence of chunks.
+
+        scan = scanner.stream()
+        for chunk in chunks:
+            if scan.feed(chunk):
+                break               # a stop_at severity matched
+        matched = scan.matched()
+
+    Each chunk is scanned together with the last `overlap` characters before
+    it, whitespace runs in them cut to STREAM_SPACE_RUN. For rules whose only
+    unbounded parts are whitespace runs this finds exactly what scan() finds
+    on the joined text, provided no match is longer than `overlap` characters
+    once its runs are cut (and bounded wildcards span fewer than
+    STREAM_SPACE_RUN). Rules with a stream confirmer track their own state.
+    Raises ScanBudgetExceeded (with the hits so far) once deadline passes.
+    """
+
+    def __init__(self, scanner: PatternScanner, overlap: int,
+                 stop_at: frozenset, deadline: Optional[float]):
+        self._scanner = scanner
+        self._overlap = overlap
+        self._stop_at = stop_at
+        self._deadline = deadline
+        self._tail = ""
+        self._hit = set()            # indexes into scanner.rules
+        self._states = {
+            i: r.stream_confirm() for i, r in enumerate(scanner.rules)
+            if r.stream_confirm is not None
+        }
+        self.stopped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Scan one chunk. Returns True once a stop_at severity has matched."""
+        if self.stopped or not chunk:
+            return self.stopped
+        window = self._tail + chunk
+        new_from = len(self._tail)
+        folded = self._scanner.fold(window)
+        seen = {l for l in self._scanner._literals if l in folded}
+        for i, r in enumerate(self._scanner.rules):
+            if i in self._hit:
+                continue
+            if self._deadline is not None and time.monotonic() > self._deadline:
+                raise ScanBudgetExceeded(self.matched())
+            state = self._states.get(i)
+            try:
+                if state is not None:
+                    hit = state.feed(window, folded, new_from)
+                else:
+                    # Every match contains its rule's literals, so a window
+                    # missing one cannot hold a match.
+                    hit = all(l in seen for l in r.literals) and \
+                        r.matches(window, folded, self._deadline)
+            except ScanBudgetExceeded:
+                raise ScanBudgetExceeded(self.matched()) from None
+            if hit:
+                self._hit.add(i)
+                if r.severity in self._stop_at:
+                    self.stopped = True
+                    break
+        self._tail = _cap_space_runs(window)[-self._overlap:] if self._overlap else ""
+        return self.stopped
+
+    def matched(self) -> list:
+        """Hits so far, in rule order — same shape as PatternScanner.scan()."""
+        rules = self._scanner.rules
+        hits = [
+            {"severity": rules[i].severity, "pattern": rules[i].pattern}
+            for i in sorted(self._hit)
+        ]
+        if self.stopped:
+            # Mirror scan(): nothing after the first stop_at match is reported.
+            for n, m in enumerate(hits):
+                if m["severity"] in self._stop_at:
+                    return hits[:n + 1]
+        return hits
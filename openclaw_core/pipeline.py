@@ -0,0 +1,560 @@
+"""
+openclaw_core.pipeline
+───────────────────────
+Staged task-autonomy pipeline (08_WORKFLOWS/task_autonomy_pipeline.md):
+
+    propose (Sorin) → clear (Vera) → execute (Brom) → validate (Astra)
+
+Every stage has its own worker threads and its own bounded queue, so many
+tasks are in flight at once — Sorin drafts task 3 while Vera clears task 2
+and Brom executes task 1. A full queue blocks the stage feeding it, and
+submit() once the first queue is full, so a slow stage throttles intake
+instead of piling up work in memory.
+
+A stage's gate may stop a task: no clearance or a BLOCKED clearance ends it
+as BLOCKED before Brom sees it, an Astra verdict other than an explicit
+APPROVED as REJECTED, an engine refusal or a raised exception as FAILED. Tasks that pass every stage end
+COMPLETED.
+
+Each stage's output is checkpointed to SQLite (PipelineCheckpoints) before
+the task moves on. resume() re-queues every unfinished task at the first
+stage it has no output for, so a restart repeats at most the stages that
+were running when the process stopped (at-least-once per stage).
+
+stats() reports throughput, and per stage the queue depth, busy workers,
+and p50 / p95 queue wait and service time.
+
+Usage:
+    pipeline = TaskPipeline.from_host(host, config=cfg.get("pipeline", {}))
+    pipeline.start()
+    pipeline.resume()                  # pick up tasks left by a previous run
+    pipeline.submit("TASK-0042", "Draft the Q3 newsletter venture plan")
+    pipeline.join()
+    pipeline.stats()
+    pipeline.close()
+"""
+
+import collections
+import datetime
+import json
+import logging
+import pathlib
+import queue
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence
+
+from .council import CouncilOrchestrator, Proposal
+from .ledger import DEFAULT_LEDGER_PATH
+
+logger = logging.getLogger("hegemon.pipeline")
+
+DEFAULT_CHECKPOINT_PATH = DEFAULT_LEDGER_PATH.parent / "pipeline_checkpoints.sqlite"
+
+# Latency samples kept per stage for stats()
+SAMPLE_WINDOW = 10_000
+
+PIPELINE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipeline_tasks (
+  task_id      TEXT PRIMARY KEY,
+  description  TEXT NOT NULL,
+  status       TEXT NOT NULL,          -- RUNNING, then COMPLETED / BLOCKED / REJECTED / FAILED
+  stage        TEXT,                   -- last stage completed
+  submitted_at TEXT,
+  updated_at   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pipeline_status ON pipeline_tasks (status);
+CREATE TABLE IF NOT EXISTS pipeline_stages (
+  task_id      TEXT NOT NULL,
+  stage        TEXT NOT NULL,
+  output       TEXT,
+  status       TEXT NOT NULL,          -- DONE, or the status the stage's gate stopped the task with
+  wait_ms      REAL,
+  service_ms   REAL,
+  finished_at  TEXT,
+  PRIMARY KEY (task_id, stage)
+) WITHOUT ROWID;
+"""
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+@dataclass
+class PipelineTask:
+    task_id: str
+    description: str
+    outputs: Dict[str, str] = field(default_factory=dict)      # stage name → output, in stage order
+    status: str = "RUNNING"
+    submitted: float = field(default_factory=time.monotonic)
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    handler: Callable                   # handler(task) → output text
+    gate: Optional[Callable] = None     # gate(output) → final status to stop the task, None to go on
+    workers: int = 2
+    queue_depth: int = 64
+
+
+# ── Gates ─────────────────────────────────────────────────────────────────
+
+# A whole "Decision: <one value>" line, markup allowed — not the echoed
+# "Decision: APPROVED | APPROVED_WITH_WARNING | BLOCKED" template line.
+_CLEARANCE = re.compile(r"^[ \t*_>`-]*Decision[*_`]*[ \t]*:[ \t*_`]*"
+                        r"(APPROVED_WITH_WARNING|APPROVED|BLOCKED)[ \t*_`.]*$",
+                        re.IGNORECASE | re.MULTILINE)
+# The verdict leading Astra's first line, after optional markup
+_VALIDATION = re.compile(r"[ \t*_#>`-]*(APPROVED|REJECTED)\b", re.IGNORECASE)
+
+
+def _refused(output: str) -> bool:
+    """Engine refusals and errors ([HEGEMON SECURITY], [HEGEMON ERROR], ...) and empty replies."""
+    return not output or output.startswith("[HEGEMON")
+
+
+def output_gate(output: str) -> Optional[str]:
+    return "FAILED" if _refused(output) else None
+
+
+def clearance_decision(output: str) -> Optional[str]:
+    """
+    APPROVED / APPROVED_WITH_WARNING / BLOCKED from the last Decision line of
+    a clearance, or None if it has none.
+    """
+    decisions = _CLEARANCE.findall(output or "")
+    return decisions[-1].upper() if decisions else None
+
+
+def clearance_gate(output: str) -> Optional[str]:
+    """Vera's clearance: only APPROVED / APPROVED_WITH_WARNING let the task proceed."""
+    if _refused(output):
+        return "FAILED"
+    return None if clearance_decision(output) in ("APPROVED", "APPROVED_WITH_WARNING") else "BLOCKED"
+
+
+def validation_gate(output: str) -> Optional[str]:
+    """Astra's verdict on the first line: anything but a leading APPROVED stops the task as REJECTED."""
+    if _refused(output):
+        return "FAILED"
+    match = _VALIDATION.match(output.strip().split("\n", 1)[0])
+    return None if match and match.group(1).upper() == "APPROVED" else "REJECTED"
+
+
+def council_gate(output: str) -> Optional[str]:
+    return None if output.startswith("APPROVED") else "REJECTED"
+
+
+# ── Engine-backed stages ──────────────────────────────────────────────────
+
+# stage name → (agent, trusted input_source, instruction)
+STAGE_AGENTS = {
+    "propose": ("sorin", "sorin_proposal",
+                "Produce a proposal package for this task: analysis, recommended option, "
+                "confidence rating (HIGH / MEDIUM / LOW), and risk and dependency notes."),
+    "clear": ("vera", "vera_clearance",
+              "Issue economic clearance for the proposal below in your clearance format, "
+              "including the line `Decision: APPROVED | APPROVED_WITH_WARNING | BLOCKED`."),
+    "execute": ("brom", "brom_execution",
+                "Execute the cleared proposal below. Report the steps completed, steps total, "
+                "workflows triggered and any error."),
+    "validate": ("astra", "astra_validation",
+                 "Validate the execution below against doctrine. The first line of your reply "
+                 "must be APPROVED or REJECTED; give your findings after it."),
+}
+STAGE_GATES = {"propose": output_gate, "clear": clearance_gate,
+               "execute": output_gate, "validate": validation_gate}
+
+
+def render_prompt(task: PipelineTask, instruction: str) -> str:
+    """The stage prompt: the instruction, the task, then every earlier stage's output."""
+    parts = [instruction, f"Task {task.task_id}: {task.description}"]
+    parts += [f"── {stage} ──\n{output}" for stage, output in task.outputs.items()]
+    return "\n\n".join(parts)
+
+
+def engine_stage(name: str, engine, input_source: str, instruction: str, gate: Callable = None,
+                 workers: int = 2, queue_depth: int = 64) -> Stage:
+    """Stage that sends the rendered prompt to engine.run() as input_source."""
+    def handler(task: PipelineTask) -> str:
+        return engine.run(render_prompt(task, instruction), input_source=input_source,
+                          task_id=task.task_id, use_cache=False)
+    return Stage(name, handler, gate, workers, queue_depth)
+
+
+def council_stage(council: CouncilOrchestrator, red_zone: bool = False,
+                  workers: int = 2, queue_depth: int = 64) -> Stage:
+    """Council vote on the proposal (see openclaw_core.council); anything but APPROVED stops the task."""
+    def handler(task: PipelineTask) -> str:
+        context = "\n\n".join(f"── {stage} ──\n{output}" for stage, output in task.outputs.items())
+        proposal = Proposal(f"PROP-{task.task_id}", task.description, task_id=task.task_id, red_zone=red_zone,
+                            vera_clearance=clearance_decision(task.outputs.get("clear")), context=context)
+        decision = council.decide(proposal)
+        return f"{decision.outcome} {decision.ledger_ref} {json.dumps(decision.votes, sort_keys=True)}"
+    return Stage("vote", handler, council_gate, workers, queue_depth)
+
+
+# ── Checkpoints ───────────────────────────────────────────────────────────
+
+class PipelineCheckpoints:
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(PIPELINE_SCHEMA)
+
+    def submitted(self, task: PipelineTask) -> bool:
+        """Record a new task. False if task_id is already known (the task is not started again)."""
+        stamp = _now()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO pipeline_tasks (task_id, description, status, submitted_at, updated_at) "
+                "VALUES (?, ?, 'RUNNING', ?, ?)", (task.task_id, task.description, stamp, stamp))
+            return cur.rowcount == 1
+
+    def stage_done(self, task: PipelineTask, stage: str, status: str, wait: float, service: float):
+        """Checkpoint one stage's output; status is DONE or the task's terminal status."""
+        stamp = _now()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pipeline_stages (task_id, stage, output, status, wait_ms, "
+                    "service_ms, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (task.task_id, stage, task.outputs.get(stage), status,
+                     round(wait * 1000, 3), round(service * 1000, 3), stamp))
+                self._conn.execute(
+                    "UPDATE pipeline_tasks SET status = ?, stage = ?, updated_at = ? WHERE task_id = ?",
+                    ("RUNNING" if status == "DONE" else status, stage, stamp, task.task_id))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def discard(self, task_id: str):
+        """Forget a task that never started (e.g. submit() timed out), so it can be submitted again."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pipeline_stages WHERE task_id = ?", (task_id,))
+            self._conn.execute("DELETE FROM pipeline_tasks WHERE task_id = ?", (task_id,))
+
+    def finished(self, task: PipelineTask):
+        with self._lock:
+            self._conn.execute("UPDATE pipeline_tasks SET status = ?, updated_at = ? WHERE task_id = ?",
+                               (task.status, _now(), task.task_id))
+
+    def unfinished(self) -> list:
+        """RUNNING tasks with the outputs of the stages they completed."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.task_id, t.description, s.stage, s.output FROM pipeline_tasks t "
+                "LEFT JOIN pipeline_stages s ON s.task_id = t.task_id AND s.status = 'DONE' "
+                "WHERE t.status = 'RUNNING' ORDER BY t.submitted_at, t.task_id, s.finished_at").fetchall()
+        tasks = {}
+        for task_id, description, stage, output in rows:
+            task = tasks.setdefault(task_id, PipelineTask(task_id, description))
+            if stage is not None:
+                task.outputs[stage] = output
+        return list(tasks.values())
+
+    def get(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT description, status, stage FROM pipeline_tasks WHERE task_id = ?",
+                                     (task_id,)).fetchone()
+            stages = self._conn.execute(
+                "SELECT stage, output, status, wait_ms, service_ms FROM pipeline_stages WHERE task_id = ? "
+                "ORDER BY finished_at", (task_id,)).fetchall()
+        if row is None:
+            return None
+        return {"task_id": task_id, "description": row[0], "status": row[1], "stage": row[2],
+                "stages": [dict(zip(("stage", "output", "status", "wait_ms", "service_ms"), s)) for s in stages]}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ── Executor ──────────────────────────────────────────────────────────────
+
+# Seconds a blocked worker or producer waits before checking for close()
+POLL_INTERVAL = 0.5
+
+
+class _StageRuntime:
+    """A stage's queue, workers and counters."""
+
+    def __init__(self, stage: Stage):
+        self.stage = stage
+        self.queue = queue.Queue(maxsize=stage.queue_depth)
+        self.threads = []
+        self.busy = 0
+        self.processed = 0
+        self.stopped = collections.Counter()        # terminal status → tasks this stage ended
+        self.waits = collections.deque(maxlen=SAMPLE_WINDOW)
+        self.services = collections.deque(maxlen=SAMPLE_WINDOW)
+
+
+def _percentile(samples, pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return round(samples[min(len(samples) - 1, int(pct * len(samples)))] * 1000, 2)
+
+
+class TaskPipeline:
+    def __init__(self, stages: Sequence[Stage], checkpoints: PipelineCheckpoints = None,
+                 on_done: Callable = None):
+        """
+        stages      : in order; each with its own workers and bounded queue
+        checkpoints : where stage outputs are saved (None: no checkpoints, no resume)
+        on_done     : called with each PipelineTask once it reaches a terminal status
+        """
+        if not stages:
+            raise ValueError("a pipeline needs at least one stage")
+        if len({stage.name for stage in stages}) != len(stages):
+            raise ValueError("stage names must be unique")
+        self.stages = [_StageRuntime(stage) for stage in stages]
+        self.checkpoints = checkpoints
+        self.on_done = on_done
+        self._stats_lock = threading.Lock()
+        self._idle = threading.Condition(self._stats_lock)
+        self._in_flight = 0
+        self._submitted = 0
+        self._finished = collections.Counter()
+        self._end_to_end = collections.deque(maxlen=SAMPLE_WINDOW)
+        self._started_at = None
+        self._running = False
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_host(cls, host, config: dict = None, council: CouncilOrchestrator = None,
+                  **kwargs) -> "TaskPipeline":
+        """
+        The four-stage pipeline over an AgentHost's sorin / vera / brom / astra
+        engines, from a `pipeline:` config section:
+            stages:      {propose: {workers, queue_depth}, clear: ..., ...}
+            checkpoints: SQLite path (false to disable)
+            red_zone:    Council threshold for the vote stage
+        With a council, a vote stage runs between clear and execute.
+        """
+        config = config or {}
+        stage_cfg = config.get("stages", {})
+        stages = []
+        for name, (agent, source, instruction) in STAGE_AGENTS.items():
+            if name == "execute" and council is not None:
+                stages.append(council_stage(council, config.get("red_zone", False),
+                                            **stage_cfg.get("vote", {})))
+            stages.append(engine_stage(name, host.get(agent).engine, source, instruction,
+                                       STAGE_GATES[name], **stage_cfg.get(name, {})))
+        path = config.get("checkpoints", DEFAULT_CHECKPOINT_PATH)
+        checkpoints = PipelineCheckpoints(path) if path else None
+        return cls(stages, checkpoints, **kwargs)
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def start(self):
+        """Start every stage's workers."""
+        if self._running:
+            return
+        self._running = True
+        self._started_at = time.monotonic()
+        for index, runtime in enumerate(self.stages):
+            for n in range(runtime.stage.workers):
+                thread = threading.Thread(target=self._work, args=(index,), daemon=True,
+                                          name=f"pipeline-{runtime.stage.name}-{n}")
+                thread.start()
+                runtime.threads.append(thread)
+
+    def submit(self, task_id: str, description: str, timeout: float = None) -> bool:
+        """
+        Queue a new task at the first stage, blocking while its queue is full
+        (up to timeout). False if it timed out, the pipeline was closed, or
+        task_id was submitted before.
+        """
+        if self._stop.is_set():
+            return False
+        task = PipelineTask(task_id, description)
+        if self.checkpoints is not None and not self.checkpoints.submitted(task):
+            logger.warning(f"[pipeline] Task {task_id} already submitted — ignored")
+            return False
+        if self._enqueue(0, task, timeout):
+            return True
+        if self.checkpoints is not None:
+            self.checkpoints.discard(task_id)
+        return False
+
+    def resume(self) -> int:
+        """Re-queue every unfinished task from the checkpoints at its next stage. Returns how many."""
+        if self.checkpoints is None:
+            return 0
+        names = [runtime.stage.name for runtime in self.stages]
+        resumed = 0
+        for task in self.checkpoints.unfinished():
+            index = next((i for i, name in enumerate(names) if name not in task.outputs), len(names))
+            if index == len(names):             # every stage done; only the final update was lost
+                task.status = "COMPLETED"
+                self.checkpoints.finished(task)
+                continue
+            # Keep only outputs of stages in this pipeline, in stage order
+            task.outputs = {name: task.outputs[name] for name in names[:index]}
+            self._enqueue(index, task, None)
+            resumed += 1
+        if resumed:
+            logger.info(f"[pipeline] Resumed {resumed} unfinished tasks from {self.checkpoints.path}")
+        return resumed
+
+    def join(self, timeout: float = None) -> bool:
+        """Wait until no task is in flight. False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def close(self, drain: bool = True, timeout: float = None):
+        """
+        Stop the workers — after the tasks in flight finish, or with
+        drain=False as soon as each finishes its current stage. Tasks cut off
+        that way stay RUNNING in the checkpoints for resume().
+        """
+        if drain:
+            self.join(timeout)
+        self._stop.set()
+        self._running = False
+        for runtime in self.stages:
+            for thread in runtime.threads:
+                thread.join(timeout)
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+
+    def stats(self) -> dict:
+        """Throughput, status counts and per-stage queue / latency figures."""
+        with self._stats_lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+            done = sum(self._finished.values())
+            body = {
+                "submitted": self._submitted,
+                "in_flight": self._in_flight,
+                "finished": dict(self._finished),
+                "elapsed_s": round(elapsed, 3),
+                "throughput_per_s": round(done / elapsed, 3) if elapsed else 0.0,
+                "end_to_end_p50_ms": _percentile(self._end_to_end, 0.5),
+                "end_to_end_p95_ms": _percentile(self._end_to_end, 0.95),
+                "stages": {},
+            }
+            for runtime in self.stages:
+                body["stages"][runtime.stage.name] = {
+                    "workers": runtime.stage.workers,
+                    "busy": runtime.busy,
+                    "queued": runtime.queue.qsize(),
+                    "queue_max": runtime.stage.queue_depth,
+                    "processed": runtime.processed,
+                    "stopped": dict(runtime.stopped),
+                    "wait_p50_ms": _percentile(runtime.waits, 0.5),
+                    "wait_p95_ms": _percentile(runtime.waits, 0.95),
+                    "service_p50_ms": _percentile(runtime.services, 0.5),
+                    "service_p95_ms": _percentile(runtime.services, 0.95),
+                }
+        return body
+
+    # ── Internal helpers ──────────────────────────────────────────────────
+
+    def _enqueue(self, index: int, task: PipelineTask, timeout: Optional[float]) -> bool:
+        with self._stats_lock:
+            self._in_flight += 1
+        if not self._put(index, task, timeout):
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+            return False
+        if index == 0:
+            with self._stats_lock:
+                self._submitted += 1
+        return True
+
+    def _put(self, index: int, task: PipelineTask, timeout: Optional[float]) -> bool:
+        """
+        Put task on a stage's queue, blocking while it is full. False on
+        timeout or close(); a task already past the first stage stays in the
+        checkpoints for resume().
+        """
+        queued_at = time.monotonic()
+        deadline = None if timeout is None else queued_at + timeout
+        while not self._stop.is_set():
+            wait = POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, deadline - time.monotonic())
+            if wait <= 0:
+                return False
+            try:
+                self.stages[index].queue.put((task, queued_at), timeout=wait)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _work(self, index: int):
+        runtime = self.stages[index]
+        stage = runtime.stage
+        last = index == len(self.stages) - 1
+        while not self._stop.is_set():
+            try:
+                task, queued_at = runtime.queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if self._stop.is_set():
+                return                          # closing without drain: left for resume()
+            started = time.monotonic()
+            with self._stats_lock:
+                runtime.busy += 1
+            try:
+                output = stage.handler(task)
+                status = stage.gate(output) if stage.gate is not None else None
+            except Exception as e:
+                logger.error(f"[pipeline] Stage {stage.name} failed | task={task.task_id} | {e}")
+                output, status = f"{type(e).__name__}: {e}", "FAILED"
+            finished = time.monotonic()
+            task.outputs[stage.name] = output
+            if self._stop.is_set():
+                with self._stats_lock:
+                    runtime.busy -= 1
+                return                          # output not checkpointed: the stage reruns on resume
+            if self.checkpoints is not None:
+                try:
+                    self.checkpoints.stage_done(task, stage.name, status or "DONE",
+                                                started - queued_at, finished - started)
+                except sqlite3.Error as e:
+                    logger.error(f"[pipeline] Checkpoint failed | task={task.task_id} stage={stage.name} | {e}")
+            with self._stats_lock:
+                runtime.busy -= 1
+                runtime.processed += 1
+                runtime.waits.append(started - queued_at)
+                runtime.services.append(finished - started)
+                if status is not None:
+                    runtime.stopped[status] += 1
+
+            if status is None and not last:
+                # Blocks while the next stage's queue is full — backpressure up the pipeline
+                self._put(index + 1, task, None)
+                continue
+            task.status = status or "COMPLETED"
+            self._finish(task)
+
+    def _finish(self, task: PipelineTask):
+        if self.checkpoints is not None and task.status == "COMPLETED":
+            self.checkpoints.finished(task)
+        if task.status != "COMPLETED":
+            logger.info(f"[pipeline] Task {task.task_id} {task.status} at {next(reversed(task.outputs))}")
+        if self.on_done is not None:
+            try:
+                self.on_done(task)
+            except Exception as e:
+                logger.error(f"[pipeline] on_done failed | task={task.task_id} | {e}")
+        with self._idle:
+            self._in_flight -= 1
+            self._finished[task.status] += 1
+            self._end_to_end.append(time.monotonic() - task.submitted)
+            self._idle.notify_all()
@@ -0,0 +1,76 @@
+"""
+openclaw_core.prompt_prefix
+────────────────────────────
+Byte-stable system prompt assembly for provider-side prompt caching.
+
+Providers (OpenAI included) bill a repeated prompt prefix at a discount when
+the leading tokens of the request are byte-identical to a recent one. The
+system prompt is the same ~16 KB on every call for an agent, so it only has
+to be built so that nothing in it drifts between calls, processes or hosts:
+
+  - sections are joined in a fixed order with a fixed separator
+  - each section is normalised: UTF-8 BOM dropped, CRLF/CR → LF, trailing
+    whitespace on every line stripped, outer blank lines trimmed
+  - nothing per-call (timestamps, task IDs, memory lookups) goes in the
+    prefix — per-call content belongs in the user message after it
+
+The resulting PromptPrefix is built once per engine and carries a
+fingerprint for the whole prefix plus one per section, so a change in any
+agent file shows up in logs and cache keys instead of silently costing full
+price on every call.
+
+Usage:
+    prefix = build_prompt_prefix([("preamble", text), ("soul", soul), ...])
+    messages = [prefix.message, {"role": "user", "content": user_input}]
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Iterable, Tuple
+
+# Bump when normalisation or the separator changes — fingerprints change with it
+PROMPT_LAYOUT_VERSION = 1
+
+SECTION_SEPARATOR = "\n\n---\n\n"
+
+
+def normalize_section(text: str) -> str:
+    """Canonical form of one prompt section (see module docstring)."""
+    text = text.lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip("\n")
+
+
+def prompt_fingerprint(text: str) -> str:
+    """Stable short hash identifying a system prompt (or one section of it)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    text: str                                   # full system prompt, as sent
+    fingerprint: str                            # sha256[:16] of text
+    sections: Tuple[Tuple[str, str, int], ...]  # (name, sha256[:16], bytes) in order
+    message: dict = field(compare=False, repr=False)   # {"role": "system", "content": text}
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.text.encode("utf-8"))
+
+
+def build_prompt_prefix(sections: Iterable[Tuple[str, str]]) -> PromptPrefix:
+    """
+    Assemble (name, text) sections, in the order given, into a PromptPrefix.
+    Empty sections are kept (as empty strings) so the layout never shifts.
+    """
+    names, parts = [], []
+    for name, text in sections:
+        names.append(name)
+        parts.append(normalize_section(text))
+    text = SECTION_SEPARATOR.join(parts)
+    return PromptPrefix(
+        text=text,
+        fingerprint=prompt_fingerprint(text),
+        sections=tuple((name, prompt_fingerprint(part), len(part.encode("utf-8")))
+                       for name, part in zip(names, parts)),
+        message={"role": "system", "content": text},
+    )
@@ -0,0 +1,176 @@
+"""
+openclaw_core.response_cache
+─────────────────────────────
+Opt-in cache of model responses for repeated, deterministic agent queries.
+
+Entries are keyed by response_cache_key(): a SHA-256 of the model, the
+system-prompt fingerprint, the sanitized user input and the sampling
+parameters. Any change to the agent's prompt files, model or sampling config
+therefore misses cleanly instead of serving a stale answer.
+
+Backends:
+  MemoryResponseCache  — per-process LRU + TTL (TTLCache)
+  SQLiteResponseCache  — survives restarts; LRU by last use, TTL per entry
+
+Usage:
+    cache = response_cache_from_config(config.get("response_cache", {}), default_path)
+    key = response_cache_key(model, prompt_fingerprint, sanitized_input, sampling)
+    hit = cache.get(key)          # {"output", "prompt_tokens", "completion_tokens", ...} or None
+    cache.put(key, {...})
+"""
+
+import hashlib
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .cache import TTLCache
+
+# Bump when the cached value layout changes — old entries then simply miss
+RESPONSE_CACHE_VERSION = 1
+
+
+def response_cache_key(model: str, fingerprint: str, sanitized_input: str,
+                       sampling: dict = None) -> str:
+    payload = json.dumps(
+        [RESPONSE_CACHE_VERSION, model, fingerprint, sanitized_input, sampling or {}],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryResponseCache:
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: Optional[float] = 3600):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    def put(self, key: str, value: dict):
+        self._cache.put(key, value)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, **self._cache.stats()}
+
+
+class SQLiteResponseCache:
+    backend = "sqlite"
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS response_cache (
+      key        TEXT PRIMARY KEY,
+      value      TEXT NOT NULL,
+      expires_at REAL,
+      last_used  REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_response_cache_last_used ON response_cache(last_used);
+    """
+
+    def __init__(self, path: str, max_entries: int = 2048, ttl_seconds: Optional[float] = 3600):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.path = pathlib.Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at is not None and now >= expires_at:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE response_cache SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(value)
+
+    def put(self, key: str, value: dict):
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        # Expired rows first, then least-recently-used beyond max_entries
+        self.expirations += self._conn.execute(
+            "DELETE FROM response_cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,)).rowcount
+        size = self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+        if size > self.max_entries:
+            self.evictions += self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN "
+                "(SELECT key FROM response_cache ORDER BY last_used LIMIT ?)",
+                (size - self.max_entries,)).rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "path": str(self.path),
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def response_cache_from_config(cfg: dict, default_path: str):
+    """
+    Build the backend described by an agent's `response_cache:` config section.
+    Returns None unless `enabled: true` (the cache is opt-in).
+    """
+    cfg = cfg or {}
+    if not cfg.get("enabled", False):
+        return None
+    backend = cfg.get("backend", "memory")
+    max_entries = cfg.get("max_entries", 2048)
+    ttl_seconds = cfg.get("ttl_seconds", 3600)
+    if backend == "memory":
+        return MemoryResponseCache(max_entries, ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteResponseCache(cfg.get("path", default_path), max_entries, ttl_seconds)
+    raise ValueError(f"Unknown response_cache backend '{backend}'. Use 'memory' or 'sqlite'.")
@@ -0,0 +1,318 @@
+"""
+openclaw_core.server
+─────────────────────
+Concurrent HTTP front end for one agent engine.
+
+The stdlib HTTPServer handles one request at a time, so a multi-second model
+call stalls /health and every other caller. AgentServer instead:
+
+  - serves each connection on its own daemon thread, up to max_connections
+  - runs engine.run() on a bounded worker pool (concurrency) with a bounded
+    wait queue (queue_depth); when both are full, new POSTs get 429 +
+    Retry-After instead of piling up
+  - answers GET /health on the connection thread — it never waits behind
+    model calls
+  - bounds slow clients with a socket read timeout and slow model calls with
+    request_timeout (504; the call keeps its worker slot until it returns)
+
+WorkerPool and BoundedHTTPServer are the two halves, reused by
+openclaw_core.host to serve several agents from one process.
+
+Usage:
+    config = ServerConfig.from_dict(engine.config.get("server", {}))
+    server = AgentServer(("0.0.0.0", 8000), engine, config, webhook_secret=secret)
+    server.serve_forever()
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from .logger import stats as log_stats
+
+logger = logging.getLogger("hegemon.server")
+
+
+@dataclass
+class ServerConfig:
+    concurrency: int = 4                    # engine.run() calls in parallel
+    queue_depth: int = 16                   # admitted requests waiting for a worker
+    request_timeout: Optional[float] = 120  # seconds to wait for engine.run() → 504
+    read_timeout: float = 10.0              # socket timeout while reading a request
+    max_connections: int = 64               # open connections before the acceptor sheds
+    retry_after: int = 1                    # Retry-After seconds on 429
+
+    @classmethod
+    def from_dict(cls, cfg: dict) -> "ServerConfig":
+        """Build from the `server:` section of an agent's config.yaml (unknown keys ignored)."""
+        known = {f.name for f in fields(cls)}
+        config = cls(**{k: v for k, v in (cfg or {}).items() if k in known})
+        if config.concurrency < 1 or config.queue_depth < 0 or config.max_connections < 1:
+            raise ValueError(f"Invalid server config: {config}")
+        return config
+
+
+class AgentHandler(BaseHTTPRequestHandler):
+    """
+    Receives POST requests and routes them to the agent's engine.run() method.
+
+    Nginx sits in front and routes:
+        /roxy  → openclaw-roxy:8000
+        /sorin → openclaw-sorin:8001
+        /brom  → openclaw-brom:8002
+        /vera  → openclaw-vera:8003
+        /astra → openclaw-astra:8004
+    """
+    server: "AgentServer"
+
+    @property
+    def engine(self):
+        return self.server.engine
+
+    @property
+    def workers(self) -> "WorkerPool":
+        return self.server.workers
+
+    def route(self) -> bool:
+        """Resolve engine / workers for this request. Subclasses may respond and return False."""
+        return True
+
+    def setup(self):
+        self.timeout = self.server.config.read_timeout   # applied to the socket by setup()
+        super().setup()
+
+    def do_POST(self):
+        if not self.route():
+            return
+        # Validate X-Hegemon-Token header
+        token = self.headers.get("X-Hegemon-Token", "")
+        if self.server.webhook_secret and token != self.server.webhook_secret:
+            self._respond(401, {"error": "Unauthorized"})
+            return
+
+        # Parse body
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            self._respond(400, {"error": "Invalid JSON"})
+            return
+
+        task_id      = payload.get("task_id", "")
+        input_source = payload.get("origin", "webhook")
+        user_input   = payload.get("task_description", payload.get("message", ""))
+
+        if not user_input:
+            self._respond(400, {"error": "Missing task_description or message field"})
+            return
+
+        # Run through engine on the worker pool
+        kwargs = {"user_input": user_input, "input_source": input_source, "task_id": task_id}
+        if payload.get("no_cache"):
+            kwargs["use_cache"] = False
+        future = self.workers.submit(self.engine.run, **kwargs)
+        if future is None:
+            self._respond(429, {"error": "Agent busy — retry later", "task_id": task_id},
+                          headers={"Retry-After": str(self.workers.config.retry_after)})
+            return
+        try:
+            output = future.result(timeout=self.workers.config.request_timeout)
+        except FutureTimeout:
+            self.workers.count("timeouts")
+            logger.warning(f"[{self.engine.agent_id}] Request timed out | task_id={task_id}")
+            self._respond(504, {"error": "Agent timed out", "task_id": task_id})
+            return
+        except Exception as e:
+            logger.error(f"[{self.engine.agent_id}] engine.run failed | task_id={task_id} | {e}")
+            self._respond(500, {"error": "Agent failed", "task_id": task_id})
+            return
+
+        self._respond(200, {
+            "agent": self.engine.agent_id,
+            "task_id": task_id,
+            "response": output,
+        })
+
+    def do_GET(self):
+        """Health check endpoint — served inline, never queued behind model calls."""
+        if not self.route():
+            return
+        if self.path == "/health":
+            self._respond(200, self.health())
+        else:
+            self._respond(404, {"error": "Not found"})
+
+    def health(self) -> dict:
+        body = {"status": "ok", "agent": self.engine.agent_id,
+                **self.workers.stats(), "shed": self.server.shed}
+        emitter_stats = getattr(self.engine, "emitter_stats", None)
+        if emitter_stats is not None:
+            body["emitters"] = emitter_stats()
+        cache_stats = getattr(self.engine, "cache_stats", None)
+        if cache_stats is not None and cache_stats() is not None:
+            body["response_cache"] = cache_stats()
+        memory_stats = getattr(self.engine, "memory_stats", None)
+        if memory_stats is not None and memory_stats() is not None:
+            body["memory"] = memory_stats()
+        budget_stats = getattr(self.engine, "budget_stats", None)
+        if budget_stats is not None and budget_stats() is not None:
+            body["budget"] = budget_stats()
+        ledger = getattr(self.engine, "ledger", None)
+        if ledger is not None:
+            body["ledger"] = ledger.stats()
+        body["logging"] = log_stats()
+        return body
+
+    def _respond(self, code: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", len(data))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Redirect access logs to Python logger
+        logger.debug(f"[{self.engine.agent_id}] {format % args}")
+
+
+class WorkerPool:
+    """
+    Bounded pool running engine.run() for one agent: `concurrency` workers plus
+    `queue_depth` admitted requests waiting; submit() refuses beyond that.
+    """
+
+    def __init__(self, name: str, config: ServerConfig):
+        self.config = config
+        self._pool = ThreadPoolExecutor(max_workers=config.concurrency,
+                                        thread_name_prefix=f"{name}-worker")
+        self._admission = threading.BoundedSemaphore(config.concurrency + config.queue_depth)
+        self._lock = threading.Lock()
+        self._counters = {"admitted": 0, "running": 0, "served": 0,
+                          "rejected": 0, "timeouts": 0}
+
+    def submit(self, fn, *args, **kwargs) -> Optional[Future]:
+        """Queue fn on the worker pool. Returns None when the pool and its queue are full."""
+        if not self._admission.acquire(blocking=False):
+            self.count("rejected")
+            return None
+        self.count("admitted")
+        try:
+            future = self._pool.submit(self._run, fn, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _run(self, fn, args, kwargs):
+        self.count("running")
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.count("running", -1)
+
+    def _release(self):
+        with self._lock:
+            self._counters["admitted"] -= 1
+            self._counters["served"] += 1
+        self._admission.release()
+
+    def count(self, name: str, delta: int = 1):
+        with self._lock:
+            self._counters[name] += delta
+
+    def stats(self) -> dict:
+        with self._lock:
+            c = dict(self._counters)
+        return {
+            "in_flight": c["running"],
+            "queued": c["admitted"] - c["running"],
+            "served": c["served"],
+            "rejected": c["rejected"],
+            "timeouts": c["timeouts"],
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+class BoundedHTTPServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that caps open connections at config.max_connections;
+    beyond that the acceptor answers 429 itself instead of spawning a thread.
+    """
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, config: ServerConfig):
+        self.config = config
+        self.request_queue_size = max(config.max_connections, 5)   # listen() backlog
+        self._connections = threading.BoundedSemaphore(config.max_connections)
+        self.shed = 0
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        # Runs on the acceptor thread: shed before spawning a thread when full
+        if not self._connections.acquire(blocking=False):
+            self.shed += 1
+            self._shed(request)
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self._connections.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._connections.release()
+
+    def _shed(self, request):
+        body = json.dumps({"error": "Agent busy — retry later"}).encode()
+        head = (
+            "HTTP/1.0 429 Too Many Requests\r\n"
+            "Content-Type: application/json\r\n"
+            f"Retry-After: {self.config.retry_after}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        try:
+            request.settimeout(1.0)
+            request.sendall(head + body)
+        except OSError:
+            pass
+
+
+class AgentServer(BoundedHTTPServer):
+    def __init__(self, server_address, engine, config: ServerConfig = None,
+                 webhook_secret: str = "", handler_class=AgentHandler):
+        self.engine = engine
+        self.webhook_secret = webhook_secret
+        config = config or ServerConfig()
+        self.workers = WorkerPool(engine.agent_id, config)
+        super().__init__(server_address, handler_class, config)
+
+    # Kept for callers that drive the pool through the server
+    def submit(self, fn, *args, **kwargs) -> Optional[Future]:
+        return self.workers.submit(fn, *args, **kwargs)
+
+    def count(self, name: str, delta: int = 1):
+        self.workers.count(name, delta)
+
+    def stats(self) -> dict:
+        return {**self.workers.stats(), "shed": self.shed}
+
+    def server_close(self):
+        super().server_close()
+        self.workers.shutdown()
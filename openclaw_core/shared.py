@@ -0,0 +1,158 @@
+"""
+openclaw_core.shared
+─────────────────────
+Process-wide resources shared by several OpenClawEngine instances hosted in
+one process (see openclaw_core.host).
+
+A standalone engine builds everything it needs for itself. When engines are
+given a SharedResources instead, they draw from one pool of:
+
+  - prompt files   — read once, re-read only when mtime/size change
+  - OpenAI clients — one sync client (one keep-alive connection pool) per
+                     (api_key, base_url); one AsyncOpenAI per event loop
+  - verdict cache  — one InjectionGuard verdict TTLCache (keys already carry
+                     strict_mode / decide_fast, so agents cannot collide)
+  - webhook emitters — one background sender per (name, url)
+  - ledger writers   — one hash-chained LedgerWriter per ledger file
+  - token budgets    — one TokenBudget per ledger file, limits per agent
+
+The compiled pattern scanner and the tool registry are already process-wide
+(default_scanner() / default_registry()), so every hosted guard and policy
+reuses them without help from here.
+
+Usage:
+    shared = SharedResources()
+    roxy  = OpenClawEngine("roxy",  shared=shared)
+    sorin = OpenClawEngine("sorin", shared=shared)
+"""
+
+import asyncio
+import os
+import pathlib
+import threading
+import weakref
+from typing import Optional
+
+from .budget import TokenBudget
+from .cache import TTLCache
+from .emitter import WebhookEmitter
+from .ledger import DEFAULT_LEDGER_PATH, LedgerWriter
+
+
+class SharedResources:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files = {}                                # path → (mtime_ns, size, text)
+        self._clients = {}                              # (api_key, base_url) → OpenAI
+        self._async_clients = weakref.WeakKeyDictionary()   # loop → {(key, url, timeout): AsyncOpenAI}
+        self._verdict_cache = None
+        self._emitters = {}                             # (name, url) → WebhookEmitter
+        self._ledgers = {}                              # resolved path → LedgerWriter
+        self._budgets = {}                              # resolved path → TokenBudget
+        self.file_reads = 0
+        self.file_hits = 0
+
+    # ── Prompt files ──────────────────────────────────────────────────────
+
+    def read_text(self, path: pathlib.Path) -> str:
+        """Contents of a prompt file, served from memory while mtime and size are unchanged."""
+        key = os.fspath(path)
+        st = os.stat(key)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+                self.file_hits += 1
+                return entry[2]
+        text = pathlib.Path(key).read_text(encoding="utf-8")
+        with self._lock:
+            self._files[key] = (st.st_mtime_ns, st.st_size, text)
+            self.file_reads += 1
+        return text
+
+    # ── Model clients ─────────────────────────────────────────────────────
+
+    def openai_client(self, api_key: Optional[str], base_url: Optional[str]) -> "OpenAI":
+        with self._lock:
+            client = self._clients.get((api_key, base_url))
+            if client is None:
+                from openai import OpenAI
+                client = self._clients[(api_key, base_url)] = OpenAI(api_key=api_key, base_url=base_url)
+            return client
+
+    def async_openai_client(self, api_key: Optional[str], base_url: Optional[str],
+                            timeout: float) -> "AsyncOpenAI":
+        """AsyncOpenAI for the running loop; retries stay with AsyncModelClient (max_retries=0)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._async_clients.setdefault(loop, {})
+            client = per_loop.get((api_key, base_url, timeout))
+            if client is None:
+                from openai import AsyncOpenAI
+                client = per_loop[(api_key, base_url, timeout)] = AsyncOpenAI(
+                    api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
+            return client
+
+    # ── Security ──────────────────────────────────────────────────────────
+
+    def verdict_cache(self, cfg: dict) -> Optional[TTLCache]:
+        """The shared verdict cache if `cfg` enables one. The first enabling config sizes it."""
+        if not cfg.get("enabled", False):
+            return None
+        with self._lock:
+            if self._verdict_cache is None:
+                self._verdict_cache = TTLCache(
+                    max_entries=cfg.get("max_entries", 4096),
+                    ttl_seconds=cfg.get("ttl_seconds", 300),
+                )
+            return self._verdict_cache
+
+    # ── Webhooks ──────────────────────────────────────────────────────────
+
+    def emitter(self, url: str, name: str, cfg: dict = None,
+                spill_path: Optional[str] = None) -> Optional[WebhookEmitter]:
+        """One WebhookEmitter per (name, url). The first caller's config and spill path win."""
+        if not url:
+            return None
+        with self._lock:
+            emitter = self._emitters.get((name, url))
+            if emitter is None:
+                emitter = self._emitters[(name, url)] = WebhookEmitter.from_config(
+                    url, name, cfg, spill_path)
+            return emitter
+
+    def ledger(self, cfg: dict) -> Optional[LedgerWriter]:
+        """One LedgerWriter per ledger file if `cfg` enables one. The first caller's config wins."""
+        if not cfg.get("enabled", False):
+            return None
+        key = str(pathlib.Path(cfg.get("path", DEFAULT_LEDGER_PATH)).resolve())
+        with self._lock:
+            writer = self._ledgers.get(key)
+            if writer is None:
+                writer = self._ledgers[key] = LedgerWriter.from_config(cfg)
+            return writer
+
+    def token_budget(self, cfg: dict, agent_id: str) -> Optional[TokenBudget]:
+        """One TokenBudget per ledger file if `cfg` enables one; `daily_limit_usd` applies to agent_id."""
+        if not cfg.get("enabled", False):
+            return None
+        key = str(pathlib.Path(cfg.get("path", DEFAULT_LEDGER_PATH)).resolve())
+        with self._lock:
+            budget = self._budgets.get(key)
+            if budget is None:
+                budget = self._budgets[key] = TokenBudget.from_config(cfg, agent_id)
+            elif cfg.get("daily_limit_usd") is not None:
+                budget.daily_limits[agent_id] = cfg["daily_limit_usd"]
+            return budget
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "prompt_files": len(self._files),
+                "prompt_file_reads": self.file_reads,
+                "prompt_file_hits": self.file_hits,
+                "openai_clients": len(self._clients),
+                "emitters": len(self._emitters),
+                "ledgers": len(self._ledgers),
+                "token_budgets": len(self._budgets),
+                "verdict_cache": self._verdict_cache.stats() if self._verdict_cache is not None else None,
+            }
@@ -0,0 +1,249 @@
+"""
+openclaw_core.tokens
+─────────────────────
+Local token counting and context-budgeted prompt assembly, so an engine knows
+what it is about to send before any network I/O.
+
+TokenCounter counts with tiktoken when it is installed and its encoding
+loads (the encoding object is built once per process and cached), and
+otherwise with a fast regex approximation: one token per word (per 8 letters
+of a long one), per group of up to three digits and per symbol. The
+approximation runs a little high on English prose, which is the safe side
+for a budget.
+
+ContextBudget is an agent's window: context_tokens in total, of which
+reserve_output_tokens are left for the reply. fit_sections() trims the
+system-prompt sections once, at engine start, so the prefix stays
+byte-stable; per call, the engine fits the user input first, then the
+retrieved corpus and memory blocks into what is left. Input over
+max_input_tokens is cut with truncate() — head and tail kept, the middle
+replaced by a marker, identically every time — or, with
+overflow="reject", refused with PromptTooLarge before the model is called.
+
+Usage:
+    counter = default_counter("gpt-4o-mini")
+    counter.count(text), counter.exact
+    counter.truncate(text, 2000)
+    budget = ContextBudget.from_config(config.get("context", {}))
+"""
+
+import functools
+import itertools
+import logging
+import re
+from dataclasses import dataclass, fields
+from typing import Iterable, Optional, Tuple
+
+from .prompt_prefix import SECTION_SEPARATOR
+
+logger = logging.getLogger("hegemon.tokens")
+
+DEFAULT_ENCODING = "o200k_base"
+
+# Per-message framing in the chat format (role, separators), and the reply primer
+MESSAGE_OVERHEAD = 4
+REPLY_PRIMER = 3
+
+# count(limit=...) reads long texts in chunks of this many characters
+COUNT_CHUNK_CHARS = 64 * 1024
+
+# System-prompt sections in the order they are trimmed; the security preamble never is
+SECTION_TRIM_ORDER = ("memory", "heartbeat", "agent", "identity", "soul")
+
+# Approximation: up to 8 letters, up to 3 digits, or one other non-space character per token
+_PIECE = re.compile(r"[A-Za-z]{1,8}|\d{1,3}|[^\sA-Za-z\d]")
+
+
+class PromptTooLarge(ValueError):
+    """tokens is what was counted before giving up, so only a lower bound for long inputs."""
+
+    def __init__(self, tokens: int, limit: int, what: str = "input", chars: int = None):
+        super().__init__(f"{what} is over {limit} tokens ({tokens} counted); "
+                         f"at most {limit} fit the context budget")
+        self.tokens = tokens
+        self.limit = limit
+        self.what = what
+        self.chars = chars
+
+
+def approx_count(text: str) -> int:
+    """Regex estimate of the token count (see module docstring)."""
+    return len(_PIECE.findall(text))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_encoding(model: Optional[str], encoding: Optional[str]):
+    """tiktoken encoding for model (or by name), or None when tiktoken or the encoding is unavailable."""
+    try:
+        import tiktoken     # optional; deferred so boots without it stay fast
+    except ImportError:
+        return None
+    try:
+        if encoding:
+            return tiktoken.get_encoding(encoding)
+        try:
+            return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:     # first use may download the BPE file
+        logger.warning(f"tiktoken encoding unavailable ({e}) — counting tokens approximately")
+        return None
+
+
+class TokenCounter:
+    def __init__(self, model: str = None, encoding: str = None, exact: bool = True):
+        """
+        model    : model name, to pick its tiktoken encoding
+        encoding : tiktoken encoding name, overriding the model's
+        exact    : False always uses the approximation
+        """
+        self.model = model
+        self._encoding = _load_encoding(model, encoding) if exact else None
+        self.exact = self._encoding is not None
+        self.name = self._encoding.name if self.exact else "approx"
+
+    def count(self, text: str, limit: int = None) -> int:
+        """
+        Tokens in text. With limit, long texts are counted in chunks and the
+        count stops once it passes limit — the result is then only known to
+        be over it, which is all a budget check needs.
+        """
+        if not text:
+            return 0
+        if limit is None or len(text) <= COUNT_CHUNK_CHARS:
+            return self._count(text)
+        total = 0
+        for start in range(0, len(text), COUNT_CHUNK_CHARS):
+            total += self._count(text[start:start + COUNT_CHUNK_CHARS])
+            if total > limit:
+                break
+        return total
+
+    def count_messages(self, messages: Iterable[dict]) -> int:
+        """Prompt tokens for a chat request, framing included."""
+        return sum(MESSAGE_OVERHEAD + self.count(m.get("content") or "") for m in messages) + REPLY_PRIMER
+
+    def truncate(self, text: str, max_tokens: int, tail_share: float = 0.25) -> str:
+        """
+        text cut to at most max_tokens: the first tokens and the last
+        tail_share of the budget kept, joined by a marker saying how many
+        characters were dropped. Deterministic — the same text and budget
+        always give the same result — and only reads as much of a long text
+        as it keeps.
+        """
+        if self.count(text, limit=max_tokens) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+        # +2: tokens may merge or split differently where the pieces are joined
+        keep = max_tokens - self.count(self._marker(len(text))) - 2
+        if keep <= 0:       # no room for the marker: just the head
+            return self._head(text, max_tokens)
+        tail = int(keep * tail_share)
+        head_text, tail_text = self._head(text, keep - tail), self._tail(text, tail)
+        return head_text + self._marker(len(text) - len(head_text) - len(tail_text)) + tail_text
+
+    def _count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return approx_count(text)
+
+    def _head(self, text: str, n: int) -> str:
+        """The first n tokens of text."""
+        if n <= 0:
+            return ""
+        if self._encoding is None:
+            last = next(itertools.islice(_PIECE.finditer(text), n - 1, None), None)
+            return text[:last.end()] if last is not None else text
+        window = n * 8
+        while True:
+            ids = self._encoding.encode(text[:window], disallowed_special=())
+            if len(ids) > n or window >= len(text):
+                return self._encoding.decode(ids[:n])
+            window *= 2
+
+    def _tail(self, text: str, n: int) -> str:
+        """The last n tokens of text; the window is widened until the token cut at its edge is dropped."""
+        if n <= 0:
+            return ""
+        window = n * 8
+        while True:
+            chunk = text[-window:]
+            if self._encoding is None:
+                starts = [m.start() for m in _PIECE.finditer(chunk)]
+                if len(starts) > n or window >= len(text):
+                    return chunk[starts[-n]:] if len(starts) >= n else chunk
+            else:
+                ids = self._encoding.encode(chunk, disallowed_special=())
+                if len(ids) > n or window >= len(text):
+                    return self._encoding.decode(ids[-n:])
+            window *= 2
+
+    @staticmethod
+    def _marker(dropped_chars: int) -> str:
+        return f"\n[… {dropped_chars:,} characters omitted …]\n"
+
+
+@functools.lru_cache(maxsize=None)
+def default_counter(model: str = None, encoding: str = None) -> TokenCounter:
+    """One TokenCounter per (model, encoding), shared by every engine in the process."""
+    return TokenCounter(model, encoding)
+
+
+@dataclass
+class ContextBudget:
+    context_tokens: int = 128_000           # model context window
+    reserve_output_tokens: int = 1024       # kept free for the reply
+    max_system_tokens: Optional[int] = None # cap on the system prompt (trimmed at start)
+    max_input_tokens: Optional[int] = None  # cap on the user message (default: what fits)
+    min_input_tokens: int = 64              # less room than this for the input → reject
+    overflow: str = "truncate"              # "truncate" or "reject" input over the cap
+
+    def __post_init__(self):
+        if self.overflow not in ("truncate", "reject"):
+            raise ValueError(f"overflow must be 'truncate' or 'reject', got {self.overflow!r}")
+
+    @classmethod
+    def from_config(cls, cfg: dict = None) -> "ContextBudget":
+        """From the `context:` section of an agent's config.yaml; unknown keys are ignored."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (cfg or {}).items() if k in names})
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Tokens available to the whole prompt."""
+        return self.context_tokens - self.reserve_output_tokens
+
+
+def fit_sections(sections: Iterable[Tuple[str, str]], counter: TokenCounter,
+                 max_tokens: Optional[int]) -> Tuple[Tuple[Tuple[str, str], ...], dict]:
+    """
+    System-prompt (name, text) sections cut down to max_tokens in total,
+    separators included:
+    sections are truncated in SECTION_TRIM_ORDER, each only as far as needed.
+    Returns (sections, {name: tokens dropped}). PromptTooLarge if even the
+    untrimmable sections do not fit.
+    """
+    sections = list(sections)
+    if max_tokens is None:
+        return tuple(sections), {}
+    sizes = {name: counter.count(text) for name, text in sections}
+    joins = counter.count(SECTION_SEPARATOR) * (len(sections) - 1)
+    over = sum(sizes.values()) + joins - max_tokens
+    dropped = {}
+    for name in SECTION_TRIM_ORDER:
+        if over <= 0:
+            break
+        for i, (section, text) in enumerate(sections):
+            if section != name or not sizes[name]:
+                continue
+            target = max(0, sizes[name] - over)
+            cut = counter.truncate(text, target, tail_share=0.0) if target else ""
+            new_size = counter.count(cut)
+            sections[i] = (name, cut)
+            dropped[name] = sizes[name] - new_size
+            over -= sizes[name] - new_size
+            sizes[name] = new_size
+    if over > 0:
+        raise PromptTooLarge(sum(sizes.values()) + joins, max_tokens, "system prompt")
+    return tuple(sections), dropped
@@ -16,6 +16,11 @@ Tool tiers:
   TIER_2_SUBAGENT  — all sub-agents
   TIER_3_WORKER    — all workers
 
+Grants and tier levels are loaded from 05_SECURITY/tool_registry.yaml
+(falling back to the built-in TOOL_REGISTRY below) and hot-swapped when the
+manifest changes — see ToolRegistry. Each TOOL_REQUEST_* audit event records
+the registry_version it was decided under.
+
 Usage in agent code:
     from .tool_policy import ToolPolicy
     policy = ToolPolicy(agent_id="RXY-CEO", tier="TIER_1_COUNCIL")
@@ -25,12 +30,22 @@ Usage in agent code:
 """
 
 import datetime
+import functools
+import hashlib
+import json
 import logging
+import os
+import pathlib
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import Optional
+from types import MappingProxyType
+from typing import Callable, Optional, Union
 
 logger = logging.getLogger("tool_policy")
 
+_NO_CONTEXT = MappingProxyType({})
+
 
 # ─────────────────────────────────────────────
 # TOOL REGISTRY
@@ -195,6 +210,229 @@ TIER_ORDER = {
 }
 
 
+# ─────────────────────────────────────────────
+# REGISTRY MANIFEST
+# The grants above are the built-in fallback. At runtime the registry is
+# loaded from a versioned manifest (05_SECURITY/tool_registry.yaml), polled
+# for changes and swapped in without restarting the agent.
+# ─────────────────────────────────────────────
+
+DEFAULT_REGISTRY_PATH = pathlib.Path(__file__).resolve().parent.parent / "05_SECURITY" / "tool_registry.yaml"
+DEFAULT_POLL_SECONDS = 5.0
+BUILTIN_REGISTRY_VERSION = "builtin"
+
+_TOOL_SPEC_KEYS = {"min_tier", "allowed_agents", "requires_council_vote",
+                   "requires_architect_approval", "description"}
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """One validated, read-only version of the tool registry."""
+    version: str
+    tools: MappingProxyType             # tool_name → read-only spec
+    tier_order: MappingProxyType        # tier → level (lower = more privilege)
+    digest: str                         # sha256 of tools + tiers, first 16 hex chars
+    source: str = "builtin"
+
+
+def validate_registry(tools: dict, tier_order: dict) -> list:
+    """Return a list of problems with a registry definition (empty = valid)."""
+    problems = []
+    if not isinstance(tier_order, dict) or not tier_order:
+        return ["'tiers' must be a non-empty mapping of tier name → level"]
+    for tier, level in tier_order.items():
+        if not isinstance(level, int) or isinstance(level, bool):
+            problems.append(f"tier '{tier}': level must be an integer, got {level!r}")
+    if not isinstance(tools, dict):
+        return problems + ["'tools' must be a mapping of tool name → spec"]
+    for name, spec in tools.items():
+        if not isinstance(spec, dict):
+            problems.append(f"tool '{name}': spec must be a mapping")
+            continue
+        unknown = set(spec) - _TOOL_SPEC_KEYS
+        if unknown:
+            # A misspelt gate (e.g. requires_council_votes) would silently drop it
+            problems.append(f"tool '{name}': unknown keys {sorted(unknown)}")
+        if spec.get("min_tier") not in tier_order:
+            problems.append(f"tool '{name}': min_tier {spec.get('min_tier')!r} is not a defined tier")
+        allowed = spec.get("allowed_agents", "all")
+        if allowed != "all" and not (isinstance(allowed, list)
+                                     and all(isinstance(a, str) and a for a in allowed)):
+            problems.append(f"tool '{name}': allowed_agents must be 'all' or a list of agent IDs")
+        for flag in ("requires_council_vote", "requires_architect_approval"):
+            if not isinstance(spec.get(flag, False), bool):
+                problems.append(f"tool '{name}': {flag} must be true or false")
+    return problems
+
+
+def build_snapshot(version: str, tools: dict, tier_order: dict,
+                   source: str = "builtin") -> RegistrySnapshot:
+    """Validate a registry definition and freeze it. Raises ValueError if invalid."""
+    problems = validate_registry(tools, tier_order)
+    if not isinstance(version, str) or not version:
+        problems.insert(0, f"registry_version must be a non-empty string, got {version!r}")
+    if problems:
+        raise ValueError(f"Invalid tool registry ({source}):\n  - " + "\n  - ".join(problems))
+    canonical = json.dumps({"tiers": tier_order, "tools": tools}, sort_keys=True)
+    return RegistrySnapshot(
+        version=version,
+        tools=MappingProxyType({
+            name: MappingProxyType({**spec, "allowed_agents": (
+                list(spec["allowed_agents"]) if isinstance(spec.get("allowed_agents"), list) else "all")})
+            for name, spec in tools.items()
+        }),
+        tier_order=MappingProxyType(dict(tier_order)),
+        digest=hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16],
+        source=source,
+    )
+
+
+# Parsed manifests handed over by a boot artifact (openclaw_core.bundle):
+# path → (mtime_ns, size, manifest). Used only while the file still matches.
+_SEEDED_MANIFESTS = {}
+
+
+def seed_registry(path: Union[str, pathlib.Path], manifest: dict, mtime_ns: int, size: int):
+    """Let load_registry() skip parsing `path` while its mtime and size are unchanged."""
+    _SEEDED_MANIFESTS[str(pathlib.Path(path))] = (mtime_ns, size, manifest)
+
+
+def read_manifest(path: Union[str, pathlib.Path]) -> dict:
+    """Parse a registry manifest (.yaml / .yml / .json) without validating it."""
+    path = pathlib.Path(path)
+    seeded = _SEEDED_MANIFESTS.get(str(path))
+    if seeded is not None:
+        st = os.stat(path)
+        if (st.st_mtime_ns, st.st_size) == seeded[:2]:
+            return seeded[2]
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        return json.loads(text)
+    import yaml
+    # libyaml's loader when available — ~10x faster than the pure-Python one
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def load_registry(path: Union[str, pathlib.Path]) -> RegistrySnapshot:
+    """Load and validate a registry manifest (.yaml / .yml / .json)."""
+    path = pathlib.Path(path)
+    manifest = read_manifest(path)
+    if not isinstance(manifest, dict):
+        raise ValueError(f"Invalid tool registry ({path}): top level must be a mapping")
+    return build_snapshot(manifest.get("registry_version"), manifest.get("tools"),
+                          manifest.get("tiers"), source=str(path))
+
+
+class ToolRegistry:
+    """
+    Holds the current RegistrySnapshot and hot-swaps it when the manifest changes.
+
+    current() is the read path: a single attribute read, plus — at most once per
+    poll_seconds — an os.stat() of the manifest. Readers never wait on a lock;
+    if another thread is already checking, the current snapshot is returned.
+    A manifest that fails to load or validate is logged and ignored; the
+    previous snapshot stays in force.
+    """
+
+    def __init__(self, path: Union[str, pathlib.Path, None] = None,
+                 poll_seconds: Optional[float] = DEFAULT_POLL_SECONDS):
+        """
+        path         : manifest file. None → DEFAULT_REGISTRY_PATH if it exists,
+                       otherwise the built-in TOOL_REGISTRY (never reloaded).
+        poll_seconds : how often to stat the manifest (None = load once, never poll)
+        """
+        if path is None and DEFAULT_REGISTRY_PATH.exists():
+            path = DEFAULT_REGISTRY_PATH
+        self.path = pathlib.Path(path) if path is not None else None
+        self.poll_seconds = poll_seconds
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()           # serialises pollers, never readers
+        if self.path is None:
+            self._snapshot = build_snapshot(BUILTIN_REGISTRY_VERSION, TOOL_REGISTRY, TIER_ORDER)
+            self._stamp = None
+        else:
+            # Fail loudly at startup — there is no previous registry to fall back on
+            self._stamp = self._stat()
+            self._snapshot = load_registry(self.path)
+        self._next_poll = time.monotonic() + (poll_seconds or 0)
+
+    def current(self) -> RegistrySnapshot:
+        if (self.poll_seconds is not None and self.path is not None
+                and time.monotonic() >= self._next_poll):
+            self.poll()
+        return self._snapshot
+
+    def poll(self) -> bool:
+        """Reload if the manifest changed since the last load. Returns True on swap."""
+        if self.path is None or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_poll = time.monotonic() + (self.poll_seconds or 0)
+            try:
+                stamp = self._stat()
+            except OSError as e:
+                return self._reject(stamp=None, error=f"manifest unreadable: {e}")
+            if stamp == self._stamp:
+                return False
+            try:
+                snapshot = load_registry(self.path)
+                error = None
+            except (OSError, ValueError) as e:
+                error = str(e)
+            except Exception as e:      # YAML / JSON parse errors
+                error = f"{type(e).__name__}: {e}"
+            if self._stat_or_none() != stamp:
+                # Written while we were reading (in-place save) — retry next poll
+                return False
+            if error is not None:
+                return self._reject(stamp, error)
+            previous, self._stamp = self._snapshot, stamp
+            if (snapshot.version, snapshot.digest) == (previous.version, previous.digest):
+                return False
+            if snapshot.version == previous.version:
+                logger.warning(
+                    f"Tool registry content changed without a registry_version bump "
+                    f"(version={snapshot.version}, digest {previous.digest} → {snapshot.digest})"
+                )
+            self._snapshot = snapshot               # atomic reference swap
+            self.reloads += 1
+            logger.info(
+                f"Tool registry reloaded | version {previous.version} → {snapshot.version} | "
+                f"digest={snapshot.digest} | source={snapshot.source}"
+            )
+            return True
+        finally:
+            self._lock.release()
+
+    def _stat(self) -> tuple:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _stat_or_none(self) -> Optional[tuple]:
+        try:
+            return self._stat()
+        except OSError:
+            return None
+
+    def _reject(self, stamp: Optional[tuple], error: str) -> bool:
+        # Remember the bad stamp so a broken file is reported once, not every poll
+        self._stamp = stamp
+        self.reload_errors += 1
+        self.last_error = error
+        logger.error(f"Tool registry reload rejected — keeping version "
+                     f"{self._snapshot.version}: {error}")
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def default_registry(path: Optional[str] = None,
+                     poll_seconds: Optional[float] = DEFAULT_POLL_SECONDS) -> ToolRegistry:
+    """One ToolRegistry per (manifest, poll interval), shared by every ToolPolicy in the process."""
+    return ToolRegistry(path, poll_seconds)
+
+
 # ─────────────────────────────────────────────
 # DATA CLASSES
 # ─────────────────────────────────────────────
@@ -207,7 +445,66 @@ class AuthorizationResult:
     denial_reason: Optional[str] = None
     requires_council_vote: bool = False
     requires_architect_approval: bool = False
-    audit_event: dict = field(default_factory=dict)
+    # The audit event is only built when first read — most allow decisions
+    # are never audited in-process, and building the dict dominated authorize().
+    _audit_factory: Optional[Callable[[], dict]] = field(default=None, repr=False, compare=False)
+    _audit_event: Optional[dict] = field(default=None, repr=False, compare=False)
+
+    @property
+    def audit_event(self) -> dict:
+        if self._audit_event is None:
+            self._audit_event = self._audit_factory() if self._audit_factory else {}
+        return self._audit_event
+
+
+@dataclass(frozen=True)
+class ToolDecision:
+    """Precomputed verdict for one (agent, tool) pair — see compile_decision_table."""
+    granted: bool                       # tier and allowlist checks passed
+    denial_reason: Optional[str] = None
+    requires_council_vote: bool = False
+    requires_architect_approval: bool = False
+
+
+def compile_decision_table(agent_id: str, tier: str, registry: dict = None,
+                           tier_order: dict = None) -> MappingProxyType:
+    """
+    Resolve every static check in the registry for one agent up front.
+    Returns a read-only {tool_name: ToolDecision}. Context-dependent checks
+    (council vote / Architect approval refs) still run per call.
+    """
+    registry = TOOL_REGISTRY if registry is None else registry
+    tier_order = TIER_ORDER if tier_order is None else tier_order
+    agent_tier_level = tier_order.get(tier, 99)
+    table = {}
+    for tool_name, spec in registry.items():
+        requires_vote = spec.get("requires_council_vote", False)
+        requires_architect = spec.get("requires_architect_approval", False)
+        allowed_agents = spec.get("allowed_agents", "all")
+        reason = None
+        # Check tier — agent must meet minimum tier requirement
+        if agent_tier_level > tier_order.get(spec["min_tier"], 0):
+            reason = (f"Agent tier '{tier}' does not meet minimum requirement "
+                      f"'{spec['min_tier']}' for tool '{tool_name}'.")
+        # Check agent allowlist — if not "all", agent must be explicitly listed
+        elif allowed_agents != "all" and agent_id not in allowed_agents:
+            reason = (f"Agent '{agent_id}' is not in the authorized agent list for tool "
+                      f"'{tool_name}'. Authorized agents: {allowed_agents}")
+        table[tool_name] = ToolDecision(
+            granted=reason is None,
+            denial_reason=reason,
+            requires_council_vote=requires_vote,
+            requires_architect_approval=requires_architect,
+        )
+    return MappingProxyType(table)
+
+
+@dataclass(frozen=True)
+class _CompiledPolicy:
+    snapshot: RegistrySnapshot
+    table: MappingProxyType             # tool_name → ToolDecision
+    authorized: tuple
+    actions: dict                       # tool_name → audit action string
 
 
 # ─────────────────────────────────────────────
@@ -220,15 +517,25 @@ class ToolPolicy:
     Call authorize() before every tool invocation.
     """
 
-    def __init__(self, agent_id: str, tier: str):
+    def __init__(self, agent_id: str, tier: str, registry: ToolRegistry = None):
         """
         agent_id : the sim_id of this agent (e.g. 'RXY-CEO', 'SRN-MRS-01')
         tier     : TIER_1_COUNCIL | TIER_1_GOV | TIER_2_SUBAGENT | TIER_3_WORKER
+        registry : ToolRegistry to enforce (default: the shared default_registry())
         """
-        if tier not in TIER_ORDER:
-            raise ValueError(f"Invalid tier '{tier}'. Must be one of {list(TIER_ORDER.keys())}")
+        self._registry = registry if registry is not None else default_registry()
+        snapshot = self._registry.current()
+        if tier not in snapshot.tier_order:
+            raise ValueError(f"Invalid tier '{tier}'. Must be one of {list(snapshot.tier_order)}")
         self.agent_id = agent_id
         self.tier = tier
+        # Compiled once per registry version: authorize() is a dict lookup plus
+        # the context-dependent vote/approval checks.
+        self._compiled = self._compile(snapshot)
+
+    @property
+    def registry_version(self) -> str:
+        return self._current().snapshot.version
 
     def authorize(self, tool_name: str, context: dict = None) -> AuthorizationResult:
         """
@@ -241,42 +548,25 @@ class ToolPolicy:
         Returns:
             AuthorizationResult — check .allowed before proceeding
         """
-        context = context or {}
-        timestamp = datetime.datetime.utcnow().isoformat() + "Z"
+        context = context or _NO_CONTEXT
+        timestamp = datetime.datetime.utcnow()   # formatted only if the audit event is read
+        compiled = self._current()
+        decision = compiled.table.get(tool_name)
 
         # Tool not in registry — always deny
-        if tool_name not in TOOL_REGISTRY:
+        if decision is None:
             return self._deny(
                 tool_name,
                 f"Tool '{tool_name}' is not registered in the Hegemon tool registry.",
-                context, timestamp
+                context, timestamp, compiled
             )
 
-        spec = TOOL_REGISTRY[tool_name]
-
-        # Check tier — agent must meet minimum tier requirement
-        agent_tier_level = TIER_ORDER.get(self.tier, 99)
-        min_tier_level = TIER_ORDER.get(spec["min_tier"], 0)
-        if agent_tier_level > min_tier_level:
-            return self._deny(
-                tool_name,
-                f"Agent tier '{self.tier}' does not meet minimum requirement '{spec['min_tier']}' for tool '{tool_name}'.",
-                context, timestamp
-            )
-
-        # Check agent allowlist — if not "all", agent must be explicitly listed
-        allowed_agents = spec.get("allowed_agents", "all")
-        if allowed_agents != "all" and self.agent_id not in allowed_agents:
-            return self._deny(
-                tool_name,
-                f"Agent '{self.agent_id}' is not in the authorized agent list for tool '{tool_name}'. "
-                f"Authorized agents: {allowed_agents}",
-                context, timestamp
-            )
+        # Tier / allowlist — resolved at compile time
+        if not decision.granted:
+            return self._deny(tool_name, decision.denial_reason, context, timestamp, compiled)
 
         # Check Council vote requirement
-        requires_vote = spec.get("requires_council_vote", False)
-        if requires_vote and not context.get("council_vote_ref"):
+        if decision.requires_council_vote and not context.get("council_vote_ref"):
             return AuthorizationResult(
                 allowed=False,
                 tool_name=tool_name,
@@ -284,50 +574,63 @@ class ToolPolicy:
                 denial_reason=f"Tool '{tool_name}' requires a Council vote record. "
                               f"Provide 'council_vote_ref' in context.",
                 requires_council_vote=True,
-                requires_architect_approval=spec.get("requires_architect_approval", False),
-                audit_event=self._build_audit_event(tool_name, "DENIED_NEEDS_VOTE", context, timestamp),
+                requires_architect_approval=decision.requires_architect_approval,
+                _audit_factory=self._audit_factory(tool_name, "DENIED_NEEDS_VOTE", context, timestamp, compiled),
             )
 
         # Check Architect approval requirement
-        requires_architect = spec.get("requires_architect_approval", False)
-        if requires_architect and not context.get("architect_approval_ref"):
+        if decision.requires_architect_approval and not context.get("architect_approval_ref"):
             return AuthorizationResult(
                 allowed=False,
                 tool_name=tool_name,
                 agent_id=self.agent_id,
                 denial_reason=f"Tool '{tool_name}' requires Architect approval. "
                               f"Provide 'architect_approval_ref' in context.",
-                requires_council_vote=requires_vote,
+                requires_council_vote=decision.requires_council_vote,
                 requires_architect_approval=True,
-                audit_event=self._build_audit_event(tool_name, "DENIED_NEEDS_ARCHITECT", context, timestamp),
+                _audit_factory=self._audit_factory(tool_name, "DENIED_NEEDS_ARCHITECT", context, timestamp,
+                                                   compiled),
             )
 
         # All checks passed
-        logger.info(
-            f"[{self.agent_id}] TOOL AUTHORIZED | tool={tool_name} | "
-            f"task_id={context.get('task_id', '')}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"[{self.agent_id}] TOOL AUTHORIZED | tool={tool_name} | "
+                f"task_id={context.get('task_id', '')}"
+            )
         return AuthorizationResult(
             allowed=True,
             tool_name=tool_name,
             agent_id=self.agent_id,
-            requires_council_vote=requires_vote,
-            requires_architect_approval=requires_architect,
-            audit_event=self._build_audit_event(tool_name, "AUTHORIZED", context, timestamp),
+            requires_council_vote=decision.requires_council_vote,
+            requires_architect_approval=decision.requires_architect_approval,
+            _audit_factory=self._audit_factory(tool_name, "AUTHORIZED", context, timestamp, compiled),
         )
 
     def list_authorized_tools(self) -> list:
         """Return all tools this agent is authorized to use."""
-        authorized = []
-        for tool_name, spec in TOOL_REGISTRY.items():
-            allowed_agents = spec.get("allowed_agents", "all")
-            tier_ok = TIER_ORDER.get(self.tier, 99) <= TIER_ORDER.get(spec["min_tier"], 0)
-            agent_ok = allowed_agents == "all" or self.agent_id in allowed_agents
-            if tier_ok and agent_ok:
-                authorized.append(tool_name)
-        return authorized
-
-    def _deny(self, tool_name: str, reason: str, context: dict, timestamp: str) -> AuthorizationResult:
+        return list(self._current().authorized)
+
+    def _current(self) -> _CompiledPolicy:
+        # Recompile only when the registry has swapped in a new snapshot. A race
+        # between two threads just compiles the same snapshot twice.
+        snapshot = self._registry.current()
+        compiled = self._compiled
+        if compiled.snapshot is not snapshot:
+            compiled = self._compiled = self._compile(snapshot)
+        return compiled
+
+    def _compile(self, snapshot: RegistrySnapshot) -> _CompiledPolicy:
+        table = compile_decision_table(self.agent_id, self.tier, snapshot.tools, snapshot.tier_order)
+        return _CompiledPolicy(
+            snapshot=snapshot,
+            table=table,
+            authorized=tuple(t for t, d in table.items() if d.granted),
+            actions={t: f"TOOL_REQUEST_{t.upper()}" for t in table},
+        )
+
+    def _deny(self, tool_name: str, reason: str, context: dict,
+              timestamp: datetime.datetime, compiled: _CompiledPolicy) -> AuthorizationResult:
         logger.warning(
             f"[{self.agent_id}] TOOL DENIED | tool={tool_name} | "
             f"reason={reason} | task_id={context.get('task_id', '')}"
@@ -337,22 +640,37 @@ class ToolPolicy:
             tool_name=tool_name,
             agent_id=self.agent_id,
             denial_reason=reason,
-            audit_event=self._build_audit_event(tool_name, "DENIED", context, timestamp),
+            _audit_factory=self._audit_factory(tool_name, "DENIED", context, timestamp, compiled),
+        )
+
+    def _audit_factory(self, tool_name: str, outcome: str, context: dict,
+                       timestamp: datetime.datetime, compiled: _CompiledPolicy) -> Callable[[], dict]:
+        # Capture the context values now — the caller may reuse the dict.
+        return functools.partial(
+            self._build_audit_event, tool_name, outcome,
+            context.get("task_id", ""), context.get("council_vote_ref"),
+            context.get("architect_approval_ref"), timestamp, compiled,
         )
 
-    def _build_audit_event(self, tool_name: str, outcome: str,
-                           context: dict, timestamp: str) -> dict:
+    def _build_audit_event(self, tool_name: str, outcome: str, task_id: str,
+                           council_vote_ref: Optional[str],
+                           architect_approval_ref: Optional[str],
+                           when: datetime.datetime, compiled: _CompiledPolicy) -> dict:
+        timestamp = when.isoformat() + "Z"
+        action = compiled.actions.get(tool_name) or f"TOOL_REQUEST_{tool_name.upper()}"
         return {
             "event_id": f"TOOL-{self.agent_id}-{tool_name}-{timestamp[:19].replace(':', '')}",
             "actor": self.agent_id,
-            "action": f"TOOL_REQUEST_{tool_name.upper()}",
+            "action": action,
             "outcome": outcome,
             "details": {
                 "tool_name": tool_name,
                 "agent_tier": self.tier,
-                "council_vote_ref": context.get("council_vote_ref"),
-                "architect_approval_ref": context.get("architect_approval_ref"),
+                "council_vote_ref": council_vote_ref,
+                "architect_approval_ref": architect_approval_ref,
+                "registry_version": compiled.snapshot.version,
+                "registry_digest": compiled.snapshot.digest,
             },
-            "task_id": context.get("task_id", ""),
+            "task_id": task_id,
             "timestamp": timestamp,
         }
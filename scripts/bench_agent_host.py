@@ -0,0 +1,166 @@
+"""
+Benchmark: startup time and resident memory — one process per agent vs AgentHost.
+
+"containers": one process per agent, each building its OpenClawEngine and
+AgentServer up front, as `python main.py --agent <name>` does in its own
+container. "host": one process running HostServer (`python main.py --shared`),
+engines built lazily on first request from shared resources.
+
+For each layout the script reports time until every agent has answered one
+POST (model calls go to scripts/fake_openai_server.py, in-process) and the
+summed VmRSS of the processes afterwards. Linux only (/proc).
+
+The repo's agent folders have no AGENT.md yet; if it is missing the agents
+are staged in a temp dir with an empty one so engines can boot.
+
+Usage:
+    python scripts/bench_agent_host.py
+    python scripts/bench_agent_host.py --agents roxy sorin vera
+"""
+import argparse
+import http.client
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+ALL_AGENTS = ["roxy", "sorin", "brom", "vera", "astra"]
+REQUIRED = ["SOUL.md", "IDENTITY.md", "HEARTBEAT.md", "MEMORY.md", "AGENT.md"]
+
+
+# ── Child processes ──────────────────────────────────────────────────────────
+
+def child_agent(name: str, agents_dir: str):
+    from openclaw_core.engine import OpenClawEngine
+    from openclaw_core.server import AgentServer, ServerConfig
+    engine = OpenClawEngine(name, agents_dir=agents_dir)
+    server = AgentServer(("127.0.0.1", 0), engine, ServerConfig())
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+def child_host(names: list, agents_dir: str):
+    from openclaw_core.host import AgentHost, HostServer
+    from openclaw_core.server import ServerConfig
+    server = HostServer(("127.0.0.1", 0), AgentHost(names, agents_dir=agents_dir), ServerConfig())
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+# ── Parent ───────────────────────────────────────────────────────────────────
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def spawn(args: list, env: dict) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, __file__, *args], stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, env=env, text=True)
+
+
+def ready(proc: subprocess.Popen, args: list) -> int:
+    """Wait for the child to print its port."""
+    line = proc.stdout.readline()
+    if not line.strip():
+        proc.kill()
+        sys.exit(f"child {args} failed to start")
+    return int(line)
+
+
+def post(port: int, path: str, name: str):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    body = json.dumps({"message": f"status report for {name}", "task_id": f"BENCH-{name}"})
+    conn.request("POST", path, body, {"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    resp.read()
+    conn.close()
+    if resp.status != 200:
+        raise RuntimeError(f"{path} → HTTP {resp.status}")
+
+
+def run_containers(names: list, agents_dir: str, env: dict) -> dict:
+    t0 = time.perf_counter()
+    # Started together, like containers brought up by compose
+    children = [(name, ["--child", "agent", name, "--agents-dir", agents_dir]) for name in names]
+    started = [(name, spawn(args, env), args) for name, args in children]
+    procs = [(name, proc, ready(proc, args)) for name, proc, args in started]
+    for name, _, port in procs:
+        post(port, "/", name)
+    elapsed = time.perf_counter() - t0
+    rss = sum(rss_kb(proc.pid) for _, proc, _ in procs)
+    for _, proc, _ in procs:
+        proc.kill()
+        proc.wait()
+    return {"processes": len(procs), "ready_s": elapsed, "rss_kb": rss}
+
+
+def run_host(names: list, agents_dir: str, env: dict) -> dict:
+    t0 = time.perf_counter()
+    args = ["--child", "host", *names, "--agents-dir", agents_dir]
+    proc = spawn(args, env)
+    port = ready(proc, args)
+    for name in names:
+        post(port, f"/{name}", name)
+    elapsed = time.perf_counter() - t0
+    rss = rss_kb(proc.pid)
+    proc.kill()
+    proc.wait()
+    return {"processes": 1, "ready_s": elapsed, "rss_kb": rss}
+
+
+def stage_agents(names: list) -> tuple:
+    source = REPO_ROOT / "agents"
+    if all((source / n / f).exists() for n in names for f in REQUIRED):
+        return str(source), None
+    tmp = tempfile.mkdtemp(prefix="bench_agents_")
+    for name in names:
+        shutil.copytree(source / name, pathlib.Path(tmp) / name)
+        (pathlib.Path(tmp) / name / "AGENT.md").touch()
+    return tmp, tmp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", nargs="+", default=ALL_AGENTS)
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    parser.add_argument("--agents-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        kind, *names = args.child
+        return child_agent(names[0], args.agents_dir) if kind == "agent" else child_host(names, args.agents_dir)
+
+    from fake_openai_server import make_server
+    server = make_server(latency=0.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    env = dict(os.environ, OPENAI_API_KEY="fake", HEGEMON_AUDIT_WEBHOOK="", HEGEMON_TOKEN_WEBHOOK="",
+               OPENAI_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}/v1")
+
+    agents_dir, staged = stage_agents(args.agents)
+    try:
+        print(f"{len(args.agents)} agents: {', '.join(args.agents)}")
+        print(f"{'layout':<22} | {'processes':>9} | {'ready s':>8} | {'RSS MB':>8}")
+        for label, fn in (("process per agent", run_containers), ("AgentHost (shared)", run_host)):
+            r = fn(args.agents, agents_dir, env)
+            print(f"{label:<22} | {r['processes']:>9} | {r['ready_s']:8.2f} | {r['rss_kb'] / 1024:8.1f}")
+    finally:
+        if staged:
+            shutil.rmtree(staged, ignore_errors=True)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: cold start — process spawn to first GET /health 200 for one agent.
+
+Each run starts a fresh Python process that boots an agent the way
+`python main.py --agent <name>` does and polls /health until it answers.
+The child also reports how long its imports and engine construction took.
+Variants:
+
+  eager imports   openai / requests / yaml imported up front (the old boot)
+  lazy, source    deferred imports; agent read from agents/<name>/
+  lazy, bundle    deferred imports; agent loaded from a `--bundle` artifact
+
+The repo's agent folders have no AGENT.md yet; if it is missing the agents
+are staged in a temp dir with an empty one so engines can boot.
+
+Usage:
+    python scripts/bench_cold_start.py
+    python scripts/bench_cold_start.py --agent vera --runs 20
+"""
+import argparse
+import http.client
+import os
+import pathlib
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+REQUIRED = ["SOUL.md", "IDENTITY.md", "HEARTBEAT.md", "MEMORY.md", "AGENT.md"]
+
+
+def child(name: str, port: int, agents_dir: str, bundle: str, eager: bool):
+    t0 = time.perf_counter()
+    if eager:
+        import openai, requests, yaml  # noqa: F401,E401
+    from openclaw_core.engine import OpenClawEngine
+    from openclaw_core.server import AgentServer, ServerConfig
+    t1 = time.perf_counter()
+    definition = None
+    if bundle:
+        from openclaw_core.bundle import bundled_definition
+        definition = bundled_definition(name, bundle)
+        if definition is None:
+            sys.exit("bundle missing or stale")
+    engine = OpenClawEngine(name, agents_dir=agents_dir, definition=definition)
+    server = AgentServer(("127.0.0.1", port), engine, ServerConfig())
+    print(f"{(t1 - t0) * 1000:.1f} {(time.perf_counter() - t1) * 1000:.1f}", flush=True)
+    server.serve_forever()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_health(args: list, port: int, env: dict, limit: float = 30.0) -> tuple:
+    """(seconds to first /health 200, child import ms, child engine-build ms)"""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, __file__, *args], env=env, text=True,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - t0 < limit:
+            if proc.poll() is not None:
+                raise RuntimeError(f"child exited with {proc.returncode}")
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/health")
+                if conn.getresponse().status == 200:
+                    elapsed = time.perf_counter() - t0
+                    import_ms, build_ms = map(float, proc.stdout.readline().split())
+                    return elapsed, import_ms, build_ms
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("no /health within limit")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def stage_agents(name: str) -> tuple:
+    source = REPO_ROOT / "agents"
+    if all((source / name / f).exists() for f in REQUIRED):
+        return str(source), None
+    tmp = tempfile.mkdtemp(prefix="bench_agents_")
+    shutil.copytree(source / name, pathlib.Path(tmp) / name)
+    (pathlib.Path(tmp) / name / "AGENT.md").touch()
+    return tmp, tmp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agent", default="roxy")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--child", nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        name, port, agents_dir, bundle, eager = args.child
+        return child(name, int(port), agents_dir, bundle if bundle != "-" else None, eager == "1")
+
+    from openclaw_core.bundle import build_bundle, write_bundle
+
+    agents_dir, staged = stage_agents(args.agent)
+    bundle_path = pathlib.Path(tempfile.mkdtemp(prefix="bench_bundle_")) / "agents.bundle.json"
+    write_bundle(build_bundle([args.agent], agents_dir), bundle_path)
+    env = dict(os.environ, OPENAI_API_KEY="fake", HEGEMON_AUDIT_WEBHOOK="", HEGEMON_TOKEN_WEBHOOK="")
+    variants = [
+        ("eager imports", "-", "1"),
+        ("lazy, source", "-", "0"),
+        ("lazy, bundle", str(bundle_path), "0"),
+    ]
+    try:
+        print(f"agent {args.agent}, {args.runs} cold starts per variant")
+        print(f"{'variant':<16} | {'/health p50 ms':>14} | {'min ms':>7} | {'max ms':>7} | "
+              f"{'imports ms':>10} | {'engine ms':>9}")
+        for label, bundle, eager in variants:
+            runs = []
+            for _ in range(args.runs):
+                port = free_port()
+                runs.append(time_to_health(
+                    ["--child", args.agent, str(port), agents_dir, bundle, eager], port, env))
+            times = [r[0] for r in runs]
+            print(f"{label:<16} | {statistics.median(times) * 1000:14.0f} | {min(times) * 1000:7.0f} | "
+                  f"{max(times) * 1000:7.0f} | {statistics.median(r[1] for r in runs):10.1f} | "
+                  f"{statistics.median(r[2] for r in runs):9.1f}")
+    finally:
+        shutil.rmtree(bundle_path.parent, ignore_errors=True)
+        if staged:
+            shutil.rmtree(staged, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: BM25 retrieval over the doctrine corpus (openclaw_core.corpus_index).
+
+Works on a copy of the corpus directories in a temp dir, so the repo is
+never touched. Reports:
+
+  - index build from scratch, reopen from the saved JSON, refresh with
+    nothing changed, and refresh after editing one file
+  - search p50 / p99 over a set of representative agent questions
+  - prompt size per request: the whole corpus stuffed into the prompt vs the
+    top-k block the engine injects (tokens estimated as chars / 4)
+
+Usage:
+    python scripts/bench_corpus_retrieval.py
+    python scripts/bench_corpus_retrieval.py --top-k 6 --max-chars 8000 --repeat 200
+"""
+import argparse
+import pathlib
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.corpus_index import CORPUS_DIRS, CorpusIndex  # noqa: E402
+
+QUERIES = [
+    "how is the audit ledger integrity hash computed",
+    "who approves a change to the charter",
+    "daily token budget limit for vera",
+    "what happens when an agent exceeds its budget",
+    "quorum and voting rules for council decisions",
+    "which workers may scrape the web",
+    "prompt injection severity levels and blocking",
+    "separation of powers between astra and the council",
+    "venture ROI thresholds and scoring",
+    "telegram and discord communication channels",
+    "backup and restart procedure for the gateway",
+    "tier permissions for sub-agents",
+    "decision trails table schema",
+    "escalation to the architect",
+    "profit equilibrium formula operating cost",
+    "email sending workflow resend",
+]
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top-k", type=int, default=4)
+    parser.add_argument("--max-chars", type=int, default=6000)
+    parser.add_argument("--repeat", type=int, default=100, help="passes over the query set")
+    args = parser.parse_args()
+
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="bench_corpus_"))
+    try:
+        for name in CORPUS_DIRS:
+            if (REPO_ROOT / name).is_dir():
+                shutil.copytree(REPO_ROOT / name, tmp / name,
+                                ignore=shutil.ignore_patterns("__pycache__", "*.pyc", "*.png"))
+        index_path = tmp / "corpus_index.json"
+        make = lambda: CorpusIndex(root=tmp, index_path=index_path, refresh_seconds=None)  # noqa: E731
+
+        index = make()
+        build_s = timed(index.refresh)
+        reopen_s = timed(make().refresh)
+        noop_s = timed(index.refresh)
+        edited = sorted(tmp.glob("07_LEDGER_RULES/*.md"))[0]
+        edited.write_text(edited.read_text(encoding="utf-8") + "\n\n## Appendix\n\nReviewed.\n",
+                          encoding="utf-8")
+        edit_s = timed(index.refresh)
+        stats = index.stats()
+        corpus_chars = sum(len(index.read(path)) for path in index.documents())
+
+        print(f"corpus: {stats['documents']} documents, {stats['sections']} sections, "
+              f"{stats['terms']:,} terms, {corpus_chars / 1024:.0f} KB")
+        print(f"build {build_s * 1000:.1f} ms | reopen from JSON {reopen_s * 1000:.1f} ms | "
+              f"refresh, nothing changed {noop_s * 1000:.1f} ms | refresh, one file edited {edit_s * 1000:.1f} ms")
+
+        latencies = []
+        for _ in range(args.repeat):
+            for query in QUERIES:
+                latencies.append(timed(lambda: index.search(query, args.top_k)))
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+        print(f"search (k={args.top_k}): p50 {statistics.median(latencies) * 1e6:.0f} µs, "
+              f"p99 {p99 * 1e6:.0f} µs over {len(latencies):,} queries")
+
+        print(f"\n{'query':<52} | {'sections':>8} | {'≈ tokens':>8} | top hit")
+        injected = []
+        for query in QUERIES:
+            block, hits = index.context(query, args.top_k, args.max_chars)
+            injected.append(len(block) / 4)
+            top = f"{hits[0].section.path} ({hits[0].score:.1f})" if hits else "-"
+            print(f"{query:<52} | {len(hits):>8} | {len(block) / 4:>8.0f} | {top}")
+        whole = corpus_chars / 4
+        mean = statistics.mean(injected)
+        print(f"\nprompt tokens per request: whole corpus ≈ {whole:,.0f} vs top-{args.top_k} ≈ {mean:,.0f} "
+              f"({1 - mean / whole:.1%} fewer)")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
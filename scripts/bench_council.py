@@ -0,0 +1,147 @@
+"""
+Benchmark: Council votes one member after another vs scatter-gather (openclaw_core.council).
+
+Four stub Council members answer after a random delay (lognormal around
+--latency, per member a different scale, one member sometimes very slow).
+Each round puts one proposal to the Council three ways:
+
+  - sequential : each member asked in turn, as callers do today
+  - gather-all : all asked at once, waiting for every vote
+  - quorum     : CouncilOrchestrator.convene() — all at once, returning when
+                 the outcome is decided and cancelling the stragglers
+
+and reports p50 / p99 wall time per vote, next to the reply time of the
+slowest member the quorum needed (the floor for any scheme). With --http the
+members are real HTTP endpoints (one ThreadingHTTPServer each) reached
+through http_voter(); otherwise they are in-process coroutines.
+
+Usage:
+    python scripts/bench_council.py
+    python scripts/bench_council.py --rounds 50 --latency 0.3 --http
+"""
+import argparse
+import asyncio
+import json
+import pathlib
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.council import (COUNCIL_MEMBERS, CouncilOrchestrator, DecisionTrails,  # noqa: E402
+                                   Proposal, http_voter)
+
+# Relative speed of each member, and how often one answers 5x slower (a cold container, a retry)
+SCALE = {"RXY-CEO": 0.8, "SRN-CIO": 1.4, "BRM-CTO": 1.0, "VRA-CFO": 1.2}
+STRAGGLER_RATE = 0.15
+
+
+def draw_delays(rng: random.Random, latency: float) -> dict:
+    delays = {}
+    for member, scale in SCALE.items():
+        delay = latency * scale * rng.lognormvariate(0, 0.35)
+        delays[member] = delay * 5 if rng.random() < STRAGGLER_RATE else delay
+    return delays
+
+
+class StubMember(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        time.sleep(self.server.delays[payload["task_id"]])
+        body = json.dumps({"response": "APPROVE\nWithin budget."}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    return f"p50 {statistics.median(samples) * 1000:6.0f} ms | p99 {p99 * 1000:6.0f} ms"
+
+
+async def main_async(args):
+    rng = random.Random(11)
+    rounds = [draw_delays(rng, args.latency) for _ in range(args.rounds)]
+    members = list(COUNCIL_MEMBERS.values())
+
+    servers = []
+    if args.http:
+        voters = {}
+        for member in members:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), StubMember)
+            server.daemon_threads = True
+            server.delays = {f"R{i}": delays[member] for i, delays in enumerate(rounds)}
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+            voters[member] = http_voter(f"http://127.0.0.1:{server.server_address[1]}/")
+    else:
+        def stub(member):
+            async def vote(prompt, task_id, timeout):
+                await asyncio.sleep(rounds[int(task_id[1:])][member])
+                return "APPROVE\nWithin budget."
+            return vote
+        voters = {member: stub(member) for member in members}
+
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="bench_council_"))
+    council = CouncilOrchestrator(voters, trails=DecisionTrails(tmp / "ledger.sqlite"), deadline=60)
+    results = {"sequential": [], "gather-all": [], "quorum": []}
+    floor = []
+    try:
+        for i, delays in enumerate(rounds):
+            proposal = Proposal(f"BENCH-{i}", "Renew the monitoring contract", task_id=f"R{i}")
+            prompt = council.ballot(proposal)
+
+            t0 = time.perf_counter()
+            for member in members:
+                await voters[member](prompt, proposal.task_id, 60)
+            results["sequential"].append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*(voters[member](prompt, proposal.task_id, 60) for member in members))
+            results["gather-all"].append(time.perf_counter() - t0)
+
+            decision = await council.convene(proposal)
+            results["quorum"].append(decision.elapsed)
+            floor.append(sorted(delays.values())[proposal.threshold - 1])
+        # Let straggling HTTP requests from the last round drain before shutdown
+        await asyncio.sleep(max(rounds[-1].values()))
+    finally:
+        council.close()
+        for server in servers:
+            server.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"{args.rounds} votes, {len(members)} members, {'HTTP' if args.http else 'in-process'}, "
+          f"base latency {args.latency}s, {STRAGGLER_RATE:.0%} straggler rate, threshold 2 of 4")
+    for name, samples in results.items():
+        print(f"{name:<11}: {percentiles(samples)} | mean {statistics.mean(samples) * 1000:6.0f} ms")
+    print(f"{'floor':<11}: {percentiles(floor)} | mean {statistics.mean(floor) * 1000:6.0f} ms "
+          f"(reply time of the 2nd-fastest member)")
+    print(f"decisions: {council.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.25, help="typical member reply time, seconds")
+    parser.add_argument("--http", action="store_true", help="members behind real HTTP endpoints")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
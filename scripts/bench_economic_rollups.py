@@ -0,0 +1,148 @@
+"""
+Benchmark: Vera's economic rollups over a synthetic year of per-minute token
+usage — NumPy (openclaw_core.analytics) vs a plain Python loop over rows.
+
+Data: one usage row per agent per minute for 365 days (5 agents → 2.6M rows),
+daily revenue for three ventures booked monthly, and a monthly operating
+cost. Reports, per rollup, the time for the row-by-row Python version and
+the vectorized one, then the cost of saving the snapshot and of reopening
+it memory-mapped and rolling up again. Needs NumPy.
+
+Usage:
+    python scripts/bench_economic_rollups.py
+    python scripts/bench_economic_rollups.py --days 90 --agents 10
+"""
+import argparse
+import datetime
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+try:
+    from openclaw_core import analytics  # noqa: E402
+    import numpy as np  # noqa: E402
+except ImportError as e:
+    sys.exit(str(e))
+
+AGENTS = ["RXY-CEO", "SRN-CIO", "BRM-CTO", "VRA-CFO", "AST-GOV"]
+VENTURES = ["affiliate_funnel", "newsletter", "micro_saas"]
+
+
+def synthetic(days: int, n_agents: int, seed: int = 11) -> analytics.EconomicSnapshot:
+    rng = np.random.default_rng(seed)
+    agents = tuple(AGENTS[:n_agents]) + tuple(f"SUB-{i:02d}" for i in range(max(0, n_agents - len(AGENTS))))
+    start = int(np.datetime64("2026-01-01", "s").astype(np.int64))
+    minutes = np.arange(days * 1440, dtype=np.int64) * 60 + start
+    ts = np.repeat(minutes, n_agents)
+    agent = np.tile(np.arange(n_agents, dtype=np.int32), len(minutes))
+    tokens_in = rng.poisson(40, len(ts)).astype(np.int64)
+    tokens_out = rng.poisson(6, len(ts)).astype(np.int64)
+    cost = tokens_in / 1000 * 0.003 + tokens_out / 1000 * 0.015
+    months = np.arange(np.datetime64("2026-01", "M"), np.datetime64("2026-01", "M") + max(1, days // 30))
+    month_ts = months.astype("datetime64[s]").astype(np.int64)
+    return analytics.EconomicSnapshot(
+        agents=agents, usage_ts=ts, usage_agent=agent, usage_cost=cost,
+        usage_tokens_in=tokens_in, usage_tokens_out=tokens_out,
+        ventures=tuple(VENTURES),
+        revenue_ts=np.repeat(month_ts, len(VENTURES)),
+        revenue_venture=np.tile(np.arange(len(VENTURES), dtype=np.int32), len(month_ts)),
+        revenue_amount=rng.uniform(100, 900, len(month_ts) * len(VENTURES)),
+        opcost_ts=month_ts, opcost_amount=np.full(len(month_ts), 120.0),
+        capital={"affiliate_funnel": 400.0, "newsletter": 150.0, "micro_saas": 1800.0},
+    )
+
+
+# ── Row-by-row reference implementations ─────────────────────────────────────
+
+def python_agent_rollup(rows: list, period: str) -> dict:
+    totals = defaultdict(float)
+    for ts, agent, cost, _, _ in rows:
+        when = datetime.datetime.utcfromtimestamp(ts)
+        if period == "day":
+            key = when.strftime("%Y-%m-%d")
+        elif period == "week":
+            key = (when.date() - datetime.timedelta(days=when.weekday())).isoformat()
+        else:
+            key = when.strftime("%Y-%m")
+        totals[(key, agent)] += cost
+    return totals
+
+
+def python_equilibrium(rows: list, revenue: list, opcost: list) -> dict:
+    month = defaultdict(lambda: [0.0, 0.0, 0.0])
+    for ts, _, cost, _, _ in rows:
+        month[datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m")][0] += cost
+    for ts, amount in opcost:
+        month[datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m")][1] += amount
+    for ts, amount in revenue:
+        month[datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m")][2] += amount
+    return {k: (rev - tok - op) for k, (tok, op, rev) in month.items()}
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--python-rows", type=int, default=500_000,
+                        help="rows timed for the Python loop (scaled up to the full set)")
+    args = parser.parse_args()
+
+    snap = synthetic(args.days, args.agents)
+    n = snap.rows
+    k = min(n, args.python_rows)
+    rows = list(zip(snap.usage_ts[:k].tolist(), snap.usage_agent[:k].tolist(), snap.usage_cost[:k].tolist(),
+                    snap.usage_tokens_in[:k].tolist(), snap.usage_tokens_out[:k].tolist()))
+    revenue = list(zip(snap.revenue_ts.tolist(), snap.revenue_amount.tolist()))
+    opcost = list(zip(snap.opcost_ts.tolist(), snap.opcost_amount.tolist()))
+    scale = n / k
+
+    print(f"{n:,} usage rows ({args.days} days × 1440 min × {args.agents} agents); "
+          f"Python loop timed on {k:,} rows and scaled")
+    print(f"{'rollup':<26} | {'python s':>9} | {'numpy s':>8} | {'speedup':>8}")
+    cases = [
+        ("agent cost by day", lambda: python_agent_rollup(rows, "day"),
+         lambda: analytics.agent_rollup(snap, "day")),
+        ("agent cost by week", lambda: python_agent_rollup(rows, "week"),
+         lambda: analytics.agent_rollup(snap, "week")),
+        ("agent cost by month", lambda: python_agent_rollup(rows, "month"),
+         lambda: analytics.agent_rollup(snap, "month")),
+        ("equilibrium by month", lambda: python_equilibrium(rows, revenue, opcost),
+         lambda: analytics.equilibrium(snap, "month")),
+    ]
+    for label, py, vec in cases:
+        py_s = timed(py) * scale
+        np_s = min(timed(vec) for _ in range(3))
+        print(f"{label:<26} | {py_s:9.2f} | {np_s:8.3f} | {py_s / np_s:7.0f}×")
+    for label, fn in (("equilibrium by day", lambda: analytics.equilibrium(snap, "day")),
+                      ("agent ROI", lambda: analytics.agent_roi(snap, {"affiliate_funnel": "SRN-CIO"})),
+                      ("venture ROI", lambda: analytics.venture_roi(snap))):
+        print(f"{label:<26} | {'-':>9} | {min(timed(fn) for _ in range(3)):8.3f} | {'-':>8}")
+
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="bench_econ_"))
+    try:
+        save_s = timed(lambda: analytics.save_snapshot(snap, tmp))
+        t0 = time.perf_counter()
+        mapped = analytics.load_snapshot(tmp, mmap=True)
+        open_s = time.perf_counter() - t0
+        roll_s = timed(lambda: analytics.equilibrium(mapped, "month"))
+        size = sum(p.stat().st_size for p in tmp.iterdir()) / 1e6
+        print(f"\nsnapshot: {size:.0f} MB saved in {save_s:.2f}s; "
+              f"mmap open {open_s * 1000:.1f} ms, first equilibrium from it {roll_s:.3f}s")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
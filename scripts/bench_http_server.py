@@ -0,0 +1,160 @@
+"""
+Load test: AgentServer vs the original single-threaded HTTPServer front end.
+
+Both servers front a stub engine whose run() sleeps for --latency seconds,
+standing in for the OpenAI call. --clients threads POST back-to-back for
+--seconds while a prober hits /health every 50 ms. Reports per server:
+completed requests/s, status-code mix, p50/p99 POST latency and p99 /health
+latency.
+
+Usage:
+    python scripts/bench_http_server.py
+    python scripts/bench_http_server.py --clients 64 --latency 0.5 --concurrency 8 --queue-depth 16
+"""
+import argparse
+import http.client
+import json
+import logging
+import pathlib
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.server import AgentServer, ServerConfig  # noqa: E402
+
+
+class StubEngine:
+    agent_id = "BENCH"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def run(self, user_input: str, input_source: str = "unknown", task_id: str = "") -> str:
+        time.sleep(self.latency)
+        return f"ack {task_id}"
+
+
+class LegacyHandler(BaseHTTPRequestHandler):
+    """The pre-AgentServer handler: engine.run() inline on the only server thread."""
+    engine: StubEngine = None
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        output = self.engine.run(payload["message"], payload.get("origin", "webhook"),
+                                 payload.get("task_id", ""))
+        self._respond(200, {"agent": self.engine.agent_id, "response": output})
+
+    def do_GET(self):
+        self._respond(200, {"status": "ok", "agent": self.engine.agent_id})
+
+    def _respond(self, code, body):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", len(data))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def request(port: int, method: str, path: str, body: bytes = None, timeout: float = 30.0):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    t0 = time.perf_counter()
+    try:
+        conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        resp.read()
+        status = resp.status
+    except (OSError, http.client.HTTPException):
+        status = "error"
+    finally:
+        conn.close()
+    return status, time.perf_counter() - t0
+
+
+def load(port: int, clients: int, seconds: float) -> dict:
+    deadline = time.perf_counter() + seconds
+    statuses, latencies, health = Counter(), [], []
+    lock = threading.Lock()
+
+    def client(n: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            body = json.dumps({"message": "status report", "task_id": f"T-{n}-{i}"}).encode()
+            status, elapsed = request(port, "POST", "/task", body)
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(elapsed)
+            if status == 429:
+                time.sleep(0.05)   # honour backpressure a little, like a real caller
+            i += 1
+
+    def prober():
+        while time.perf_counter() < deadline:
+            status, elapsed = request(port, "GET", "/health")
+            health.append(elapsed if status == 200 else float("inf"))
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    threads.append(threading.Thread(target=prober))
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {"rps": statuses[200] / elapsed, "statuses": dict(statuses),
+            "p50": percentile(latencies, 50), "p99": percentile(latencies, 99),
+            "health_p99": percentile(health, 99)}
+
+
+def serve(server) -> int:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub model latency (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--queue-depth", type=int, default=8)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    engine = StubEngine(args.latency)
+    legacy = HTTPServer(("127.0.0.1", 0), type("Handler", (LegacyHandler,), {"engine": engine}))
+    legacy.request_queue_size = 128
+    pooled = AgentServer(("127.0.0.1", 0), engine, ServerConfig(
+        concurrency=args.concurrency, queue_depth=args.queue_depth,
+        max_connections=args.clients + 16))
+
+    print(f"{args.clients} clients x {args.seconds:.0f}s, stub latency {args.latency * 1000:.0f} ms, "
+          f"AgentServer concurrency={args.concurrency} queue_depth={args.queue_depth}")
+    print(f"{'server':<12} | {'req/s':>7} | {'p50 ms':>7} | {'p99 ms':>7} | {'/health p99 ms':>14} | statuses")
+    for label, server in (("HTTPServer", legacy), ("AgentServer", pooled)):
+        r = load(serve(server), args.clients, args.seconds)
+        server.shutdown()
+        server.server_close()
+        print(f"{label:<12} | {r['rps']:7.1f} | {r['p50'] * 1000:7.0f} | {r['p99'] * 1000:7.0f} | "
+              f"{r['health_p99'] * 1000:14.0f} | {r['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
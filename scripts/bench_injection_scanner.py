@@ -0,0 +1,101 @@
+"""
+Benchmark: InjectionGuard scanning engine vs the original per-pattern loop.
+
+Builds 1 KB / 100 KB / 10 MB inputs from the repo's own markdown corpus (real
+governance text, including quoted injection phrases) and reports throughput in
+MB/s for both engines. The sequential loop runs in a child process with a
+timeout — a runaway regex inside `re` cannot be interrupted in-process.
+
+Usage:
+    python scripts/bench_injection_scanner.py
+    python scripts/bench_injection_scanner.py --sizes 1024 102400 --timeout 30
+    python scripts/bench_injection_scanner.py --single-line
+
+On multi-line text the sequential loop is dominated by the backtracking in
+`(\n.*){0,3}ignore(\n.*){0,3}instructions` and rarely finishes past a few KB.
+--single-line folds newlines to spaces so both engines can be compared on the
+remaining patterns.
+"""
+import argparse
+import multiprocessing
+import pathlib
+import sys
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.injection_guard import _pattern_set, default_scanner  # noqa: E402
+from openclaw_core.pattern_scanner import SequentialScanner, build_rules  # noqa: E402
+
+DEFAULT_SIZES = [1024, 100 * 1024, 10 * 1024 * 1024]
+
+
+def build_input(size: int, single_line: bool = False) -> str:
+    corpus = "\n".join(
+        p.read_text(encoding="utf-8") for p in sorted(REPO_ROOT.rglob("*.md"))
+        if ".git" not in p.parts
+    )
+    if single_line:
+        corpus = corpus.replace("\n", " ")
+    return (corpus * (size // len(corpus) + 1))[:size]
+
+
+def _time_scan(scanner, text: str, repeat: int):
+    best = float("inf")
+    matched = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        matched = scanner.scan(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, matched
+
+
+def _sequential_child(size: int, single_line: bool, repeat: int, out):
+    text = build_input(size, single_line)
+    out.put(_time_scan(SequentialScanner(build_rules(_pattern_set())), text, repeat))
+
+
+def time_sequential(size: int, single_line: bool, repeat: int, timeout: float):
+    out = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_sequential_child,
+                                   args=(size, single_line, repeat, out))
+    proc.start()
+    proc.join(timeout)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+        return None, None
+    return out.get()
+
+
+def mb_per_s(size: int, seconds: float) -> str:
+    return f"{size / seconds / 1e6:10.2f}" if seconds else "       inf"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="Per-size cap for the sequential loop (seconds)")
+    parser.add_argument("--single-line", action="store_true",
+                        help="Replace newlines with spaces in the input corpus")
+    args = parser.parse_args()
+
+    print(f"{'size':>10} | {'prefilter MB/s':>14} | {'sequential MB/s':>15} | speedup | same result")
+    for size in args.sizes:
+        text = build_input(size, args.single_line)
+        fast_s, fast_matched = _time_scan(default_scanner(), text, args.repeat)
+        seq_s, seq_matched = time_sequential(size, args.single_line, args.repeat, args.timeout)
+        if seq_s is None:
+            seq_col, speedup, same = f"  >{args.timeout:.0f}s timeout", "   n/a", "n/a"
+        else:
+            seq_col = f"{mb_per_s(size, seq_s):>15}"
+            speedup = f"{seq_s / fast_s:6.1f}x" if fast_s else "   inf"
+            same = "yes" if seq_matched == fast_matched else "NO"
+        print(f"{size:>10} | {mb_per_s(size, fast_s):>14} | {seq_col:>15} | {speedup:>7} | {same}")
+
+
+if __name__ == "__main__":
+    main()
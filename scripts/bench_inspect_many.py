@@ -0,0 +1,66 @@
+"""
+Benchmark: InjectionGuard.inspect_many scaling across process-pool workers.
+
+Re-screens a batch of stored inputs (slices of the repo's markdown corpus) with
+1, 2, 4 ... workers and reports inputs/s, MB/s and speedup over one worker.
+Results are checked to be identical for every worker count.
+
+Usage:
+    python scripts/bench_inspect_many.py
+    python scripts/bench_inspect_many.py --count 2000 --size 20000 --workers 1 2 4 8
+"""
+import argparse
+import logging
+import os
+import pathlib
+import sys
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.injection_guard import InjectionGuard  # noqa: E402
+
+
+def build_inputs(count: int, size: int) -> list:
+    corpus = "\n".join(
+        p.read_text(encoding="utf-8") for p in sorted(REPO_ROOT.rglob("*.md"))
+        if ".git" not in p.parts
+    )
+    corpus = corpus * (size // len(corpus) + 2)
+    step = max(1, (len(corpus) - size) // count)
+    return [corpus[i * step % (len(corpus) - size):][:size] for i in range(count)]
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpus})
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=400)
+    parser.add_argument("--size", type=int, default=50_000, help="Characters per input")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)   # per-input block logs would dominate
+    inputs = build_inputs(args.count, args.size)
+    total_mb = sum(len(t) for t in inputs) / 1e6
+    guard = InjectionGuard(agent_id="BENCH")
+
+    print(f"{args.count} inputs x {args.size} chars ({total_mb:.1f} MB), {cpus} CPUs")
+    print(f"{'workers':>7} | {'seconds':>8} | {'inputs/s':>9} | {'MB/s':>7} | speedup")
+    baseline = reference = None
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        results = guard.inspect_many(inputs, "web_scrape", workers=workers)
+        elapsed = time.perf_counter() - t0
+        verdicts = [(r.severity, r.matched_patterns) for r in results]
+        if reference is None:
+            reference, baseline = verdicts, elapsed
+        elif verdicts != reference:
+            print(f"  !! results with {workers} workers differ from {args.workers[0]}")
+        print(f"{workers:>7} | {elapsed:8.2f} | {args.count / elapsed:9.1f} | "
+              f"{total_mb / elapsed:7.2f} | {baseline / elapsed:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
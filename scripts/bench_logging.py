@@ -0,0 +1,143 @@
+"""
+Benchmark: cost of engine logging on the request thread — the original
+get_logger (one synchronous FileHandler on the shared "ASTRA_LOG" logger) vs
+openclaw_core.logger (per-agent QueueHandler → QueueListener with rotation).
+
+Several request threads each log model-call lines as fast as they can, split
+across two agents. Reports, per pipeline, the p50 / p99 / max time of one
+logger.info() call, records/s seen by the callers, the time until the last
+record is on disk, and which files the lines ended up in. --fsync forces every
+write to disk, standing in for a slow or contended volume.
+
+Usage:
+    python scripts/bench_logging.py
+    python scripts/bench_logging.py --threads 16 --records 20000 --fsync
+"""
+import argparse
+import logging
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core import logger as oc_logger  # noqa: E402
+
+LINE = "[%s] OK | task=T%d | in=4153 cached=3968 out=12 | model=gpt-4o-mini prompt=3f2a9c"
+
+
+def fsync_every_record():
+    """Make every FileHandler (rotating ones included) fsync after each record."""
+    emit = logging.FileHandler.emit
+
+    def emit_and_sync(self, record):
+        emit(self, record)
+        if self.stream is not None:
+            self.stream.flush()
+            os.fsync(self.stream.fileno())
+
+    logging.FileHandler.emit = emit_and_sync
+
+
+def original_get_logger(log_file):
+    """openclaw_core.logger.get_logger before the queue pipeline, with root propagation off."""
+    logger = logging.getLogger("ASTRA_LOG")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(asctime)s [ASTRA_LOG] %(levelname)s %(message)s'))
+        logger.addHandler(handler)
+    return logger
+
+
+def drive(loggers: dict, threads: int, records: int) -> tuple:
+    """Each thread logs `records` lines, alternating agents. Returns (latencies, seconds)."""
+    samples = [[] for _ in range(threads)]
+    agents = list(loggers.items())
+    start = threading.Barrier(threads + 1)
+
+    def worker(k: int):
+        out = samples[k]
+        start.wait()
+        for i in range(records):
+            agent, logger = agents[(k + i) % len(agents)]
+            t0 = time.perf_counter()
+            logger.info(LINE, agent, i)
+            out.append(time.perf_counter() - t0)
+
+    pool = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    for t in pool:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in pool:
+        t.join()
+    return [s for per in samples for s in per], time.perf_counter() - t0
+
+
+def report(label: str, latencies: list, seconds: float, drained: float, files: dict):
+    latencies.sort()
+    n = len(latencies)
+    us = lambda q: latencies[min(n - 1, int(q * n))] * 1e6  # noqa: E731
+    print(f"{label:<10} | {us(0.5):8.1f} | {us(0.99):8.1f} | {latencies[-1] * 1e3:8.2f} | "
+          f"{n / seconds:10,.0f} | {drained:8.2f} | " + ", ".join(f"{k}={v}" for k, v in files.items()))
+
+
+def line_counts(directory: pathlib.Path) -> dict:
+    counts = {}
+    for path in sorted(directory.glob("*.log*")):
+        with open(path, encoding="utf-8") as f:
+            counts[path.name] = sum(1 for _ in f)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--records", type=int, default=10_000, help="lines per thread")
+    parser.add_argument("--fsync", action="store_true", help="fsync after every record")
+    args = parser.parse_args()
+
+    total = args.threads * args.records
+    if args.fsync:
+        fsync_every_record()
+    print(f"{args.threads} threads × {args.records:,} lines, two agents"
+          f"{', fsync per record' if args.fsync else ''}")
+    print(f"{'pipeline':<10} | {'p50 µs':>8} | {'p99 µs':>8} | {'max ms':>8} | {'lines/s':>10} | "
+          f"{'on disk s':>8} | lines per file")
+
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="bench_logging_"))
+    try:
+        before = tmp / "before"
+        loggers = {agent: original_get_logger(str(before / f"{agent}.log"))
+                   for agent in ("roxy", "vera")}
+        latencies, seconds = drive(loggers, args.threads, args.records)
+        for handler in logging.getLogger("ASTRA_LOG").handlers:
+            handler.close()
+        report("original", latencies, seconds, seconds, line_counts(before))
+
+        after = tmp / "after"
+        loggers = {agent: oc_logger.get_logger(after / f"{agent}.log", name=agent, max_bytes=5 * 1024 * 1024,
+                                               queue_size=total, propagate=False)
+                   for agent in ("roxy", "vera")}
+        latencies, seconds = drive(loggers, args.threads, args.records)
+        dropped = sum(s["dropped"] for s in oc_logger.stats())
+        t0 = time.perf_counter()
+        oc_logger.shutdown()
+        drained = seconds + time.perf_counter() - t0
+        report("queued", latencies, seconds, drained, line_counts(after))
+        if dropped:
+            print(f"queued pipeline dropped {dropped:,} of {total:,} lines (queue full)")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark: openclaw_core.memory.MemoryStore at scale.
+
+Fills a store with synthetic agent memories (short notes over a few
+thousand-word vocabulary, a fifth of them keyed and rewritten over time),
+then reports:
+
+  - fill rate, then on the filled store: what put() costs the caller, and
+    commit throughput with group commit vs waiting for each entry's commit
+  - time to open the filled store (nothing is loaded) vs reading every
+    entry into a dict, as a load-everything design would at startup
+  - get() p50 / p99 from the LRU cache and from SQLite
+  - recall() p50 / p99 for a 300-token budget
+  - compact() after rewriting a slice of the keys
+
+Usage:
+    python scripts/bench_memory_store.py
+    python scripts/bench_memory_store.py --entries 2000000
+"""
+import argparse
+import pathlib
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.memory import MemoryStore  # noqa: E402
+
+NAMESPACES = ("notes", "preferences", "ventures", "exchanges")
+
+
+def vocabulary(n: int, rng: random.Random) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(n)]
+
+
+def note(rng: random.Random, words: list) -> str:
+    # Zipf-ish word choice: a few common terms, a long tail
+    return " ".join(words[min(len(words) - 1, int(rng.paretovariate(1.1)) - 1)]
+                    if rng.random() < 0.5 else rng.choice(words)
+                    for _ in range(rng.randint(12, 30)))
+
+
+def percentiles(samples: list) -> str:
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    return f"p50 {statistics.median(samples) * 1e6:7.0f} µs | p99 {p99 * 1e6:7.0f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=300_000)
+    parser.add_argument("--keys", type=int, default=20_000, help="distinct keys among keyed entries")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=3_000, help="extra writes timed on the filled store")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    words = vocabulary(5_000, rng)
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="bench_memory_"))
+    try:
+        # ── Writes ──────────────────────────────────────────────────────
+        entries = []
+        for _ in range(args.entries):
+            key = f"k{rng.randrange(args.keys)}" if rng.random() < 0.2 else None
+            entries.append((rng.choice(NAMESPACES), key, note(rng, words)))
+        keyed = [key for _, key, _ in entries if key is not None]
+
+        path = tmp / "memory.sqlite"
+        store = MemoryStore(path)
+        t0 = time.perf_counter()
+        for namespace, key, value in entries:
+            store.put(namespace, key, value)
+        store.flush()
+        fill_s = time.perf_counter() - t0
+        print(f"fill: {args.entries:,} entries in {fill_s:.1f}s ({args.entries / fill_s:,.0f}/s), "
+              f"{path.stat().st_size / 1e6:.0f} MB")
+
+        # Write cost on the filled store: group commit vs waiting for each entry's commit
+        extra = [(namespace, key, note(rng, words)) for namespace, key, _ in entries[:args.sample]]
+        t0 = time.perf_counter()
+        for namespace, key, value in extra:
+            store.put(namespace, key, value)
+        put_s = time.perf_counter() - t0
+        store.flush()
+        batched_s = time.perf_counter() - t0
+        store.close()
+        single = MemoryStore(path, batch_size=1, flush_interval=0)
+        t0 = time.perf_counter()
+        for namespace, key, value in extra:
+            single.put(namespace, key, value)
+        single.flush()
+        single_s = time.perf_counter() - t0
+        single.close()
+        print(f"{args.sample:,} more writes: put() returns in {put_s / args.sample * 1e6:.1f} µs; "
+              f"{args.sample / batched_s:,.0f}/s committed in batches vs {args.sample / single_s:,.0f}/s "
+              f"with one commit per entry")
+
+        # ── Open ────────────────────────────────────────────────────────
+        t0 = time.perf_counter()
+        store = MemoryStore(path)
+        open_s = time.perf_counter() - t0
+        conn = sqlite3.connect(str(path))
+        t0 = time.perf_counter()
+        everything = {row[0]: row[1:] for row in conn.execute(
+            "SELECT id, namespace, key, value FROM memory_entries WHERE current = 1")}
+        load_all_s = time.perf_counter() - t0
+        conn.close()
+        print(f"open: {open_s * 1000:.1f} ms vs {load_all_s * 1000:,.0f} ms to load all "
+              f"{len(everything):,} current entries")
+        del everything
+
+        # ── Reads ───────────────────────────────────────────────────────
+        lookups = [("notes", rng.choice(keyed)) for _ in range(args.queries)]
+        cold = []
+        for namespace, key in lookups:
+            t0 = time.perf_counter()
+            store.get(namespace, key)
+            cold.append(time.perf_counter() - t0)
+        warm = []
+        for namespace, key in lookups:
+            t0 = time.perf_counter()
+            store.get(namespace, key)
+            warm.append(time.perf_counter() - t0)
+        print(f"get() from SQLite   : {percentiles(cold)}")
+        print(f"get() from LRU cache: {percentiles(warm)}")
+
+        recalls, sizes = [], []
+        for _ in range(args.queries):
+            query = note(rng, words)[:120]
+            t0 = time.perf_counter()
+            got = store.recall(query, max_tokens=300)
+            recalls.append(time.perf_counter() - t0)
+            sizes.append(sum(entry.tokens for entry in got))
+        print(f"recall(300 tokens)  : {percentiles(recalls)} | {statistics.mean(sizes):.0f} tokens returned on average")
+
+        # ── Compaction ──────────────────────────────────────────────────
+        rewrites = max(1, args.entries // 20)
+        for _ in range(rewrites):
+            store.put("notes", f"k{rng.randrange(args.keys)}", note(rng, words))
+        store.flush()
+        t0 = time.perf_counter()
+        removed = store.compact()
+        print(f"compact(): removed {removed:,} superseded entries in {time.perf_counter() - t0:.2f}s")
+        store.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: sync model calls (run()) vs the async path (arun()) against the fake server.
+
+Starts scripts/fake_openai_server.py in-process, then issues --calls chat
+completions two ways: back-to-back through the sync OpenAI client (what run()
+does) and concurrently through AsyncModelClient (what arun() does). Reports
+calls/s, p50/p99 latency, retries and failures.
+
+Usage:
+    python scripts/bench_model_calls.py
+    python scripts/bench_model_calls.py --calls 200 --latency 0.2 --concurrency 16 --error-rate 0.1
+"""
+import argparse
+import asyncio
+import logging
+import pathlib
+import sys
+import threading
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from openai import OpenAI  # noqa: E402
+
+from fake_openai_server import make_server  # noqa: E402
+from openclaw_core.model_client import AsyncModelClient  # noqa: E402
+
+MESSAGES = [{"role": "system", "content": "You are a benchmark."},
+            {"role": "user", "content": "status report"}]
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_sync(base_url: str, calls: int) -> dict:
+    client = OpenAI(api_key="fake", base_url=base_url)   # SDK default: 2 retries, no deadline
+    latencies, failures = [], 0
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        start = time.perf_counter()
+        try:
+            client.chat.completions.create(model="fake", messages=MESSAGES)
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            failures += 1
+    return {"elapsed": time.perf_counter() - t0, "latencies": latencies,
+            "failures": failures, "retries": "n/a"}
+
+
+async def run_async(base_url: str, calls: int, concurrency: int, timeout: float) -> dict:
+    client = AsyncModelClient("fake", api_key="fake", base_url=base_url,
+                              max_concurrency=concurrency, timeout=timeout, backoff=0.05)
+    latencies, failures = [], 0
+
+    async def one():
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            await client.complete(MESSAGES)
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            failures += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    elapsed = time.perf_counter() - t0
+    await client.aclose()
+    return {"elapsed": elapsed, "latencies": latencies, "failures": failures,
+            "retries": client.retries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake model latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8, help="AsyncModelClient max_concurrency")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call deadline for arun()")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    server = make_server(latency=args.latency, error_rate=args.error_rate, retry_after=0.05)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    print(f"{args.calls} calls, fake latency {args.latency * 1000:.0f} ms, "
+          f"error rate {args.error_rate:.0%}, async concurrency {args.concurrency}")
+    print(f"{'path':<18} | {'calls/s':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'retries':>7} | failures")
+    results = [
+        ("sync run()", run_sync(base_url, args.calls)),
+        ("async arun()", asyncio.run(run_async(base_url, args.calls, args.concurrency, args.timeout))),
+    ]
+    for label, r in results:
+        ok = len(r["latencies"])
+        print(f"{label:<18} | {ok / r['elapsed']:8.1f} | {percentile(r['latencies'], 50) * 1000:7.0f} | "
+              f"{percentile(r['latencies'], 99) * 1000:7.0f} | {r['retries']:>7} | {r['failures']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
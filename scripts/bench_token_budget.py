@@ -0,0 +1,136 @@
+"""
+Benchmark: local token counting and context-budget enforcement (openclaw_core.tokens).
+
+Reports:
+
+  - count() throughput at 1 KB / 100 KB / 10 MB for the regex approximation
+    and, when tiktoken and its encoding are available, the exact tokenizer,
+    plus how far the approximation is from the exact count on the corpus
+  - an oversize 10 MB scraped input: time to reject it locally vs POSTing it
+    to scripts/fake_openai_server.py (started in-process), which is what a
+    provider-side rejection costs at best — the upload and a round trip
+  - truncate() of the same input to the --budget tokens: time, resulting
+    size, and that two runs give byte-identical output
+
+Usage:
+    python scripts/bench_token_budget.py
+    python scripts/bench_token_budget.py --budget 16000 --latency 0.5
+"""
+import argparse
+import http.client
+import json
+import pathlib
+import statistics
+import sys
+import threading
+import time
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from fake_openai_server import make_server  # noqa: E402
+from openclaw_core.corpus_index import CORPUS_DIRS  # noqa: E402
+from openclaw_core.tokens import ContextBudget, PromptTooLarge, TokenCounter  # noqa: E402
+
+SIZES = (("1 KB", 1024), ("100 KB", 100 * 1024), ("10 MB", 10 * 1024 * 1024))
+
+
+def corpus_text() -> str:
+    parts = []
+    for name in CORPUS_DIRS:
+        for path in sorted((REPO_ROOT / name).rglob("*.md")):
+            parts.append(path.read_text(encoding="utf-8", errors="replace"))
+    return "\n\n".join(parts)
+
+
+def sized(text: str, size: int) -> str:
+    return (text * (size // len(text) + 1))[:size]
+
+
+def timed(fn, repeat: int = 1):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return result, statistics.median(times)
+
+
+def reject_locally(counter: TokenCounter, budget: ContextBudget, text: str):
+    tokens = counter.count(text, limit=budget.max_input_tokens)     # stops once past the limit
+    if tokens > budget.max_input_tokens:
+        raise PromptTooLarge(tokens, budget.max_input_tokens)
+
+
+def upload(port: int, text: str) -> float:
+    body = json.dumps({"model": "fake", "messages": [{"role": "user", "content": text}]}).encode()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    t0 = time.perf_counter()
+    conn.request("POST", "/v1/chat/completions", body, {"Content-Type": "application/json"})
+    conn.getresponse().read()
+    elapsed = time.perf_counter() - t0
+    conn.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--budget", type=int, default=8000, help="max_input_tokens for the oversize input")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake server seconds per completion")
+    args = parser.parse_args()
+
+    text = corpus_text()
+    counters = [TokenCounter(args.model, exact=False)]
+    exact = TokenCounter(args.model)
+    if exact.exact:
+        counters.append(exact)
+    else:
+        print("tiktoken or its encoding unavailable — approximate counter only\n")
+
+    # ── Counting ────────────────────────────────────────────────────────
+    print(f"{'counter':<12} | " + " | ".join(f"{label:>18}" for label, _ in SIZES))
+    for counter in counters:
+        cells = []
+        for _, size in SIZES:
+            sample = sized(text, size)
+            _, seconds = timed(lambda: counter.count(sample), repeat=1 if size > 1_000_000 else 20)
+            cells.append(f"{size / seconds / 1e6:>9.1f} MB/s")
+        print(f"{counter.name:<12} | " + " | ".join(f"{cell:>18}" for cell in cells))
+    if exact.exact:
+        approx, real = counters[0].count(text), exact.count(text)
+        print(f"corpus: approx {approx:,} vs {exact.name} {real:,} tokens ({approx / real - 1:+.1%})")
+
+    # ── Oversize input: local rejection vs upload ───────────────────────
+    counter = counters[-1]
+    budget = ContextBudget(max_input_tokens=args.budget, overflow="reject")
+    big = sized(text, 10 * 1024 * 1024)
+    t0 = time.perf_counter()
+    try:
+        reject_locally(counter, budget, big)
+        rejected = None
+    except PromptTooLarge as e:
+        rejected = e
+    local_s = time.perf_counter() - t0
+
+    server = make_server(latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        upload_s = upload(server.server_address[1], big)
+    finally:
+        server.shutdown()
+    print(f"\n10 MB input, budget {args.budget:,} tokens: rejected locally in {local_s * 1000:,.0f} ms "
+          f"({rejected.tokens:,} tokens counted before stopping)\n"
+          f"  vs {upload_s * 1000:,.0f} ms to upload it to the fake server (loopback, {args.latency}s model "
+          f"latency) — a real provider adds WAN upload time and bills the attempt")
+
+    # ── Truncation ──────────────────────────────────────────────────────
+    cut, truncate_s = timed(lambda: counter.truncate(big, args.budget))
+    again = counter.truncate(big, args.budget)
+    print(f"truncate to {args.budget:,}: {truncate_s * 1000:,.0f} ms → {counter.count(cut):,} tokens "
+          f"({len(cut) / 1024:.0f} KB), deterministic: {cut == again}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: ToolPolicy.authorize throughput, compiled decision table vs the
+original per-call evaluation.
+
+LegacyToolPolicy below reproduces the pre-compilation authorize(): registry
+lookup, tier arithmetic, allowlist list scan, log-message formatting,
+utcnow().isoformat() and an eagerly built audit dict on every call. Both run against the same
+TOOL_REGISTRY so only the evaluation strategy differs.
+
+Usage:
+    python scripts/bench_tool_policy.py
+    python scripts/bench_tool_policy.py --calls 500000
+"""
+import argparse
+import datetime
+import logging
+import pathlib
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.tool_policy import TIER_ORDER, TOOL_REGISTRY, ToolPolicy  # noqa: E402
+
+
+@dataclass
+class LegacyAuthorizationResult:
+    allowed: bool
+    tool_name: str
+    agent_id: str
+    denial_reason: Optional[str] = None
+    requires_council_vote: bool = False
+    requires_architect_approval: bool = False
+    audit_event: dict = field(default_factory=dict)
+
+
+class LegacyToolPolicy:
+    def __init__(self, agent_id: str, tier: str):
+        self.agent_id = agent_id
+        self.tier = tier
+
+    def authorize(self, tool_name: str, context: dict = None) -> LegacyAuthorizationResult:
+        context = context or {}
+        timestamp = datetime.datetime.utcnow().isoformat() + "Z"
+        if tool_name not in TOOL_REGISTRY:
+            return self._deny(tool_name, f"Tool '{tool_name}' is not registered.", context, timestamp)
+        spec = TOOL_REGISTRY[tool_name]
+        agent_tier_level = TIER_ORDER.get(self.tier, 99)
+        min_tier_level = TIER_ORDER.get(spec["min_tier"], 0)
+        if agent_tier_level > min_tier_level:
+            return self._deny(tool_name, f"Agent tier '{self.tier}' too low for '{tool_name}'.",
+                              context, timestamp)
+        allowed_agents = spec.get("allowed_agents", "all")
+        if allowed_agents != "all" and self.agent_id not in allowed_agents:
+            return self._deny(tool_name, f"Agent '{self.agent_id}' not authorized for '{tool_name}'. "
+                              f"Authorized agents: {allowed_agents}", context, timestamp)
+        requires_vote = spec.get("requires_council_vote", False)
+        if requires_vote and not context.get("council_vote_ref"):
+            return LegacyAuthorizationResult(
+                False, tool_name, self.agent_id, f"Tool '{tool_name}' requires a Council vote record.",
+                True, spec.get("requires_architect_approval", False),
+                self._event(tool_name, "DENIED_NEEDS_VOTE", context, timestamp))
+        requires_architect = spec.get("requires_architect_approval", False)
+        if requires_architect and not context.get("architect_approval_ref"):
+            return LegacyAuthorizationResult(
+                False, tool_name, self.agent_id, f"Tool '{tool_name}' requires Architect approval.",
+                requires_vote, True,
+                self._event(tool_name, "DENIED_NEEDS_ARCHITECT", context, timestamp))
+        logging.getLogger("tool_policy").info(
+            f"[{self.agent_id}] TOOL AUTHORIZED | tool={tool_name} | "
+            f"task_id={context.get('task_id', '')}"
+        )
+        return LegacyAuthorizationResult(
+            True, tool_name, self.agent_id, None, requires_vote, requires_architect,
+            self._event(tool_name, "AUTHORIZED", context, timestamp))
+
+    def _deny(self, tool_name, reason, context, timestamp) -> LegacyAuthorizationResult:
+        logging.getLogger("tool_policy").warning(
+            f"[{self.agent_id}] TOOL DENIED | tool={tool_name} | "
+            f"reason={reason} | task_id={context.get('task_id', '')}"
+        )
+        return LegacyAuthorizationResult(False, tool_name, self.agent_id, reason,
+                                         audit_event=self._event(tool_name, "DENIED", context, timestamp))
+
+    def _event(self, tool_name, outcome, context, timestamp) -> dict:
+        return {
+            "event_id": f"TOOL-{self.agent_id}-{tool_name}-{timestamp[:19].replace(':', '')}",
+            "actor": self.agent_id,
+            "action": f"TOOL_REQUEST_{tool_name.upper()}",
+            "outcome": outcome,
+            "details": {
+                "tool_name": tool_name,
+                "agent_tier": self.tier,
+                "council_vote_ref": context.get("council_vote_ref"),
+                "architect_approval_ref": context.get("architect_approval_ref"),
+            },
+            "task_id": context.get("task_id", ""),
+            "timestamp": timestamp,
+        }
+
+
+SCENARIOS = [
+    # label, agent_id, tier, tool, context
+    ("allow (all agents)", "RXY-CEO", "TIER_1_COUNCIL", "corpus_read", {"task_id": "T-1"}),
+    ("allow (allowlist)", "VRA-TKL-01", "TIER_2_SUBAGENT", "ledger_write", {"task_id": "T-1"}),
+    ("deny (allowlist)", "SRN-CIO", "TIER_1_COUNCIL", "telegram_send", {"task_id": "T-1"}),
+    ("deny (needs vote)", "BRM-CTO", "TIER_1_COUNCIL", "n8n_trigger", {"task_id": "T-1"}),
+    ("deny (unregistered)", "RXY-CEO", "TIER_1_COUNCIL", "rm_rf", {"task_id": "T-1"}),
+]
+
+
+def rate(fn, calls: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return calls / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)   # measure the decision, not the log sink
+
+    print(f"{'scenario':<22} | {'before/s':>11} | {'after/s':>11} | {'after+audit/s':>13} | speedup")
+    for label, agent_id, tier, tool, ctx in SCENARIOS:
+        legacy = LegacyToolPolicy(agent_id, tier)
+        policy = ToolPolicy(agent_id, tier)
+        before = rate(lambda: legacy.authorize(tool, ctx), args.calls)
+        after = rate(lambda: policy.authorize(tool, ctx), args.calls)
+        audited = rate(lambda: policy.authorize(tool, ctx).audit_event, args.calls)
+        print(f"{label:<22} | {before:11,.0f} | {after:11,.0f} | {audited:13,.0f} | {after / before:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Report: Vera's economic rollups — token cost per agent, profit equilibrium and ROI.
+
+Reads token_ledger and economic_metrics from the local ledger (or a saved
+columnar snapshot, memory-mapped) and prints, per period:
+
+  - token cost per agent
+  - revenue vs token + operating cost, net and equilibrium status
+    (POSITIVE / NEUTRAL / NEGATIVE, as in the weekly report)
+  - per-agent ROI on attributed venture revenue, and §2.1 venture ROI
+
+Needs NumPy (pip install numpy).
+
+Usage:
+    python scripts/economic_report.py
+    python scripts/economic_report.py --period week --owner affiliate_funnel=SRN-CIO
+    python scripts/economic_report.py --write-snapshot data/economics
+    python scripts/economic_report.py --snapshot data/economics --json
+"""
+import argparse
+import json
+import math
+import pathlib
+import sys
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+try:
+    from openclaw_core import analytics  # noqa: E402
+except ImportError as e:
+    sys.exit(str(e))
+from openclaw_core.ledger import DEFAULT_LEDGER_PATH  # noqa: E402
+
+
+def _num(value) -> float:
+    value = float(value)
+    return None if math.isnan(value) else round(value, 6)
+
+
+def build_report(snap, period: str, owners: dict, neutral_band: float) -> dict:
+    rollup = analytics.agent_rollup(snap, period)
+    eq = analytics.equilibrium(snap, period, neutral_band)
+    roi = analytics.agent_roi(snap, owners)
+    ventures = analytics.venture_roi(snap)
+    return {
+        "period": period,
+        "agent_cost": [
+            {"period": label, **{agent: _num(rollup["cost"][i, j]) for j, agent in enumerate(rollup["agents"])}}
+            for i, label in enumerate(rollup["periods"])
+        ],
+        "equilibrium": [
+            {"period": label, "token_cost": _num(eq["token_cost"][i]),
+             "operating_cost": _num(eq["operating_cost"][i]), "revenue": _num(eq["revenue"][i]),
+             "net": _num(eq["net"][i]), "status": eq["status"][i]}
+            for i, label in enumerate(eq["periods"])
+        ],
+        "agent_roi": [
+            {"agent": agent, "cost": _num(roi["cost"][j]), "revenue": _num(roi["revenue"][j]),
+             "roi": _num(roi["roi"][j])}
+            for j, agent in enumerate(roi["agents"])
+        ],
+        "venture_roi": [
+            {"venture": name, "monthly_revenue": _num(ventures["monthly_revenue"][k]),
+             "startup_capital": _num(ventures["startup_capital"][k]),
+             "annualized_roi": _num(ventures["annualized_roi"][k]), "roi_score": ventures["roi_score"][k]}
+            for k, name in enumerate(ventures["ventures"])
+        ],
+    }
+
+
+def _money(value) -> str:
+    return f"{value:10.2f}" if value is not None else f"{'-':>10}"
+
+
+def print_report(report: dict):
+    rows = report["agent_cost"]
+    agents = [k for k in rows[0] if k != "period"] if rows else []
+    print(f"Token cost per agent (USD) by {report['period']}")
+    print(f"{'period':<10} | " + " | ".join(f"{a:>10}" for a in agents))
+    for row in rows:
+        print(f"{row['period']:<10} | " + " | ".join(_money(row[a]) for a in agents))
+
+    print(f"\nProfit equilibrium by {report['period']}")
+    print(f"{'period':<10} | {'tokens $':>10} | {'operating $':>11} | {'revenue $':>10} | "
+          f"{'net $':>10} | status")
+    for row in report["equilibrium"]:
+        print(f"{row['period']:<10} | {_money(row['token_cost'])} | {row['operating_cost']:11.2f} | "
+              f"{_money(row['revenue'])} | {_money(row['net'])} | {row['status']}")
+
+    print("\nAgent ROI (attributed venture revenue)")
+    print(f"{'agent':<10} | {'cost $':>10} | {'revenue $':>10} | {'ROI':>8}")
+    for row in report["agent_roi"]:
+        roi = f"{row['roi']:8.1%}" if row["roi"] is not None else f"{'-':>8}"
+        print(f"{row['agent']:<10} | {_money(row['cost'])} | {_money(row['revenue'])} | {roi}")
+
+    if report["venture_roi"]:
+        print("\nVenture ROI (§2.1)")
+        print(f"{'venture':<24} | {'monthly rev $':>13} | {'capital $':>10} | {'annual ROI':>10} | score")
+        for row in report["venture_roi"]:
+            annual = f"{row['annualized_roi']:10.1%}" if row["annualized_roi"] is not None else f"{'-':>10}"
+            print(f"{row['venture']:<24} | {row['monthly_revenue']:13.2f} | "
+                  f"{_money(row['startup_capital'])} | {annual} | {row['roi_score']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ledger", default=str(DEFAULT_LEDGER_PATH))
+    parser.add_argument("--snapshot", help="Read a snapshot directory instead of the ledger")
+    parser.add_argument("--write-snapshot", help="Save the ledger as a columnar snapshot here")
+    parser.add_argument("--period", choices=analytics.PERIODS, default="month")
+    parser.add_argument("--owner", action="append", default=[], metavar="VENTURE=SIM_ID",
+                        help="Attribute a venture's revenue to an agent (repeatable)")
+    parser.add_argument("--neutral-band", type=float, default=0.05,
+                        help="|net| within this fraction of cost counts as NEUTRAL")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        snap = analytics.load_snapshot(args.snapshot) if args.snapshot else analytics.load_ledger(args.ledger)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    if args.write_snapshot:
+        print(f"Snapshot written to {analytics.save_snapshot(snap, args.write_snapshot)}", file=sys.stderr)
+    owners = dict(pair.split("=", 1) for pair in args.owner)
+    report = build_report(snap, args.period, owners, args.neutral_band)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
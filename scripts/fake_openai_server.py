@@ -0,0 +1,150 @@
+"""
+Fake OpenAI-compatible server for exercising the model-call path offline.
+
+Serves POST /v1/chat/completions with a canned completion (echoing the last
+user message) after --latency seconds. A configurable share of requests fail
+with 429 (with Retry-After) or 500 so retry / backoff paths can be exercised.
+Prompt-prefix caching is mimicked: once a system prompt of >= 1024 tokens has
+been seen, later requests report it (in 128-token steps) as
+usage.prompt_tokens_details.cached_tokens.
+
+Usage:
+    python scripts/fake_openai_server.py --port 8900 --latency 0.3 --error-rate 0.1
+
+Then point the client at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=fake python main.py --agent roxy
+    # or in agents/<name>/config.yaml:  inference: {base_url: "http://127.0.0.1:8900/v1"}
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive, like the real API
+    latency = 0.3
+    error_rate = 0.0
+    retry_after = 0.1
+    lock = threading.Lock()
+    counts = {"requests": 0, "ok": 0, "429": 0, "500": 0}
+    seen_prefixes = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self._count("requests")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+        time.sleep(self.latency)
+
+        roll = random.random()
+        if roll < self.error_rate / 2:
+            self._count("429")
+            return self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                              {"Retry-After": str(self.retry_after)})
+        if roll < self.error_rate:
+            self._count("500")
+            return self._send(500, {"error": {"message": "Internal error", "type": "server_error"}})
+
+        messages = body.get("messages", [])
+        prompt = " ".join(m.get("content", "") for m in messages if isinstance(m.get("content"), str))
+        reply = f"ack: {messages[-1]['content'][:80] if messages else ''}"
+        cached = self._cached_prefix_tokens(messages)
+        self._count("ok")
+        self._send(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(reply) // 4,
+                "total_tokens": len(prompt) // 4 + len(reply) // 4,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        })
+
+    def do_GET(self):
+        with self.lock:
+            self._send(200, dict(self.counts))
+
+    def _cached_prefix_tokens(self, messages: list) -> int:
+        system = messages[0].get("content", "") if messages and messages[0].get("role") == "system" else ""
+        tokens = len(system) // 4
+        if tokens < 1024:
+            return 0
+        with self.lock:
+            if system not in self.seen_prefixes:
+                self.seen_prefixes.add(system)
+                return 0
+        return tokens // 128 * 128
+
+    def _count(self, key: str):
+        with self.lock:
+            self.counts[key] += 1
+
+    def _send(self, code: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that hit their deadline hang up mid-response — not an error here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.3,
+                error_rate: float = 0.0, retry_after: float = 0.1) -> FakeOpenAIServer:
+    """Build (not start) a fake server; port 0 picks a free port — see server.server_address."""
+    handler = type("Handler", (FakeOpenAIHandler,), {
+        "latency": latency, "error_rate": error_rate, "retry_after": retry_after,
+        "lock": threading.Lock(), "counts": {"requests": 0, "ok": 0, "429": 0, "500": 0},
+        "seen_prefixes": set(),
+    })
+    return FakeOpenAIServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds per completion")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Share of requests failing (half 429, half 500)")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After sent with 429s")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency, args.error_rate, args.retry_after)
+    host, port = server.server_address[:2]
+    print(f"Fake OpenAI API on http://{host}:{port}/v1 (latency {args.latency}s, "
+          f"error rate {args.error_rate:.0%}) — GET / for request counts")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Report: prompt tokens served from the provider's prompt-prefix cache, per agent per day.
+
+Reads the engine logs (logs/<agent>.log by default) and aggregates every
+model-call line
+
+    ... [RXY-CEO] OK | task=T1 | in=4153 cached=3968 out=12 | model=gpt-4o-mini prompt=3f2a...
+
+into calls, prompt tokens, cached prompt tokens, hit ratio and the USD saved
+by the cached-input discount. Lines written before the split existed (no
+`cached=`) count as fully uncached; lines without `model=` are priced as
+--default-model. Rotated files (roxy.log.1, roxy.log.2026-10-17) are read
+too, and JSON-lines logs (logging.json_lines) are parsed alongside text ones.
+
+Usage:
+    python scripts/prompt_cache_report.py
+    python scripts/prompt_cache_report.py logs/roxy.log logs/vera.log --since 2026-10-01
+    python scripts/prompt_cache_report.py --json
+"""
+import argparse
+import glob
+import json
+import pathlib
+import re
+import sys
+from collections import defaultdict
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# USD per 1M prompt tokens: (uncached input, cached input)
+PROMPT_PRICING = {
+    "gpt-4o-mini":  (0.15, 0.075),
+    "gpt-4o":       (2.50, 1.25),
+    "gpt-4.1":      (2.00, 0.50),
+    "gpt-4.1-mini": (0.40, 0.10),
+    "gpt-4.1-nano": (0.10, 0.025),
+    "o4-mini":      (1.10, 0.275),
+}
+
+LINE_RE = re.compile(
+    r"^(?P<date>\d{4}-\d{2}-\d{2}) \S+ .*?\[(?P<agent>[^\]]+)\] OK \| task=[^|]* \| "
+    r"in=(?P<in>\d+)(?: cached=(?P<cached>\d+))? out=(?P<out>\d+)"
+    r"(?: \| model=(?P<model>\S+))?"
+)
+
+
+def _text_line(line: str) -> str:
+    """A JSON-lines record rewritten as the text format LINE_RE expects."""
+    if not line.startswith("{"):
+        return line
+    try:
+        record = json.loads(line)
+        return f"{record['ts'][:10]} {record['ts'][11:]} {record['level']} {record['message']}"
+    except (ValueError, KeyError, TypeError):
+        return line
+
+
+def parse(paths: list, since: str = None, default_model: str = "gpt-4o-mini") -> dict:
+    """(date, agent, model) → {calls, prompt_tokens, cached_tokens}"""
+    totals = defaultdict(lambda: {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                m = LINE_RE.match(_text_line(line))
+                if m is None or (since and m["date"] < since):
+                    continue
+                row = totals[(m["date"], m["agent"], m["model"] or default_model)]
+                row["calls"] += 1
+                row["prompt_tokens"] += int(m["in"])
+                row["cached_tokens"] += int(m["cached"] or 0)
+    return totals
+
+
+def report(totals: dict) -> list:
+    rows = []
+    for (date, agent, model), t in sorted(totals.items()):
+        full, cached = PROMPT_PRICING.get(model, (None, None))
+        row = {"date": date, "agent": agent, "model": model, **t,
+               "hit_rate": round(t["cached_tokens"] / t["prompt_tokens"], 4) if t["prompt_tokens"] else 0.0}
+        if full is None:
+            row.update(cost_usd=None, saved_usd=None)
+        else:
+            uncached = t["prompt_tokens"] - t["cached_tokens"]
+            row["cost_usd"] = round((uncached * full + t["cached_tokens"] * cached) / 1e6, 6)
+            row["saved_usd"] = round(t["cached_tokens"] * (full - cached) / 1e6, 6)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("logs", nargs="*", help="Log files (default: logs/*.log and rotated copies)")
+    parser.add_argument("--since", help="Only include days on or after YYYY-MM-DD")
+    parser.add_argument("--default-model", default="gpt-4o-mini",
+                        help="Model assumed for log lines that do not record one")
+    parser.add_argument("--json", action="store_true", help="Emit rows as JSON")
+    args = parser.parse_args()
+
+    paths = args.logs or sorted(glob.glob(str(REPO_ROOT / "logs" / "*.log"))
+                                + glob.glob(str(REPO_ROOT / "logs" / "*.log.*")))
+    if not paths:
+        sys.exit("No log files found — pass paths or run from a repo with logs/*.log")
+    rows = report(parse(paths, args.since, args.default_model))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'date':<10} | {'agent':<10} | {'model':<14} | {'calls':>6} | {'prompt tok':>11} | "
+          f"{'cached tok':>11} | {'hit':>6} | {'cost $':>9} | {'saved $':>9}")
+    saved_total = 0.0
+    for r in rows:
+        cost = f"{r['cost_usd']:9.4f}" if r["cost_usd"] is not None else f"{'?':>9}"
+        saved = f"{r['saved_usd']:9.4f}" if r["saved_usd"] is not None else f"{'?':>9}"
+        saved_total += r["saved_usd"] or 0.0
+        print(f"{r['date']:<10} | {r['agent']:<10} | {r['model']:<14} | {r['calls']:>6} | "
+              f"{r['prompt_tokens']:>11} | {r['cached_tokens']:>11} | {r['hit_rate']:>6.1%} | {cost} | {saved}")
+    print(f"Total saved: ${saved_total:.4f}")
+    unpriced = sorted({r["model"] for r in rows if r["cost_usd"] is None})
+    if unpriced:
+        print(f"No price for: {', '.join(unpriced)} — add them to PROMPT_PRICING")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Verify the integrity hash chain of the local audit ledger (AST-AUD-01).
+
+By default verifies only the rows appended since the last run, picking up
+from the checkpoint next to the ledger (<ledger>.checkpoint.json) and moving
+it forward when everything checks out. --full, --from-id/--to-id or
+--since/--until verify a historical range from scratch instead, split into
+chunks across --workers processes; those runs never touch the checkpoint.
+
+Prints rows verified, throughput in rows/s and, if the chain is broken, the
+first divergent event. Exits 1 on divergence.
+
+Usage:
+    python scripts/verify_ledger.py
+    python scripts/verify_ledger.py --full --workers 8
+    python scripts/verify_ledger.py --since 2026-10-01T00:00:00Z --until 2026-10-02T00:00:00Z
+    python scripts/verify_ledger.py --json
+"""
+import argparse
+import json
+import pathlib
+import sys
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from openclaw_core.ledger import DEFAULT_LEDGER_PATH  # noqa: E402
+from openclaw_core.ledger_verify import (  # noqa: E402
+    default_checkpoint_path, id_range_for_time, verify_incremental, verify_range,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("ledger", nargs="?", default=str(DEFAULT_LEDGER_PATH))
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <ledger>.checkpoint.json)")
+    parser.add_argument("--full", action="store_true", help="Verify the whole table from scratch")
+    parser.add_argument("--from-id", type=int, help="First id of a range to verify")
+    parser.add_argument("--to-id", type=int, help="Last id of a range to verify")
+    parser.add_argument("--since", help="Range start timestamp (ISO-8601 UTC, inclusive)")
+    parser.add_argument("--until", help="Range end timestamp (ISO-8601 UTC, exclusive)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for chunked verification")
+    parser.add_argument("--chunk-rows", type=int, default=200_000, help="Ids per chunk")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        if args.since or args.until:
+            first_id, last_id = id_range_for_time(args.ledger, args.since, args.until)
+            if first_id is None:
+                sys.exit("No audit events in that time range")
+            report = verify_range(args.ledger, first_id, last_id, args.workers, args.chunk_rows)
+            mode = "time range"
+        elif args.full or args.from_id is not None or args.to_id is not None:
+            report = verify_range(args.ledger, args.from_id, args.to_id, args.workers, args.chunk_rows)
+            mode = "range" if not args.full else "full"
+        else:
+            report = verify_incremental(args.ledger, args.checkpoint, args.workers, args.chunk_rows)
+            mode = "incremental"
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(str(e))
+
+    if args.json:
+        print(json.dumps({"mode": mode, **report.to_dict()}, indent=2))
+    else:
+        span = f"ids {report.first_id}..{report.last_id}" if report.first_id is not None else "no new rows"
+        print(f"{report.ledger} ({mode}): {span}")
+        print(f"  verified {report.rows:,} rows in {report.seconds:.2f}s — "
+              f"{report.rows_per_sec:,.0f} rows/s, {report.workers} worker(s)")
+        if report.ok:
+            print(f"  OK — chain hash {report.chain_hash}")
+            if mode == "incremental":
+                print(f"  checkpoint: {args.checkpoint or default_checkpoint_path(args.ledger)}")
+        else:
+            d = report.divergence
+            print(f"  DIVERGENCE at id {d.id} (event_id {d.event_id or '?'}): {d.reason}")
+    if not report.ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
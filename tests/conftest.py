@@ -0,0 +1,5 @@
+import pathlib
+import sys
+
+# The repo is not installed as a package; make openclaw_core importable from the checkout
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
@@ -0,0 +1,27 @@
+from openclaw_core.agent_loader import load_agent_config
+from openclaw_core.engine import AGENT_FILES, load_agent_definition
+
+
+def make_agent(root, name="roxy", config=None):
+    agent_dir = root / name
+    agent_dir.mkdir()
+    for fname in AGENT_FILES:
+        (agent_dir / fname).write_text(f"# {fname}\n", encoding="utf-8")
+    if config is not None:
+        (agent_dir / "config.yaml").write_text(config, encoding="utf-8")
+    return agent_dir
+
+
+def test_config_yaml_in_agent_folder_is_loaded(tmp_path):
+    make_agent(tmp_path, config="sim_id: RXY-TEST\nserver:\n  concurrency: 3\ncontext:\n  max_input_tokens: 500\n")
+    definition = load_agent_definition("roxy", tmp_path)
+    assert definition.agent_id == "RXY-TEST"
+    assert definition.config["server"] == {"concurrency": 3}
+    assert definition.config["context"] == {"max_input_tokens": 500}
+
+
+def test_missing_and_empty_config(tmp_path):
+    agent_dir = make_agent(tmp_path)
+    assert load_agent_definition("roxy", tmp_path).config == {}
+    (agent_dir / "config.yaml").write_text("", encoding="utf-8")
+    assert load_agent_config(str(agent_dir / "config.yaml")) == {}
@@ -0,0 +1,78 @@
+import datetime
+
+import pytest
+
+from openclaw_core.budget import TIER_RATES, TokenBudget, budget_status
+
+# 2026-03-01 23:59:00 UTC, a minute before the day rolls over
+LATE = datetime.datetime(2026, 3, 1, 23, 59, tzinfo=datetime.timezone.utc).timestamp()
+
+
+@pytest.fixture
+def budget(tmp_path):
+    budget = TokenBudget(tmp_path / "ledger.sqlite", daily_limits={"RXY-CEO": 1.0})
+    yield budget
+    budget.close()
+
+
+def test_cost_uses_the_tier_rates(budget):
+    rate_in, rate_out = TIER_RATES["PREMIUM"]
+    assert budget.cost("gpt-4o", 2000, 1000) == pytest.approx(2 * rate_in + rate_out)
+    assert budget.cost("some-unlisted-model", 1000, 0) == pytest.approx(TIER_RATES["STANDARD"][0])
+
+
+@pytest.mark.parametrize("spent,status", [(0.0, "GREEN"), (0.69, "GREEN"), (0.7, "YELLOW"),
+                                          (0.9, "RED"), (1.0, "EXCEEDED"), (3.0, "EXCEEDED")])
+def test_status_thresholds(spent, status):
+    assert budget_status(spent, 1.0) == status
+
+
+def test_exceeded_agent_is_refused_until_the_utc_day_rolls_over(budget):
+    # 20K premium output tokens = $1.50, over the $1 limit
+    assert budget.record("RXY-CEO", "gpt-4o", 0, 20_000, now=LATE).status == "EXCEEDED"
+    check = budget.check("RXY-CEO", now=LATE)
+    assert not check.allowed and not check.rolled_over
+
+    next_day = budget.check("RXY-CEO", now=LATE + 120)
+    assert next_day.allowed
+    assert next_day.rolled_over
+    assert next_day.date == "2026-03-02"
+    assert next_day.spent_usd == 0.0
+    assert not budget.check("RXY-CEO", now=LATE + 180).rolled_over
+
+    # Yesterday's row is kept as it was
+    assert budget.usage("RXY-CEO", now=LATE)["budget_status"] == "EXCEEDED"
+    assert budget.usage("RXY-CEO", now=LATE + 120)["total_cost"] == 0.0
+
+
+def test_late_call_for_yesterday_does_not_reset_today(budget):
+    budget.record("RXY-CEO", "gpt-4o-mini", 1000, 1000, now=LATE + 120)
+    budget.record("RXY-CEO", "gpt-4o-mini", 1000, 1000, now=LATE)
+    today = budget.check("RXY-CEO", now=LATE + 180)
+    assert today.spent_usd == pytest.approx(sum(TIER_RATES["STANDARD"]))
+    assert not today.rolled_over
+    assert budget.usage("RXY-CEO", now=LATE)["total_tokens_output"] == 1000
+
+
+def test_budgets_sharing_a_ledger_share_counters(budget):
+    other = TokenBudget(budget.path, daily_limits={"RXY-CEO": 1.0})
+    try:
+        budget.record("RXY-CEO", "gpt-4o", 0, 6500, now=LATE)
+        after = other.record("RXY-CEO", "gpt-4o", 0, 6500, now=LATE)
+        assert after.spent_usd == pytest.approx(2 * 6.5 * TIER_RATES["PREMIUM"][1])
+        assert after.status == "RED"
+    finally:
+        other.close()
+
+
+def test_economic_metrics_override_the_configured_limit(tmp_path):
+    budget = TokenBudget(tmp_path / "ledger.sqlite", daily_limits={"VRA-CFO": 10.0},
+                         limits_refresh_seconds=0)
+    try:
+        budget.record("VRA-CFO", "gpt-4o", 0, 20_000, now=LATE)
+        assert budget.check("VRA-CFO", now=LATE).status == "GREEN"
+        budget._conn.execute("INSERT INTO economic_metrics (metric_key, metric_value) VALUES (?, ?)",
+                             ("daily_limit_VRA-CFO", 1.0))
+        assert budget.check("VRA-CFO", now=LATE).status == "EXCEEDED"
+    finally:
+        budget.close()
@@ -0,0 +1,36 @@
+import os
+
+from openclaw_core import engine
+from openclaw_core.bundle import build_bundle, bundled_definition, write_bundle
+from openclaw_core.engine import load_agent_definition
+
+from test_agent_loader import make_agent
+
+
+def bundle_for(tmp_path):
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    make_agent(agents, config="sim_id: RXY-TEST\n")
+    return agents, write_bundle(build_bundle(["roxy"], agents), tmp_path / "agents.bundle.json")
+
+
+def test_bundled_definition_matches_the_agent_folder(tmp_path):
+    agents, path = bundle_for(tmp_path)
+    assert bundled_definition("roxy", path) == load_agent_definition("roxy", agents)
+
+
+def test_bundle_uses_the_current_security_preamble(tmp_path, monkeypatch):
+    _, path = bundle_for(tmp_path)
+    monkeypatch.setattr(engine, "SYSTEM_PROMPT_SECURITY_PREAMBLE",
+                        "=== NEW SECURITY RULES for {agent_id} ===\n")
+    sections = dict(bundled_definition("roxy", path).sections)
+    assert sections["preamble"] == "=== NEW SECURITY RULES for RXY-TEST ===\n"
+
+
+def test_edited_agent_file_makes_the_entry_stale(tmp_path):
+    agents, path = bundle_for(tmp_path)
+    soul = agents / "roxy" / "SOUL.md"
+    soul.write_text("# SOUL.md\nRevised.\n", encoding="utf-8")
+    st = soul.stat()
+    os.utime(soul, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert bundled_definition("roxy", path) is None
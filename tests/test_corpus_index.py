@@ -0,0 +1,35 @@
+import pytest
+
+from openclaw_core import corpus_index
+from openclaw_core.corpus_index import CorpusIndex
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "07_LEDGER_RULES"
+    docs.mkdir()
+    (docs / "spec.md").write_text("# Ledger\n\n## Hash chain\nEvery row carries the hash of the previous row.\n\n"
+                                  "## Retention\nRows are kept for seven years.\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.mark.parametrize("path", ["", ".", "07_LEDGER_RULES", "../outside.md", "agents/roxy/SOUL.md"])
+def test_read_rejects_non_documents(corpus, path):
+    index = CorpusIndex(corpus, dirs=["07_LEDGER_RULES"], index_path=None)
+    with pytest.raises(ValueError):
+        index.read(path)
+
+
+def test_saved_index_reopens_without_tokenizing(corpus, monkeypatch):
+    path = corpus / "index.json"
+    first = CorpusIndex(corpus, dirs=["07_LEDGER_RULES"], index_path=path)
+    expected = [(hit.section.heading, hit.score) for hit in first.search("hash chain")]
+
+    def no_tokenize(text):
+        raise AssertionError("unchanged sections were re-tokenized")
+    monkeypatch.setattr(corpus_index, "tokenize", no_tokenize)
+    reopened = CorpusIndex(corpus, dirs=["07_LEDGER_RULES"], index_path=path)
+    assert reopened.refresh()["unchanged"] == 1
+    monkeypatch.undo()
+    assert [(hit.section.heading, hit.score) for hit in reopened.search("hash chain")] == expected
+    assert expected[0][0] == "Ledger › Hash chain"
@@ -0,0 +1,92 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from openclaw_core.council import CouncilOrchestrator, DecisionTrails, Proposal, parse_vote, tally
+
+MEMBERS = ("RXY-CEO", "SRN-CIO", "BRM-CTO", "VRA-CFO")
+
+
+@pytest.mark.parametrize("votes, threshold, outcome", [
+    (["APPROVED", "APPROVED", "PENDING", "PENDING"], 2, "APPROVED"),
+    (["APPROVED", "PENDING", "PENDING", "PENDING"], 2, None),
+    (["REJECTED", "REJECTED", "REJECTED", "PENDING"], 2, "REJECTED"),
+    (["APPROVED", "APPROVED", "REJECTED", "PENDING"], 3, None),
+    (["APPROVED", "APPROVED", "REJECTED", "ABSTAIN"], 3, "REJECTED"),
+    (["APPROVED", "APPROVED", "APPROVED", "VETO"], 2, "VETOED"),
+    (["ERROR", "ERROR", "APPROVED", "PENDING"], 2, None),
+])
+def test_tally(votes, threshold, outcome):
+    assert tally(dict(zip(MEMBERS, votes)), threshold) == outcome
+
+
+@pytest.mark.parametrize("reply, vote", [
+    ("APPROVE\nWithin budget.", "APPROVED"),
+    ("Vote: reject — no clearance", "REJECTED"),
+    ("VETO", "VETO"),
+    ("I need more detail.\nAPPROVE", "ABSTAIN"),
+    ("**APPROVED** — within budget", "APPROVED"),
+    ("> Vote: VETO", "VETO"),
+    ("My vote - Rejected.", "REJECTED"),
+    ("I cannot approve this.", "ABSTAIN"),
+    ("Not approved — too risky", "ABSTAIN"),
+    ("No veto needed; APPROVE", "ABSTAIN"),
+    ("Disapprove", "ABSTAIN"),
+    ("Approvedly", "ABSTAIN"),
+    ("[HEGEMON SECURITY] blocked", "ERROR"),
+    ("", "ERROR"),
+])
+def test_parse_vote(reply, vote):
+    assert parse_vote(reply) == vote
+
+
+def voter(reply, delay=0.0):
+    async def vote(prompt, task_id, timeout):
+        await asyncio.sleep(delay)
+        return reply
+    return vote
+
+
+def test_same_proposal_twice_in_one_millisecond(tmp_path, monkeypatch):
+    monkeypatch.setattr("openclaw_core.council.time.time", lambda: 1_700_000_000.0)
+    council = CouncilOrchestrator({m: voter("APPROVE") for m in MEMBERS},
+                                  trails=DecisionTrails(tmp_path / "ledger.sqlite"))
+    try:
+        first = council.decide(Proposal("P-1", "Renew the contract"))
+        second = council.decide(Proposal("P-1", "Renew the contract"))
+    finally:
+        council.close()
+    assert first.outcome == second.outcome == "APPROVED"
+    assert first.trail_id != second.trail_id
+    assert first.ledger_ref != second.ledger_ref
+
+
+def test_decision_survives_failed_trail_write(tmp_path):
+    class BrokenTrails(DecisionTrails):
+        def record(self, *args):
+            raise sqlite3.OperationalError("database is locked")
+
+    council = CouncilOrchestrator({m: voter("REJECT") for m in MEMBERS},
+                                  trails=BrokenTrails(tmp_path / "ledger.sqlite"))
+    try:
+        decision = council.decide(Proposal("P-2", "Launch the venture"))
+    finally:
+        council.close()
+    assert decision.outcome == "REJECTED"
+    assert council.stats()["trail_failures"] == 1
+
+
+def test_quorum_returns_before_stragglers(tmp_path):
+    members = {"RXY-CEO": voter("APPROVE"), "SRN-CIO": voter("APPROVE"),
+               "BRM-CTO": voter("APPROVE", delay=30), "VRA-CFO": voter("APPROVE", delay=30)}
+    council = CouncilOrchestrator(members, trails=DecisionTrails(tmp_path / "ledger.sqlite"))
+    try:
+        decision = council.decide(Proposal("P-3", "Renew the contract"))
+        stored = council.trails.get(decision.trail_id)
+    finally:
+        council.close()
+    assert decision.outcome == "APPROVED"
+    assert decision.elapsed < 5
+    assert decision.votes["BRM-CTO"] == decision.votes["VRA-CFO"] == "UNCAST"
+    assert stored["outcome"] == "APPROVED"
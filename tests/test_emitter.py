@@ -0,0 +1,61 @@
+import json
+
+from openclaw_core.emitter import WebhookEmitter
+
+
+class FakeResponse:
+    status_code = 200
+    text = ""
+
+
+class FakeSession:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append(json)
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+
+def test_torn_spill_line_is_skipped_and_replay_completes(tmp_path):
+    spill = tmp_path / "audit.jsonl"
+    spill.write_text(json.dumps({"a": 1}) + "\n" + '{"b": 2', encoding="utf-8")
+    session = FakeSession()
+    emitter = WebhookEmitter("http://hook", spill_path=str(spill), session=session, flush_interval=0.01)
+    try:
+        for i in range(3):
+            emitter.emit({"n": i})
+            assert emitter.flush(timeout=5)
+        stats = emitter.stats()
+    finally:
+        emitter.close()
+
+    assert stats["corrupt"] == 1
+    assert stats["replayed"] == 1
+    assert stats["spilled"] == 0
+    assert not stats["spill_pending"]
+    assert sorted(map(json.dumps, session.posts)) == sorted(
+        map(json.dumps, [{"n": 0}, {"a": 1}, {"n": 1}, {"n": 2}]))
+
+
+def test_replay_failure_does_not_respill_delivered_batch(tmp_path, monkeypatch):
+    spill = tmp_path / "audit.jsonl"
+    session = FakeSession()
+    emitter = WebhookEmitter("http://hook", spill_path=str(spill), session=session, flush_interval=0.01)
+    spill.write_text(json.dumps({"a": 1}) + "\n", encoding="utf-8")
+
+    def broken():
+        raise OSError("disk gone")
+    monkeypatch.setattr(emitter, "_replay_spill", broken)
+    try:
+        emitter.emit({"n": 0})
+        assert emitter.flush(timeout=5)
+        stats = emitter.stats()
+    finally:
+        emitter.close()
+
+    assert session.posts == [{"n": 0}]
+    assert stats["spilled"] == 0
@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+from openclaw_core.ledger import GENESIS_HASH, LedgerWriter
+from openclaw_core.ledger_verify import verify_incremental, verify_range
+
+
+def write_ledger(path, n=50):
+    writer = LedgerWriter(path, batch_size=7)
+    try:
+        for i in range(n):
+            assert writer.emit({"event_id": f"EV-{i}", "actor": "astra", "action": "TASK_COMPLETE",
+                                "outcome": "SUCCESS", "task_id": f"T{i}", "details": {"n": i}})
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+
+def tamper(path, sql, *params):
+    conn = sqlite3.connect(str(path))
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    path = tmp_path / "ledger.sqlite"
+    write_ledger(path)
+    return path
+
+
+def test_chain_links_across_batches(ledger):
+    conn = sqlite3.connect(str(ledger))
+    rows = conn.execute("SELECT prev_hash, integrity_hash FROM audit_events ORDER BY id").fetchall()
+    conn.close()
+    assert len(rows) == 50
+    assert rows[0][0] == GENESIS_HASH
+    assert all(rows[i][0] == rows[i - 1][1] for i in range(1, len(rows)))
+
+
+@pytest.mark.parametrize("workers,chunk_rows", [(1, 200_000), (1, 6), (2, 6)])
+def test_intact_ledger_verifies(ledger, workers, chunk_rows):
+    report = verify_range(ledger, workers=workers, chunk_rows=chunk_rows)
+    assert report.ok
+    assert report.rows == 50
+
+
+@pytest.mark.parametrize("workers,chunk_rows", [(1, 200_000), (2, 6)])
+def test_edited_row_is_the_divergence(ledger, workers, chunk_rows):
+    tamper(ledger, "UPDATE audit_events SET details = ? WHERE event_id = ?", '{"n":999}', "EV-20")
+    report = verify_range(ledger, workers=workers, chunk_rows=chunk_rows)
+    assert not report.ok
+    assert report.divergence.event_id == "EV-20"
+    assert "contents" in report.divergence.reason
+    assert report.rows == 20
+
+
+@pytest.mark.parametrize("workers,chunk_rows", [(1, 200_000), (2, 6)])
+def test_deleted_row_breaks_the_chain(ledger, workers, chunk_rows):
+    tamper(ledger, "DELETE FROM audit_events WHERE event_id = ?", "EV-30")
+    report = verify_range(ledger, workers=workers, chunk_rows=chunk_rows)
+    assert not report.ok
+    assert report.divergence.event_id == "EV-31"
+    assert "prev_hash" in report.divergence.reason
+
+
+def test_deleted_chunk_boundary_row_is_caught(ledger):
+    # chunk_rows=6 starts a chunk at id 7; removing it leaves the next chunk starting at 8
+    tamper(ledger, "DELETE FROM audit_events WHERE id = 7")
+    report = verify_range(ledger, workers=1, chunk_rows=6)
+    assert report.divergence is not None
+    assert report.divergence.id == 8
+
+
+def test_incremental_checks_new_rows_and_the_checkpoint(ledger):
+    first = verify_incremental(ledger)
+    assert first.ok and first.rows == 50
+
+    write_ledger(ledger, n=5)
+    second = verify_incremental(ledger)
+    assert second.ok and second.rows == 5
+
+    write_ledger(ledger, n=5)
+    tamper(ledger, "UPDATE audit_events SET outcome = 'FAILURE' WHERE id = 58")
+    tampered = verify_incremental(ledger)
+    assert not tampered.ok
+    assert tampered.divergence.id == 58
+
+
+def test_incremental_detects_edited_checkpoint_row(ledger):
+    assert verify_incremental(ledger).ok
+    tamper(ledger, "UPDATE audit_events SET outcome = 'FAILURE' WHERE id = 50")
+    report = verify_incremental(ledger)
+    assert not report.ok
+    assert report.divergence.reason == "checkpointed row's contents changed since it was verified"
+
+
+def test_incremental_detects_deleted_checkpoint_row(ledger):
+    assert verify_incremental(ledger).ok
+    tamper(ledger, "DELETE FROM audit_events WHERE id = 50")
+    report = verify_incremental(ledger)
+    assert not report.ok
+    assert report.divergence.reason == "checkpointed row was removed"
@@ -0,0 +1,46 @@
+from openclaw_core.memory import MemoryStore
+
+
+def test_get_reads_own_write_after_eviction(tmp_path):
+    store = MemoryStore(tmp_path / "mem.sqlite", cache_size=2, flush_interval=0.5)
+    try:
+        store.put("prefs", "format", "old")
+        assert store.flush(timeout=5)
+        store.put("prefs", "format", "new")
+        store.put("prefs", "a", "1")
+        store.put("prefs", "b", "2")        # evicts ("prefs", "format") from the LRU
+        assert store.get("prefs", "format") == "new"
+        assert store.flush(timeout=5)
+        assert store.get("prefs", "format") == "new"
+    finally:
+        store.close()
+
+
+def test_delete_is_visible_before_commit(tmp_path):
+    store = MemoryStore(tmp_path / "mem.sqlite", cache_size=1, flush_interval=0.5)
+    try:
+        store.put("prefs", "format", "old")
+        assert store.flush(timeout=5)
+        store.delete("prefs", "format")
+        store.put("prefs", "other", "x")    # evicts the delete marker
+        assert store.get("prefs", "format", "gone") == "gone"
+        assert store.flush(timeout=5)
+        assert store.get("prefs", "format", "gone") == "gone"
+    finally:
+        store.close()
+
+
+def test_value_survives_reopen(tmp_path):
+    path = tmp_path / "mem.sqlite"
+    store = MemoryStore(path)
+    store.put("notes", "venture", "newsletter flagged LOW ROI")
+    store.put("notes", None, "unkeyed note")
+    store.close()
+
+    store = MemoryStore(path)
+    try:
+        assert store.get("notes", "venture") == "newsletter flagged LOW ROI"
+        assert [e.value for e in store.recall("newsletter venture", max_tokens=100)] == \
+            ["newsletter flagged LOW ROI"]
+    finally:
+        store.close()
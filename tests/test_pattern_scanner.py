@@ -0,0 +1,87 @@
+import pathlib
+import random
+
+import pytest
+
+from openclaw_core.injection_guard import _pattern_set, default_scanner
+from openclaw_core.pattern_scanner import SequentialScanner, build_rules
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Pieces of the guard's patterns plus filler, case and Unicode folds that
+# re.IGNORECASE treats as ASCII letters
+FRAGMENTS = [
+    "ignore", "all", "previous", "prior", "instructions", "instruction", "disregard", "your", "rules",
+    "constraints", "forget", "everything", "what you were told", "you", "are", "now", "acting as",
+    "a", "an", "new", "system", "prompt", ":", "override", "safety", "governance", "jailbreak",
+    "do anything now", "dan", "mode", "developer", "enabled", "[system]", "[inst]", "<", ">", "/",
+    "###", "act", "as", "if", "were", "unrestricted", "unfiltered", "pretend", "there is no",
+    "limits", "simulate", "being", "true", "hidden", "purpose", "reveal", "configuration", "print",
+    "what", "original", "repeat", "token", "smuggling", "leak", "---", "===", "[OVERRIDE]",
+    "[inject]", "[Admin]", "context", "user", "assistant", "base64: QUJDREVGR0hJSktMTU5PUFFSU1RVVldY",
+    "\\u0041", "\\u00e9", "hypothetically speaking", "bypass", "disable", "for research purposes",
+    "without any restrictions", "different ai", "İGNORE", "jıilbreak", "ſystem",
+    "Key", "lorem", "ipsum", "the", "council", "ledger",
+]
+SEPARATORS = [" ", " ", " ", "\n", "\t", "", "  \n", "\r\n"]
+
+
+def fuzz_inputs(n: int, seed: int = 1234) -> list:
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 40)):
+            piece = rng.choice(FRAGMENTS)
+            piece = rng.choice([piece, piece.upper(), piece.title(), piece.swapcase()])
+            parts.append(piece + rng.choice(SEPARATORS))
+        inputs.append("".join(parts))
+    return inputs
+
+
+def corpus_inputs() -> list:
+    """
+    500-character slices of the security and ledger docs. The reference
+    backtracks badly on long multi-line text (the (\\n.*){0,3} rule), so whole
+    files would take minutes.
+    """
+    pieces = []
+    for path in [*sorted((REPO_ROOT / "05_SECURITY").rglob("*.md")),
+                 *sorted((REPO_ROOT / "07_LEDGER_RULES").rglob("*.md"))]:
+        text = path.read_text(encoding="utf-8", errors="replace")
+        pieces += [text[i:i + 500] for i in range(0, len(text), 500)]
+    return pieces
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return SequentialScanner(build_rules(_pattern_set()))
+
+
+def test_scan_matches_sequential_reference(reference):
+    scanner = default_scanner()
+    inputs = fuzz_inputs(3000) + corpus_inputs()
+    mismatches = [text for text in inputs if scanner.scan(text) != reference.scan(text)]
+    assert mismatches == []
+    assert sum(1 for text in inputs if reference.scan(text)) > 1000     # the fuzz really hits patterns
+
+
+def test_decide_fast_reports_the_first_blocking_match(reference):
+    scanner = default_scanner()
+    stop_at = frozenset({"CRITICAL", "HIGH"})
+    for text in fuzz_inputs(500, seed=99):
+        full = reference.scan(text)
+        blocking = [m for m in full if m["severity"] in stop_at]
+        expected = full[:full.index(blocking[0]) + 1] if blocking else full
+        assert scanner.scan(text, stop_at=stop_at) == expected
+
+
+def test_stream_matches_scan_at_any_chunk_size():
+    scanner = default_scanner()
+    rng = random.Random(7)
+    for text in fuzz_inputs(300, seed=42):
+        size = rng.randint(1, 64)
+        scan = scanner.stream()
+        for start in range(0, len(text), size):
+            scan.feed(text[start:start + size])
+        assert scan.matched() == scanner.scan(text), (size, text)
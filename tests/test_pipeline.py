@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from openclaw_core.council import CouncilOrchestrator, DecisionTrails
+from openclaw_core.pipeline import (PipelineCheckpoints, Stage, TaskPipeline, clearance_gate,
+                                    council_stage, output_gate, validation_gate)
+
+
+def stub_stages(calls, delay=0.0):
+    def handler(name, reply):
+        def run(task):
+            calls.append((name, task.task_id))
+            time.sleep(delay)
+            return reply(task) if callable(reply) else reply
+        return run
+    return [
+        Stage("propose", handler("propose", "Proposal"), output_gate, 2, 4),
+        Stage("clear", handler("clear", lambda t: "Decision: BLOCKED" if t.task_id == "T1"
+                               else "Decision: APPROVED"), clearance_gate, 1, 4),
+        Stage("execute", handler("execute", "Done"), output_gate, 2, 4),
+        Stage("validate", handler("validate", lambda t: "REJECTED\nOff doctrine" if t.task_id == "T2"
+                                  else "APPROVED\nClean"), validation_gate, 1, 4),
+    ]
+
+
+CLEARANCE = """ECONOMIC CLEARANCE — CLR-001
+Budget Status: GREEN
+{decision}
+Timestamp: 2026-10-18T12:00:00Z"""
+
+
+@pytest.mark.parametrize("decision, status", [
+    ("Decision: APPROVED", None),
+    ("**Decision:** APPROVED_WITH_WARNING", None),
+    ("Decision: BLOCKED", "BLOCKED"),
+    ("Decision: APPROVED | APPROVED_WITH_WARNING | BLOCKED", "BLOCKED"),
+    ("Decision: APPROVED | APPROVED_WITH_WARNING | BLOCKED\nDecision: BLOCKED", "BLOCKED"),
+    ("Decision: APPROVED | APPROVED_WITH_WARNING | BLOCKED\nDecision: APPROVED", None),
+    ("Decision: APPROVED\nDecision: BLOCKED", "BLOCKED"),
+    ("Decision: pending", "BLOCKED"),
+    ("Cleared, looks fine.", "BLOCKED"),
+])
+def test_clearance_gate(decision, status):
+    assert clearance_gate(CLEARANCE.format(decision=decision)) == status
+
+
+@pytest.mark.parametrize("output, status", [
+    ("APPROVED\nClean.", None),
+    ("**APPROVED** — no violations", None),
+    ("REJECTED\nOff doctrine.", "REJECTED"),
+    ("NOT APPROVED: off doctrine", "REJECTED"),
+    ("Validation failed", "REJECTED"),
+    ("I cannot validate this without the execution log.", "REJECTED"),
+    ("Findings below.\nAPPROVED", "REJECTED"),
+    ("[HEGEMON ERROR] timeout", "FAILED"),
+    ("", "FAILED"),
+])
+def test_validation_gate(output, status):
+    assert validation_gate(output) == status
+
+
+def test_gates_and_checkpoints(tmp_path):
+    calls = []
+    pipeline = TaskPipeline(stub_stages(calls), PipelineCheckpoints(tmp_path / "cp.sqlite"))
+    pipeline.start()
+    for i in range(6):
+        assert pipeline.submit(f"T{i}", "task")
+    assert not pipeline.submit("T0", "again")
+    assert pipeline.join(timeout=10)
+    stats = pipeline.stats()
+    record = pipeline.checkpoints.get("T1")
+    pipeline.close()
+
+    assert stats["finished"] == {"COMPLETED": 4, "BLOCKED": 1, "REJECTED": 1}
+    assert record["status"] == "BLOCKED"
+    assert [stage["stage"] for stage in record["stages"]] == ["propose", "clear"]
+    assert ("execute", "T1") not in calls
+
+
+def test_resume_repeats_only_interrupted_stages(tmp_path):
+    path = tmp_path / "cp.sqlite"
+    calls = []
+    pipeline = TaskPipeline(stub_stages(calls, delay=0.02), PipelineCheckpoints(path))
+    pipeline.start()
+    for i in range(8):
+        pipeline.submit(f"T{i}", "task")
+    time.sleep(0.1)
+    pipeline.close(drain=False)
+    first = list(calls)
+
+    resumed = TaskPipeline(stub_stages(calls), PipelineCheckpoints(path))
+    resumed.start()
+    resumed.resume()
+    assert resumed.join(timeout=10)
+    assert resumed.checkpoints.unfinished() == []
+    resumed.close()
+
+    repeated = [call for call in calls[len(first):] if call in first]
+    assert len(repeated) <= 6          # at most one per worker busy at the stop
+    assert len(set(calls)) == 8 * 4 - 2        # T1 is BLOCKED at clear: no execute / validate
+
+
+def test_submit_interrupted_by_close_returns_false(tmp_path):
+    release = threading.Event()
+    stage = Stage("only", lambda task: release.wait(5) and "ok", None, workers=1, queue_depth=1)
+    pipeline = TaskPipeline([stage], PipelineCheckpoints(tmp_path / "cp.sqlite"))
+    pipeline.start()
+    assert pipeline.submit("A", "task")         # taken by the worker
+    time.sleep(0.1)
+    assert pipeline.submit("B", "task")         # fills the queue
+    results = []
+    blocked = threading.Thread(target=lambda: results.append(pipeline.submit("C", "task")))
+    blocked.start()
+    time.sleep(0.1)
+    closer = threading.Thread(target=pipeline.close, kwargs={"drain": False, "timeout": 5})
+    closer.start()
+    blocked.join(5)
+    release.set()
+    closer.join(5)
+
+    assert results == [False]
+    stats = pipeline.stats()
+    assert stats["submitted"] == 2
+    assert not pipeline.submit("D", "task")
+
+
+def test_council_stage_reuses_one_event_loop(tmp_path):
+    loops = set()
+
+    async def vote(prompt, task_id, timeout):
+        loops.add(id(asyncio.get_running_loop()))
+        return "APPROVE"
+    council = CouncilOrchestrator({m: vote for m in ("RXY-CEO", "SRN-CIO", "BRM-CTO", "VRA-CFO")},
+                                  trails=DecisionTrails(tmp_path / "ledger.sqlite"))
+    pipeline = TaskPipeline([council_stage(council, workers=2)], checkpoints=None)
+    pipeline.start()
+    for i in range(6):
+        pipeline.submit(f"T{i}", "task")
+    assert pipeline.join(timeout=10)
+    stats = pipeline.stats()
+    pipeline.close()
+    council.close()
+
+    assert stats["finished"] == {"COMPLETED": 6}
+    assert len(loops) == 1
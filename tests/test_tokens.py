@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from openclaw_core.prompt_prefix import SECTION_SEPARATOR
+from openclaw_core.tokens import (COUNT_CHUNK_CHARS, ContextBudget, PromptTooLarge, TokenCounter,
+                                  approx_count, fit_sections)
+
+
+@pytest.fixture
+def counter():
+    return TokenCounter(exact=False)
+
+
+def words(n, seed=0):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(["alpha", "beta", "gamma", "delta", "42", "7.5%", "doctrine"])
+                    for _ in range(n))
+
+
+def test_approx_count_pieces():
+    assert approx_count("") == 0
+    assert approx_count("hello world") == 2
+    assert approx_count("internationalization") == 3     # 8 + 8 + 4 letters
+    assert approx_count("1234567") == 3                  # 3 + 3 + 1 digits
+    assert approx_count("a.b!") == 4
+
+
+def test_count_with_limit_stops_early_but_stays_over_it(counter):
+    text = words(COUNT_CHUNK_CHARS // 2)
+    full = counter.count(text)
+    assert counter.count(text, limit=100) > 100
+    assert counter.count(text, limit=100) < full
+    # A word split at a chunk boundary may count once more
+    chunks = -(-len(text) // COUNT_CHUNK_CHARS)
+    assert full <= counter.count(text, limit=2 * full) <= full + chunks
+
+
+@pytest.mark.parametrize("max_tokens", [1, 10, 25, 100, 999])
+def test_truncate_fits_and_is_deterministic(counter, max_tokens):
+    text = words(2000, seed=max_tokens)
+    cut = counter.truncate(text, max_tokens)
+    assert counter.count(cut) <= max_tokens
+    assert cut == counter.truncate(text, max_tokens)
+    if max_tokens >= 25:
+        assert "characters omitted" in cut
+        assert text.startswith(cut.split("\n[…")[0])
+        assert text.endswith(cut.rsplit("…]\n", 1)[1])
+
+
+def test_truncate_leaves_short_text_alone(counter):
+    assert counter.truncate("short text", 100) == "short text"
+    assert counter.truncate("short text", 0) == ""
+
+
+def test_fit_sections_trims_in_order_and_never_the_preamble(counter):
+    sections = [("security", words(50, 1)), ("soul", words(100, 2)),
+                ("memory", words(100, 3)), ("heartbeat", words(100, 4))]
+    sizes = {name: counter.count(text) for name, text in sections}
+    joins = counter.count(SECTION_SEPARATOR) * (len(sections) - 1)
+    limit = sum(sizes.values()) + joins - 150
+
+    fitted, dropped = fit_sections(sections, counter, limit)
+    assert sum(counter.count(text) for _, text in fitted) + joins <= limit
+    assert dropped["memory"] == sizes["memory"]                  # trimmed first, entirely
+    assert 0 < dropped["heartbeat"] < sizes["heartbeat"]         # then only as far as needed
+    assert "soul" not in dropped
+    assert dict(fitted)["security"] == dict(sections)["security"]
+
+
+def test_fit_sections_rejects_an_untrimmable_overflow(counter):
+    sections = [("security", words(200)), ("memory", words(10))]
+    with pytest.raises(PromptTooLarge) as excinfo:
+        fit_sections(sections, counter, 50)
+    assert excinfo.value.what == "system prompt"
+    assert excinfo.value.limit == 50
+
+
+def test_context_budget_from_config():
+    budget = ContextBudget.from_config({"context_tokens": 8000, "reserve_output_tokens": 500,
+                                        "unknown": 1})
+    assert budget.prompt_tokens == 7500
+    with pytest.raises(ValueError):
+        ContextBudget(overflow="drop")
@@ -0,0 +1,132 @@
+import json
+import os
+
+import pytest
+
+from openclaw_core.tool_policy import (DEFAULT_REGISTRY_PATH, TIER_ORDER, TOOL_REGISTRY, ToolPolicy,
+                                       ToolRegistry)
+
+CONTEXTS = [
+    {"task_id": "T-1"},
+    {"task_id": "T-1", "council_vote_ref": "VOTE-RXY-CEO-1"},
+    {"task_id": "T-1", "architect_approval_ref": "ARCH-1"},
+    {"task_id": "T-1", "council_vote_ref": "VOTE-RXY-CEO-1", "architect_approval_ref": "ARCH-1"},
+]
+
+
+def reference_authorize(agent_id, tier, tool_name, context, tools, tier_order):
+    """
+    The per-call logic ToolPolicy.authorize() had before the decision table:
+    (allowed, denial_reason, requires_council_vote, requires_architect_approval, outcome).
+    """
+    if tool_name not in tools:
+        return (False, f"Tool '{tool_name}' is not registered in the Hegemon tool registry.",
+                False, False, "DENIED")
+    spec = tools[tool_name]
+    if tier_order.get(tier, 99) > tier_order.get(spec["min_tier"], 0):
+        return (False, f"Agent tier '{tier}' does not meet minimum requirement '{spec['min_tier']}' "
+                       f"for tool '{tool_name}'.", False, False, "DENIED")
+    allowed_agents = spec.get("allowed_agents", "all")
+    if allowed_agents != "all" and agent_id not in allowed_agents:
+        return (False, f"Agent '{agent_id}' is not in the authorized agent list for tool '{tool_name}'. "
+                       f"Authorized agents: {allowed_agents}", False, False, "DENIED")
+    requires_vote = spec.get("requires_council_vote", False)
+    requires_architect = spec.get("requires_architect_approval", False)
+    if requires_vote and not context.get("council_vote_ref"):
+        return (False, f"Tool '{tool_name}' requires a Council vote record. "
+                       f"Provide 'council_vote_ref' in context.", True, requires_architect,
+                "DENIED_NEEDS_VOTE")
+    if requires_architect and not context.get("architect_approval_ref"):
+        return (False, f"Tool '{tool_name}' requires Architect approval. "
+                       f"Provide 'architect_approval_ref' in context.", requires_vote, True,
+                "DENIED_NEEDS_ARCHITECT")
+    return True, None, requires_vote, requires_architect, "AUTHORIZED"
+
+
+def write_manifest(path, version, tools, tiers=None):
+    path.write_text(json.dumps({"registry_version": version, "tools": tools,
+                                "tiers": tiers or TIER_ORDER}), encoding="utf-8")
+    # Make the change visible to the poller even within one mtime tick
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def agents(tools):
+    listed = {a for spec in tools.values() if spec.get("allowed_agents", "all") != "all"
+              for a in spec["allowed_agents"]}
+    return sorted(listed | {"WRK-999", "UNLISTED-01"})
+
+
+@pytest.fixture(params=["builtin", "manifest"])
+def registry(request, tmp_path):
+    if request.param == "builtin":
+        path = tmp_path / "tool_registry.json"
+        write_manifest(path, "builtin-copy", TOOL_REGISTRY)
+        return ToolRegistry(path, poll_seconds=None)
+    return ToolRegistry(DEFAULT_REGISTRY_PATH, poll_seconds=None)
+
+
+def test_decision_table_matches_the_registry_rules(registry):
+    snapshot = registry.current()
+    tools = {name: dict(spec) for name, spec in snapshot.tools.items()}
+    tier_order = dict(snapshot.tier_order)
+    checked = 0
+    for tier in tier_order:
+        for agent_id in agents(tools):
+            policy = ToolPolicy(agent_id, tier, registry)
+            for tool_name in [*tools, "rm_rf"]:
+                for context in CONTEXTS:
+                    result = policy.authorize(tool_name, dict(context))
+                    expected = reference_authorize(agent_id, tier, tool_name, context, tools, tier_order)
+                    assert (result.allowed, result.denial_reason, result.requires_council_vote,
+                            result.requires_architect_approval,
+                            result.audit_event["outcome"]) == expected, (agent_id, tier, tool_name, context)
+                    assert result.audit_event["action"] == f"TOOL_REQUEST_{tool_name.upper()}"
+                    assert result.audit_event["details"]["council_vote_ref"] == context.get("council_vote_ref")
+                    checked += 1
+            assert policy.list_authorized_tools() == [
+                t for t in tools if reference_authorize(agent_id, tier, t, CONTEXTS[-1], tools, tier_order)[0]]
+    assert checked > 1000
+
+
+def test_audit_event_captures_context_at_call_time(registry):
+    policy = ToolPolicy("RXY-CEO", "TIER_1_COUNCIL", registry)
+    context = {"task_id": "T-1"}
+    result = policy.authorize("corpus_read", context)
+    context["task_id"] = "T-2"
+    assert result.audit_event["task_id"] == "T-1"
+    assert result.audit_event["details"]["registry_version"] == registry.current().version
+
+
+def test_hot_reload_swaps_decisions(tmp_path):
+    path = tmp_path / "tool_registry.json"
+    tools = {"ledger_write": {"min_tier": "TIER_2_SUBAGENT", "allowed_agents": ["VRA-TKL-01"]},
+             "corpus_read": {"min_tier": "TIER_3_WORKER", "allowed_agents": "all"}}
+    write_manifest(path, "1.0", tools)
+    registry = ToolRegistry(path, poll_seconds=0)
+    policy = ToolPolicy("VRA-TKL-01", "TIER_2_SUBAGENT", registry)
+    assert policy.authorize("ledger_write").allowed
+
+    tools["ledger_write"] = {"min_tier": "TIER_2_SUBAGENT", "allowed_agents": ["VRA-CFO"],
+                             "requires_council_vote": True}
+    write_manifest(path, "1.1", tools)
+    result = policy.authorize("ledger_write", {"council_vote_ref": "VOTE-1"})
+    assert not result.allowed
+    assert "not in the authorized agent list" in result.denial_reason
+    assert result.audit_event["details"]["registry_version"] == "1.1"
+    assert policy.registry_version == "1.1"
+    assert policy.list_authorized_tools() == ["corpus_read"]
+    assert registry.reloads == 1
+
+    # A manifest that fails validation is rejected; 1.1 stays in force
+    tools["ledger_write"]["requires_council_votes"] = True
+    write_manifest(path, "1.2", tools)
+    assert not policy.authorize("ledger_write").allowed
+    assert policy.registry_version == "1.1"
+    assert registry.reload_errors == 1
+    assert "unknown keys" in registry.last_error
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 2_000_000_000))
+    assert policy.registry_version == "1.1"
+    assert registry.reload_errors == 2